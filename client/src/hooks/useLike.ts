@@ -61,7 +61,8 @@ export const useLike = (contentId: number) => {
     setState(prev => ({ ...prev, isLoading: true, error: null }));
 
     try {
-      const data = await contentApi.likeContent(contentId);
+      // Send the intended state rather than a toggle, so a repeated click cannot undo itself
+      const data = await contentApi.likeContent(contentId, state.isLiked ? 'unlike' : 'like');
 
       if (data.success) {
         setState(prev => ({
@@ -242,6 +242,7 @@ export interface AuditLogsResponse {
 export interface LikeResponse {
   success: boolean;
   action?: string;
+  changed?: boolean;
   is_liked?: boolean;
   like_count?: number;
   message?: string;
@@ -1536,8 +1537,8 @@ export const contentApi = {
   },
 
   // Like System API
-  likeContent: async (contentId: number): Promise<LikeResponse> => {
-    return apiClient.post<LikeResponse>(`/api/content/${contentId}/like`);
+  likeContent: async (contentId: number, action?: 'like' | 'unlike'): Promise<LikeResponse> => {
+    return apiClient.post<LikeResponse>(`/api/content/${contentId}/like`, action ? { action } : undefined);
   },
 
   getLikeStatus: async (contentId: number): Promise<LikeStatusResponse> => {
@@ -1,6 +1,6 @@
 import os
 from dotenv import load_dotenv
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context
 from mysql.connector import pooling
 import bcrypt
 import uuid
@@ -11,70 +11,89 @@ from google.auth.transport import requests as google_requests
 from google.oauth2 import id_token
 from functools import wraps
 from werkzeug.utils import secure_filename
-from grammar_checker import check_grammar_api
-import PyPDF2
+from grammar_checker import check_grammar_api, get_grammar_health, stream_grammar_api
 import io
-from utils.pdf_thumbnail import generate_research_paper_thumbnail
 import logging
-from sentiment_analysis import sentiment_analyzer, analyze_content_sentiment, get_sentiment_weight
-from credit_system import CreditSystem
+from sentiment_analysis import analyze_content_sentiment, get_sentiment_weight
+from sentiment_jobs import sentiment_job_queue
+from credit_system import CreditSystem, CONTENT_CREATOR_QUERY
+from session_cache import session_cache
+from permission_cache import PermissionCache
+from request_connection import get_request_connection, init_request_connection
+from view_counter import view_counter
+from recommendation_engine import recommendation_index
+from search_index import search_index
+from thumbnail_jobs import thumbnail_pipeline
+from upload_store import upload_store, open_multipart_file, UploadError, PDF_MAGIC, MULTIPART_OVERHEAD
+from pdf_text import pdf_text_extractor, PdfTextError
 
 # Practice Areas Configuration
 PRACTICE_AREAS = [
     {
         'value': 'Constitutional Law',
         'label': 'Constitutional Law',
-        'description': 'Constitutional interpretation, civil rights, and fundamental legal principles'
+        'description': 'Constitutional interpretation, civil rights, and fundamental legal principles',
+        'keywords': ['constitution', 'civil rights', 'fundamental rights', 'constitutional interpretation', 'supreme court']
     },
     {
         'value': 'Corporate Law',
         'label': 'Corporate Law',
-        'description': 'Business formation, mergers, acquisitions, and corporate governance'
+        'description': 'Business formation, mergers, acquisitions, and corporate governance',
+        'keywords': ['business', 'corporate', 'mergers', 'acquisitions', 'company law', 'securities', 'governance']
     },
     {
         'value': 'Employment Law',
         'label': 'Employment Law',
-        'description': 'Workplace rights, labor relations, and employment disputes'
+        'description': 'Workplace rights, labor relations, and employment disputes',
+        'keywords': ['employment', 'labor', 'workplace', 'discrimination', 'wages', 'workers rights']
     },
     {
         'value': 'Intellectual Property',
         'label': 'Intellectual Property',
-        'description': 'Patents, trademarks, copyrights, and trade secrets'
+        'description': 'Patents, trademarks, copyrights, and trade secrets',
+        'keywords': ['patent', 'trademark', 'copyright', 'intellectual property', 'IP', 'trade secrets']
     },
     {
         'value': 'Criminal Law',
         'label': 'Criminal Law',
-        'description': 'Criminal defense, prosecution, and criminal justice system'
+        'description': 'Criminal defense, prosecution, and criminal justice system',
+        'keywords': ['criminal', 'defense', 'prosecution', 'crime', 'justice', 'court', 'trial']
     },
     {
         'value': 'Family Law',
         'label': 'Family Law',
-        'description': 'Divorce, custody, adoption, and family-related legal matters'
+        'description': 'Divorce, custody, adoption, and family-related legal matters',
+        'keywords': ['family', 'divorce', 'custody', 'adoption', 'marriage', 'domestic']
     },
     {
         'value': 'Civil Litigation',
         'label': 'Civil Litigation',
-        'description': 'Civil disputes, commercial litigation, and dispute resolution'
+        'description': 'Civil disputes, commercial litigation, and dispute resolution',
+        'keywords': ['litigation', 'civil', 'dispute', 'lawsuit', 'court', 'settlement']
     },
     {
         'value': 'Real Estate Law',
         'label': 'Real Estate Law',
-        'description': 'Property transactions, real estate disputes, and property law'
+        'description': 'Property transactions, real estate disputes, and property law',
+        'keywords': ['real estate', 'property', 'land', 'housing', 'transactions', 'zoning']
     },
     {
         'value': 'Regulatory Compliance',
         'label': 'Regulatory Compliance',
-        'description': 'Regulatory advisory, compliance programs, and government relations'
+        'description': 'Regulatory advisory, compliance programs, and government relations',
+        'keywords': ['regulatory', 'compliance', 'government', 'regulations', 'policy']
     },
     {
         'value': 'General',
         'label': 'General Practice',
-        'description': 'General legal practice covering multiple areas of law'
+        'description': 'General legal practice covering multiple areas of law',
+        'keywords': ['general', 'practice', 'legal', 'law', 'attorney', 'lawyer']
     },
     {
         'value': 'Student',
         'label': 'Law Student',
-        'description': 'Currently studying law or preparing for legal career'
+        'description': 'Currently studying law or preparing for legal career',
+        'keywords': ['student', 'law school', 'legal education', 'studying', 'academic']
     }
 ]
 
@@ -152,8 +171,25 @@ except Exception as e:
     raise
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'pabbo@123')
 
-# Initialize credit system
-credit_system = CreditSystem(connection_pool)
+# Batched view counting flushes through the pool from a background thread
+view_counter.init_pool(connection_pool)
+
+# Background thumbnail renders store their result through the pool
+thumbnail_pipeline.init_pool(connection_pool)
+
+# Background PDF text indexing stores page texts through the pool
+pdf_text_extractor.init_pool(connection_pool)
+
+# Initialize credit system (uses the request-scoped connection when called from a route)
+credit_system = CreditSystem(connection_pool, get_connection=lambda: get_db_connection(),
+                             settlement_mode=os.getenv('CREDIT_SETTLEMENT_MODE', CreditSystem.SETTLEMENT_IMMEDIATE))
+
+# Load role permission closures once at startup (reloaded on invalidation or after the refresh interval)
+permission_cache = PermissionCache(connection_pool, refresh_seconds=float(os.getenv('PERMISSION_CACHE_REFRESH', 300)))
+try:
+    permission_cache.load()
+except Exception as e:
+    logger.error(f"Failed to preload permissions, will retry on first check: {str(e)}")
 
 # Google OAuth Configuration
 GOOGLE_CLIENT_ID = "517818204697-jpimspqvc3f4folciiapr6vbugs9t7hu.apps.googleusercontent.com"
@@ -161,21 +197,26 @@ GOOGLE_CLIENT_ID = "517818204697-jpimspqvc3f4folciiapr6vbugs9t7hu.apps.googleuse
 # File Upload Configuration
 UPLOAD_FOLDER = os.path.join(os.getcwd(), 'uploads', 'resumes')
 ALLOWED_EXTENSIONS = {'pdf'}
-MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
+MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB (resumes)
+MAX_PDF_SIZE = 10 * 1024 * 1024  # 10MB (notes and research papers)
 
 # Ensure upload directory exists
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
-app.config['MAX_CONTENT_LENGTH'] = MAX_FILE_SIZE
+# Upper bound for any request body; upload routes enforce their own limit while streaming
+app.config['MAX_CONTENT_LENGTH'] = max(MAX_FILE_SIZE, MAX_PDF_SIZE) + MULTIPART_OVERHEAD
 
 def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-# Function to get database connection from pool
+# Function to get database connection from pool (shared by everything that runs in one request)
 def get_db_connection():
-    return connection_pool.get_connection()
+    return get_request_connection(connection_pool)
+
+# Return the request's shared connection to the pool when the app context ends
+init_request_connection(app)
 
 # Function to hash passwords
 def hash_password(password):
@@ -455,6 +496,7 @@ def logout_user():
     try:
         cursor.execute("DELETE FROM Session WHERE Session_Token = %s", (session_token,))
         conn.commit()
+        session_cache.invalidate(session_token)
         return jsonify({'message': 'Logout successful'}), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -775,6 +817,8 @@ def admin_approve_deny_access():
             message = 'Editor access denied.'
 
         conn.commit()
+        session_cache.invalidate_user(user_id)
+        permission_cache.invalidate()
         return jsonify({'message': message, 'success': True}), 200
     except Exception as e:
         conn.rollback()
@@ -987,6 +1031,8 @@ def update_user_role():
         """, (admin_id, 'Update User Role', f'Changed user {user_id} role from {current_role[0]} to {new_role_id}'))
 
         conn.commit()
+        session_cache.invalidate_user(user_id)
+        permission_cache.invalidate()
         return jsonify({'message': 'User role updated successfully'}), 200
     except Exception as e:
         conn.rollback()
@@ -1031,6 +1077,7 @@ def update_user_status():
         """, (admin_id, 'Update User Status', f'Changed user {user_id} status from {current_status[0]} to {new_status}'))
 
         conn.commit()
+        session_cache.invalidate_user(user_id)
         return jsonify({'message': f'User status updated to {new_status} successfully'}), 200
     except Exception as e:
         conn.rollback()
@@ -1941,89 +1988,37 @@ def get_users_for_email():
         conn.close()
 
 # Helper function to check user permissions with hierarchical support
-def check_user_permission(user_id, permission_name, content_id=None, content_owner_id=None):
+def check_user_permission(user_id, permission_name, content_id=None, content_owner_id=None, user_info=None):
     try:
-        connection = get_db_connection()
-        cursor = connection.cursor(dictionary=True)
-
-        # Get user's role and super admin status
-        cursor.execute("""
-            SELECT u.Role_ID, u.Is_Super_Admin
-            FROM Users u
-            WHERE u.User_ID = %s
-        """, (user_id,))
+        # Get user's role and super admin status (skipped when the caller already resolved them)
+        if user_info is None:
+            connection = get_db_connection()
+            cursor = connection.cursor(dictionary=True)
+            cursor.execute("""
+                SELECT u.Role_ID, u.Is_Super_Admin
+                FROM Users u
+                WHERE u.User_ID = %s
+            """, (user_id,))
 
-        user_info = cursor.fetchone()
-        if not user_info:
+            user_info = cursor.fetchone()
             cursor.close()
             connection.close()
+        if not user_info:
             return False
 
         # Super admins bypass all permission checks
         if user_info['Is_Super_Admin']:
-            cursor.close()
-            connection.close()
             return True
 
-        role_id = user_info['Role_ID']
-
-        # Check for exact permission match
-        cursor.execute("""
-            SELECT p.Permission_Name
-            FROM Permissions p
-            WHERE p.Role_ID = %s AND p.Permission_Name = %s
-        """, (role_id, permission_name))
-
-        exact_match = cursor.fetchone()
-
-        if exact_match:
-            cursor.close()
-            connection.close()
+        # Exact and hierarchical matches are both in the role's precomputed permission closure
+        if permission_cache.has_permission(user_info['Role_ID'], permission_name):
             return True
 
-        # Check for hierarchical permissions based on role and content ownership
+        # For "own" permissions, check if user owns the content
         if permission_name.endswith('_own') and content_owner_id:
-            # For "own" permissions, check if user owns the content
             if user_id == content_owner_id:
-                cursor.close()
-                connection.close()
                 return True
 
-        # Check for broader permissions that include the requested permission
-        permission_hierarchy = {
-            # Admin permissions (role_id = 1) include all
-            'content_create_all': ['content_create_own', 'content_create'],
-            'content_read_all': ['content_read_public', 'content_read'],
-            'content_update_all': ['content_update_own', 'content_update'],
-            'content_delete_all': ['content_delete_own', 'content_delete'],
-            'metrics_view_all': ['metrics_view_own', 'metrics_view'],
-
-            # Editor permissions (role_id = 2) for their own content
-            'content_create_own': ['content_create'],
-            'content_update_own': ['content_update'],
-            'content_delete_own': ['content_delete'],
-            'content_publish_own': ['content_publish'],
-            'metrics_view_own': ['metrics_view'],
-        }
-
-        # Check if user has a broader permission that includes the requested one
-        for broad_perm, included_perms in permission_hierarchy.items():
-            if permission_name in included_perms:
-                cursor.execute("""
-                    SELECT p.Permission_Name
-                    FROM Permissions p
-                    WHERE p.Role_ID = %s AND p.Permission_Name = %s
-                """, (role_id, broad_perm))
-
-                broader_match = cursor.fetchone()
-
-                if broader_match:
-                    cursor.close()
-                    connection.close()
-                    return True
-
-        cursor.close()
-        connection.close()
         return False
     except Exception as e:
         return False
@@ -2059,25 +2054,36 @@ def require_permission(permission_name, check_ownership=False):
                 session_token = session_token[7:]
 
             try:
-                connection = get_db_connection()
-                cursor = connection.cursor(dictionary=True)
+                # Resolve the session from the in-process cache before hitting the database
+                cached_session = session_cache.get(session_token)
+                if cached_session is None:
+                    connection = get_db_connection()
+                    cursor = connection.cursor(dictionary=True)
 
-                # Verify session token and get user ID
-                cursor.execute("""
-                    SELECT s.User_ID
-                    FROM Session s
-                    WHERE s.Session_Token = %s
-                """, (session_token,))
+                    # Verify session token and get user ID, role and super admin status
+                    cursor.execute("""
+                        SELECT s.User_ID, u.Role_ID, u.Is_Super_Admin
+                        FROM Session s
+                        JOIN Users u ON s.User_ID = u.User_ID
+                        WHERE s.Session_Token = %s
+                    """, (session_token,))
 
-                session = cursor.fetchone()
-                if not session:
+                    session = cursor.fetchone()
                     cursor.close()
                     connection.close()
-                    return jsonify({"success": False, "message": "Invalid session token"}), 401
 
-                user_id = session['User_ID']
-                cursor.close()
-                connection.close()
+                    if not session:
+                        return jsonify({"success": False, "message": "Invalid session token"}), 401
+
+                    cached_session = session_cache.set(
+                        session_token, session['User_ID'], session['Role_ID'], session['Is_Super_Admin']
+                    )
+
+                user_id = cached_session.user_id
+                user_info = {
+                    'Role_ID': cached_session.role_id,
+                    'Is_Super_Admin': cached_session.is_super_admin
+                }
 
                 # For ownership-based permissions, get content_id from URL parameters
                 content_owner_id = None
@@ -2088,7 +2094,7 @@ def require_permission(permission_name, check_ownership=False):
                         content_owner_id = get_content_owner(content_id)
 
                 # Check permission with enhanced logic
-                if check_user_permission(user_id, permission_name, content_owner_id=content_owner_id):
+                if check_user_permission(user_id, permission_name, content_owner_id=content_owner_id, user_info=user_info):
                     return f(user_id, *args, **kwargs)
                 else:
                     return jsonify({"success": False, "message": "Permission denied"}), 403
@@ -2111,54 +2117,23 @@ app.json_encoder = CustomJSONEncoder
 
 # ===== SENTIMENT ANALYSIS HELPER FUNCTIONS =====
 
-def update_content_sentiment_async(content_id: int):
+def queue_sentiment_update(content_id: int, connection=None):
     """
-    Update sentiment analysis for a content item asynchronously.
-    This function analyzes comments and updates the Content_Metrics table.
+    Queue a sentiment refresh for a content item.
+    The work is done by sentiment_worker.py; when a connection is passed the job is
+    written in the caller's transaction, otherwise it is committed right away.
     """
-    try:
-        connection = get_db_connection()
-        if not connection:
-            logger.error("Failed to get database connection for sentiment analysis")
-            return
-
-        # Analyze sentiment for the content
-        sentiment_data = sentiment_analyzer.analyze_blog_post_sentiment(content_id, connection)
-
-        # Update Content_Metrics table with sentiment data
-        cursor = connection.cursor()
-        cursor.execute("""
-            UPDATE Content_Metrics
-            SET
-                Sentiment_Score = %s,
-                Positive_Ratio = %s,
-                Negative_Ratio = %s,
-                Neutral_Ratio = %s,
-                Sentiment_Confidence = %s,
-                Overall_Sentiment = %s,
-                Sentiment_Last_Updated = NOW(),
-                Sentiment_Comment_Count = %s
-            WHERE Content_ID = %s
-        """, (
-            sentiment_data.get('sentiment_score', 0.0),
-            sentiment_data.get('positive_ratio', 0.0),
-            sentiment_data.get('negative_ratio', 0.0),
-            sentiment_data.get('neutral_ratio', 1.0),
-            sentiment_data.get('confidence', 0.0),
-            sentiment_data.get('overall_sentiment', 'neutral'),
-            sentiment_data.get('comment_count', 0),
-            content_id
-        ))
+    if connection is not None:
+        sentiment_job_queue.enqueue(connection, content_id)
+        return
 
+    connection = get_db_connection()
+    try:
+        sentiment_job_queue.enqueue(connection, content_id)
         connection.commit()
-        cursor.close()
+    finally:
         connection.close()
 
-        logger.info(f"Updated sentiment for content {content_id}: {sentiment_data.get('overall_sentiment', 'neutral')} (score: {sentiment_data.get('sentiment_score', 0.0)})")
-
-    except Exception as e:
-        logger.error(f"Error updating sentiment for content {content_id}: {str(e)}")
-
 def should_update_sentiment(content_id: int) -> bool:
     """
     Check if sentiment analysis should be updated for a content item.
@@ -2219,6 +2194,20 @@ def get_enhanced_engagement_score(content_id: int, base_engagement: int) -> floa
 
 # ===== BLOG POST ROUTES =====
 
+def parse_keyset_cursor(cursor_value):
+    """Parse an `after=<created_at>,<id>` keyset cursor; returns (created_at, content_id) or None"""
+    try:
+        created_at, content_id = cursor_value.rsplit(',', 1)
+        return datetime.fromisoformat(created_at), int(content_id)
+    except (ValueError, AttributeError):
+        return None
+
+def make_keyset_cursor(created_at, content_id):
+    """Build the `after` cursor for the row a page ended on"""
+    if isinstance(created_at, datetime):
+        created_at = created_at.isoformat()
+    return f"{created_at},{content_id}"
+
 @app.route('/api/blog-posts', methods=['GET'])
 def get_blog_posts():
     try:
@@ -2232,8 +2221,18 @@ def get_blog_posts():
         practice_area = request.args.get('practice_area')  # For recommendations
         limit = request.args.get('limit', 10, type=int)
         offset = request.args.get('offset', 0, type=int)
+        after = request.args.get('after')  # Keyset cursor "<created_at>,<content_id>" (recent sort only)
+
+        keyset = None
+        if after:
+            if sort_by != 'recent':
+                return jsonify({"success": False, "message": "Cursor pagination is only supported with sort_by=recent"}), 400
+            keyset = parse_keyset_cursor(after)
+            if keyset is None:
+                return jsonify({"success": False, "message": "Invalid cursor, expected after=<created_at>,<id>"}), 400
 
         # Base query - Enhanced with sentiment analysis for recommendations
+        # Comment counts come from Content_Metrics (maintained on comment insert and by the reconciliation job)
         query = """
             SELECT c.Content_ID as content_id, c.User_ID as user_id, c.Title as title,
                    c.Summary as summary, c.Content as content,
@@ -2242,7 +2241,7 @@ def get_blog_posts():
                    c.Is_Featured as is_featured, bp.Category as category,
                    bp.Allow_Comments as allow_comments, bp.Is_Published as is_published,
                    bp.Publication_Date as publication_date, up.Full_Name as author_name,
-                   (SELECT COUNT(*) FROM Content_Comments cc WHERE cc.Content_ID = c.Content_ID AND cc.Status = 'Active') as comment_count,
+                   COALESCE(cm.Comments_Count, 0) as comment_count,
                    COALESCE(cm.Views, 0) as views,
                    COALESCE(cm.Likes, 0) as likes,
                    COALESCE(cm.Shares, 0) as shares,
@@ -2259,23 +2258,33 @@ def get_blog_posts():
             WHERE c.Content_Type = 'Blog_Post' AND bp.Is_Published = TRUE
         """
 
+        # Filters shared by the listing and the count query
+        filters = ""
         params = []
 
         # Add filters
         if category:
-            query += " AND bp.Category = %s"
+            filters += " AND bp.Category = %s"
             params.append(category)
 
         if status:
-            query += " AND c.Status = %s"
+            filters += " AND c.Status = %s"
             params.append(status)
 
         # Add practice area filtering for recommendations
         if practice_area:
-            query += " AND (bp.Category LIKE %s OR c.Title LIKE %s OR c.Summary LIKE %s)"
+            filters += " AND (bp.Category LIKE %s OR c.Title LIKE %s OR c.Summary LIKE %s)"
             practice_area_param = f"%{practice_area}%"
             params.extend([practice_area_param, practice_area_param, practice_area_param])
 
+        query += filters
+        query_params = list(params)
+
+        # Seek past the last row of the previous page instead of scanning OFFSET rows
+        if keyset:
+            query += " AND (c.Created_At < %s OR (c.Created_At = %s AND c.Content_ID < %s))"
+            query_params.extend([keyset[0], keyset[0], keyset[1]])
+
         # Add sorting with sentiment-enhanced engagement
         if sort_by == 'popular':
             query += " ORDER BY COALESCE(cm.Views, 0) DESC, c.Created_At DESC"
@@ -2287,41 +2296,36 @@ def get_blog_posts():
                 (1.0 + (COALESCE(cm.Sentiment_Score, 0.0) * COALESCE(cm.Sentiment_Confidence, 0.0) * 0.5))
             ) DESC, c.Created_At DESC"""
         else:  # recent
-            query += " ORDER BY c.Created_At DESC"
+            query += " ORDER BY c.Created_At DESC, c.Content_ID DESC"
 
         # Add pagination
-        query += " LIMIT %s OFFSET %s"
-        params.extend([limit, offset])
+        if keyset:
+            query += " LIMIT %s"
+            query_params.append(limit)
+        else:
+            query += " LIMIT %s OFFSET %s"
+            query_params.extend([limit, offset])
 
-        cursor.execute(query, params)
+        cursor.execute(query, query_params)
         blog_posts = cursor.fetchall()
 
-        # Get total count for pagination
-        count_query = """
-            SELECT COUNT(*) as total
-            FROM Content c
-            JOIN Blog_Posts bp ON c.Content_ID = bp.Content_ID
-            WHERE c.Content_Type = 'Blog_Post' AND bp.Is_Published = TRUE
-        """
-
-        count_params = []
-
-        if category:
-            count_query += " AND bp.Category = %s"
-            count_params.append(category)
+        next_cursor = None
+        if sort_by == 'recent' and len(blog_posts) == limit:
+            last_post = blog_posts[-1]
+            next_cursor = make_keyset_cursor(last_post['created_at'], last_post['content_id'])
 
-        if status:
-            count_query += " AND c.Status = %s"
-            count_params.append(status)
-
-        # Add practice area filtering for count query too
-        if practice_area:
-            count_query += " AND (bp.Category LIKE %s OR c.Title LIKE %s OR c.Summary LIKE %s)"
-            practice_area_param = f"%{practice_area}%"
-            count_params.extend([practice_area_param, practice_area_param, practice_area_param])
+        # Cursor pages skip the total count; it is only needed for offset pagination
+        total_count = None
+        if not keyset:
+            count_query = """
+                SELECT COUNT(*) as total
+                FROM Content c
+                JOIN Blog_Posts bp ON c.Content_ID = bp.Content_ID
+                WHERE c.Content_Type = 'Blog_Post' AND bp.Is_Published = TRUE
+            """ + filters
 
-        cursor.execute(count_query, count_params)
-        total_count = cursor.fetchone()['total']
+            cursor.execute(count_query, params)
+            total_count = cursor.fetchone()['total']
 
         cursor.close()
         connection.close()
@@ -2331,7 +2335,8 @@ def get_blog_posts():
             "blog_posts": blog_posts,
             "total": total_count,
             "limit": limit,
-            "offset": offset
+            "offset": offset,
+            "next_cursor": next_cursor
         })
     except Exception as e:
         print(f"Error in get_blog_posts: {str(e)}")
@@ -2381,14 +2386,9 @@ def get_blog_post(post_id):
 
         comments = cursor.fetchall()
 
-        # Update view count in metrics
-        cursor.execute("""
-            UPDATE Content_Metrics
-            SET Views = Views + 1, Last_Updated = NOW()
-            WHERE Content_ID = %s
-        """, (post_id,))
+        # Record the view; counts are flushed to Content_Metrics in batches
+        view_counter.increment(post_id)
 
-        connection.commit()
         cursor.close()
         connection.close()
 
@@ -2500,6 +2500,8 @@ def create_blog_post(user_id):
             connection.commit()
             cursor.close()
             connection.close()
+            sync_recommendation_index(new_content_id)
+            sync_search_index(new_content_id)
 
             return jsonify({
                 "success": True,
@@ -2607,6 +2609,8 @@ def update_blog_post(user_id, post_id):
         connection.commit()
         cursor.close()
         connection.close()
+        sync_recommendation_index(post_id)
+        sync_search_index(post_id)
 
         return jsonify({
             "success": True,
@@ -2667,6 +2671,8 @@ def delete_blog_post(user_id, post_id):
         connection.commit()
         cursor.close()
         connection.close()
+        sync_recommendation_index(post_id)
+        sync_search_index(post_id)
 
         return jsonify({
             "success": True,
@@ -2710,6 +2716,9 @@ def add_blog_comment(user_id, post_id):
                 WHERE Content_ID = %s
             """, (post_id,))
 
+            # Sentiment is refreshed by the sentiment worker, not in this request
+            queue_sentiment_update(post_id, connection)
+
             connection.commit()
             cursor.close()
             connection.close()
@@ -2733,72 +2742,84 @@ def add_blog_comment(user_id, post_id):
 @app.route('/api/content/<int:content_id>/like', methods=['POST'])
 @require_permission('content_read_public')
 def like_content(user_id, content_id):
-    """Like or unlike content (blog posts, research papers, etc.)"""
+    """
+    Like or unlike content (blog posts, research papers, etc.)
+
+    With {"action": "like"} or {"action": "unlike"} the request is idempotent:
+    repeating it (e.g. a double click) changes nothing and awards no credit.
+    Without an action it toggles, as older clients expect. The like, its
+    credit transaction and the returned count share one transaction.
+    """
+    connection = None
     try:
+        data = request.get_json(silent=True) or {}
+        requested_action = data.get('action')
+        if requested_action not in (None, 'like', 'unlike'):
+            return jsonify({"success": False, "message": "Invalid action. Must be 'like' or 'unlike'"}), 400
+
         connection = get_db_connection()
         cursor = connection.cursor(dictionary=True)
 
-        # Check if content exists and is active
-        cursor.execute("""
-            SELECT Content_ID, Title, Content_Type, Status
-            FROM Content
-            WHERE Content_ID = %s AND Status = 'Active'
-        """, (content_id,))
-
-        content = cursor.fetchone()
-        if not content:
+        # Content must exist and be active; the creator row is reused for the credit transaction
+        cursor.execute(CONTENT_CREATOR_QUERY, (content_id,))
+        content_info = cursor.fetchone()
+        if not content_info:
+            cursor.close()
+            connection.close()
             return jsonify({"success": False, "message": "Content not found or inactive"}), 404
 
-        # Check if user has already liked this content
-        cursor.execute("""
-            SELECT Like_ID FROM Content_Likes
-            WHERE User_ID = %s AND Content_ID = %s
-        """, (user_id, content_id))
-
-        existing_like = cursor.fetchone()
-
-        credit_result = None
+        # The unique key on (User_ID, Content_ID) decides which of two racing requests changes anything
+        def add_like():
+            cursor.execute("""
+                INSERT IGNORE INTO Content_Likes (User_ID, Content_ID)
+                VALUES (%s, %s)
+            """, (user_id, content_id))
+            return cursor.rowcount == 1
 
-        if existing_like:
-            # User has already liked, so unlike it
+        def remove_like():
             cursor.execute("""
                 DELETE FROM Content_Likes
                 WHERE User_ID = %s AND Content_ID = %s
             """, (user_id, content_id))
+            return cursor.rowcount == 1
 
-            action = "unliked"
-            is_liked = False
-
-            # Deduct credit from content creator
-            credit_result = credit_system.deduct_like_credit(content_id, user_id)
-
+        if requested_action == 'like':
+            is_liked, changed = True, add_like()
+        elif requested_action == 'unlike':
+            is_liked, changed = False, remove_like()
         else:
-            # User hasn't liked, so like it
-            cursor.execute("""
-                INSERT INTO Content_Likes (User_ID, Content_ID)
-                VALUES (%s, %s)
-            """, (user_id, content_id))
-
-            action = "liked"
-            is_liked = True
+            is_liked, changed = True, add_like()
+            if not changed:
+                is_liked, changed = False, remove_like()
 
-            # Award credit to content creator
-            credit_result = credit_system.award_like_credit(content_id, user_id)
+        action = "liked" if is_liked else "unliked"
 
-        connection.commit()
+        # Credit only for a like that was actually added or removed
+        credit_result = None
+        if changed:
+            if credit_system.batched_settlement:
+                credit_result = credit_system.record_like_event(content_id, user_id, 1 if is_liked else -1, connection)
+            elif is_liked:
+                credit_result = credit_system.award_like_credit(content_id, user_id, connection=connection,
+                                                                content_info=content_info)
+            else:
+                credit_result = credit_system.deduct_like_credit(content_id, user_id, connection=connection,
+                                                                 content_info=content_info)
 
-        # Get updated like count from Content_Likes table directly
-        cursor.execute("""
-            SELECT COUNT(*) as like_count FROM Content_Likes
-            WHERE Content_ID = %s
-        """, (content_id,))
+        # A like must not commit without its credit transaction
+        if credit_result and not credit_result.get('success'):
+            connection.rollback()
+            cursor.close()
+            connection.close()
+            return jsonify({"success": False, "message": credit_result.get('message', 'Failed to process credit')}), 500
 
+        # Content_Metrics.Likes is maintained by the Content_Likes triggers in this transaction
+        cursor.execute("SELECT Likes FROM Content_Metrics WHERE Content_ID = %s", (content_id,))
         result = cursor.fetchone()
-        like_count = result['like_count'] if result else 0
-
-        # Note: Content_Metrics is automatically updated by database trigger
-        # No need to manually update it here to avoid conflicts
+        like_count = result['Likes'] if result else 0
 
+        # Like/unlike and the matching credit transaction commit together
+        connection.commit()
         cursor.close()
         connection.close()
 
@@ -2806,9 +2827,10 @@ def like_content(user_id, content_id):
         response_data = {
             "success": True,
             "action": action,
+            "changed": changed,
             "is_liked": is_liked,
             "like_count": like_count,
-            "message": f"Content {action} successfully"
+            "message": f"Content {action} successfully" if changed else f"Content already {action}"
         }
 
         # Add credit information if available
@@ -2893,14 +2915,27 @@ def get_credit_transactions(user_id):
         # Get query parameters
         limit = request.args.get('limit', 50, type=int)
         offset = request.args.get('offset', 0, type=int)
+        before = request.args.get('before')  # Keyset cursor: Transaction_ID of the previous page's last row
 
         # Validate parameters
         if limit > 100:
             limit = 100  # Maximum limit
+        if limit < 1:
+            limit = 1
         if offset < 0:
             offset = 0
 
-        result = credit_system.get_user_transaction_history(user_id, limit, offset)
+        if before is not None:
+            try:
+                before = int(before)
+            except ValueError:
+                return jsonify({"success": False, "message": "Invalid cursor, expected before=<transaction_id>"}), 400
+
+        # The total is optional; by default only offset pages include it
+        include_total = request.args.get('include_total', 'false' if before is not None else 'true').lower() in ('1', 'true', 'yes')
+
+        result = credit_system.get_user_transaction_history(user_id, limit, offset, before=before,
+                                                            include_total=include_total)
 
         if result['success']:
             return jsonify({
@@ -2908,8 +2943,11 @@ def get_credit_transactions(user_id):
                 "transactions": result['transactions'],
                 "total_count": result['total_count'],
                 "limit": result['limit'],
-                "offset": result['offset']
+                "offset": result['offset'],
+                "next_cursor": result['next_cursor']
             })
+        elif result.get('invalid_cursor'):
+            return jsonify({"success": False, "message": result['message']}), 400
         else:
             return jsonify({"success": False, "message": result['message']}), 500
 
@@ -3026,16 +3064,13 @@ def add_content_comment(user_id, content_id):
                     VALUES (%s, %s, %s, %s, %s, %s)
                 """, (content_info['User_ID'], 'content_comment', notification_title, notification_message, content_id, action_url))
 
+            # Sentiment is refreshed by the sentiment worker, not in this request
+            queue_sentiment_update(content_id, connection)
+
             connection.commit()
             cursor.close()
             connection.close()
 
-            # Trigger sentiment analysis update in background
-            try:
-                update_content_sentiment_async(content_id)
-            except Exception as sentiment_error:
-                logger.warning(f"Failed to update sentiment for content {content_id}: {sentiment_error}")
-
             return jsonify({
                 "success": True,
                 "message": "Comment added successfully",
@@ -3134,12 +3169,12 @@ def update_content_sentiment(user_id, content_id):
                 "message": "Cannot analyze sentiment for inactive content"
             }), 400
 
-        # Trigger sentiment analysis
-        update_content_sentiment_async(content_id)
+        # Queue sentiment analysis for the sentiment worker
+        queue_sentiment_update(content_id)
 
         return jsonify({
             "success": True,
-            "message": "Sentiment analysis update triggered successfully"
+            "message": "Sentiment analysis update queued successfully"
         })
 
     except Exception as e:
@@ -3176,21 +3211,19 @@ def batch_update_sentiment(user_id):
         """, (limit,))
 
         content_ids = [row['Content_ID'] for row in cursor.fetchall()]
-        cursor.close()
-        connection.close()
 
-        # Update sentiment for each content item
-        updated_count = 0
+        # Queue sentiment analysis for the sentiment worker
         for content_id in content_ids:
-            try:
-                update_content_sentiment_async(content_id)
-                updated_count += 1
-            except Exception as e:
-                logger.error(f"Failed to update sentiment for content {content_id}: {str(e)}")
+            queue_sentiment_update(content_id, connection)
+        connection.commit()
+        updated_count = len(content_ids)
+
+        cursor.close()
+        connection.close()
 
         return jsonify({
             "success": True,
-            "message": f"Sentiment analysis updated for {updated_count} out of {len(content_ids)} blog posts",
+            "message": f"Sentiment analysis queued for {updated_count} blog posts",
             "updated_count": updated_count,
             "total_found": len(content_ids)
         })
@@ -3751,9 +3784,9 @@ def get_research_papers():
 
         # Add filters
         if keywords:
-            query += " AND (rp.Keywords LIKE %s OR c.Title LIKE %s OR rp.Abstract LIKE %s)"
+            query += " AND (rp.Keywords LIKE %s OR c.Title LIKE %s OR rp.Abstract LIKE %s OR" + PDF_TEXT_MATCH_FILTER + ")"
             keyword_param = f"%{keywords}%"
-            params.extend([keyword_param, keyword_param, keyword_param])
+            params.extend([keyword_param, keyword_param, keyword_param, keywords])
 
         # Always filter by status (default to 'Active')
         query += " AND c.Status = %s"
@@ -3777,9 +3810,9 @@ def get_research_papers():
         count_params = []
 
         if keywords:
-            count_query += " AND (rp.Keywords LIKE %s OR c.Title LIKE %s OR rp.Abstract LIKE %s)"
+            count_query += " AND (rp.Keywords LIKE %s OR c.Title LIKE %s OR rp.Abstract LIKE %s OR" + PDF_TEXT_MATCH_FILTER + ")"
             keyword_param = f"%{keywords}%"
-            count_params.extend([keyword_param, keyword_param, keyword_param])
+            count_params.extend([keyword_param, keyword_param, keyword_param, keywords])
 
         # Always filter by status (default to 'Active')
         count_query += " AND c.Status = %s"
@@ -3829,14 +3862,9 @@ def get_research_paper(paper_id):
             connection.close()
             return jsonify({"success": False, "message": "Research paper not found"}), 404
 
-        # Update view count in metrics
-        cursor.execute("""
-            UPDATE Content_Metrics
-            SET Views = Views + 1, Last_Updated = NOW()
-            WHERE Content_ID = %s
-        """, (paper_id,))
+        # Record the view; counts are flushed to Content_Metrics in batches
+        view_counter.increment(paper_id)
 
-        connection.commit()
         cursor.close()
         connection.close()
 
@@ -3847,6 +3875,75 @@ def get_research_paper(paper_id):
     except Exception as e:
         return jsonify({"success": False, "message": str(e)}), 500
 
+def research_paper_pdf_path(pdf_url):
+    """Local path of an uploaded research paper PDF, from its URL"""
+    pdf_filename = pdf_url.split('/')[-1]
+    return os.path.join(os.getcwd(), 'uploads', 'research_papers', pdf_filename)
+
+def note_pdf_path(pdf_url):
+    """Local path of an uploaded note PDF, from its URL"""
+    pdf_filename = pdf_url.split('/')[-1]
+    return os.path.join(os.getcwd(), 'uploads', 'notes', pdf_filename)
+
+# Content IDs whose PDF pages match a word search (FULLTEXT index of pdf_text_migration.sql)
+PDF_TEXT_MATCH_FILTER = """
+    c.Content_ID IN (SELECT Content_ID FROM Content_Pdf_Pages WHERE MATCH(Text) AGAINST (%s IN NATURAL LANGUAGE MODE))
+"""
+
+def queue_research_paper_thumbnail(content_id, user_id, pdf_url, fallback_url=None):
+    """
+    Render a research paper thumbnail in the background.
+    Call after the placeholder URL was committed to Content.Thumbnail_URL;
+    fallback_url is stored instead if rendering fails.
+    """
+    try:
+        thumbnail_pipeline.submit(content_id, user_id, research_paper_pdf_path(pdf_url), fallback_url)
+    except Exception as e:
+        logger.error(f"Failed to queue thumbnail for research paper {content_id}: {str(e)}")
+
+@app.route('/api/research-papers/<int:paper_id>/thumbnail', methods=['GET'])
+def get_research_paper_thumbnail_status(paper_id):
+    """Thumbnail generation status of a research paper"""
+    try:
+        connection = get_db_connection()
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT Thumbnail_URL FROM Content
+            WHERE Content_ID = %s AND Content_Type = 'Research_Paper'
+        """, (paper_id,))
+        row = cursor.fetchone()
+        cursor.close()
+        connection.close()
+
+        if not row:
+            return jsonify({"success": False, "message": "Research paper not found"}), 404
+
+        thumbnail_url = row['Thumbnail_URL'] or ''
+        if thumbnail_pipeline.is_placeholder(thumbnail_url):
+            status = 'queued'
+        else:
+            status = 'ready' if thumbnail_url else 'none'
+
+        response = {
+            "success": True,
+            "content_id": paper_id,
+            "status": status,
+            "thumbnail_url": thumbnail_url
+        }
+
+        # The worker that queued the render also knows about failures and timings
+        job = thumbnail_pipeline.get_status(paper_id)
+        if job and job['status'] == 'failed' and status != 'ready':
+            response['status'] = 'failed'
+            response['error'] = job['error']
+        if job:
+            response['requested_at'] = job['requested_at']
+            response['completed_at'] = job['completed_at']
+
+        return jsonify(response)
+    except Exception as e:
+        return jsonify({"success": False, "message": str(e)}), 500
+
 @app.route('/api/research-papers', methods=['POST'])
 @require_permission('content_create_own')
 def create_research_paper(user_id):
@@ -3877,6 +3974,10 @@ def create_research_paper(user_id):
             is_published = data.get('is_published', True)  # Default to True for admins/editors
             content_status = 'Active' if is_published else 'Inactive'
 
+            # Render the thumbnail in the background when the PDF has none yet
+            generate_thumbnail = bool(data.get('pdf_url')) and not data.get('thumbnail_url')
+            thumbnail_url = thumbnail_pipeline.placeholder_url if generate_thumbnail else data.get('thumbnail_url', '')
+
             cursor.execute("""
                 INSERT INTO Content (User_ID, Content_Type, Title, Summary, Content, Featured_Image, Thumbnail_URL, Tags, Status)
                 VALUES (%s, 'Research_Paper', %s, %s, %s, %s, %s, %s, %s)
@@ -3886,7 +3987,7 @@ def create_research_paper(user_id):
                 data.get('abstract', ''),  # Use abstract as summary
                 data.get('abstract', ''),  # Store abstract in content field too
                 data.get('pdf_url', ''),  # Store PDF URL in Featured_Image
-                data.get('thumbnail_url', ''),  # Store thumbnail URL
+                thumbnail_url,  # Provided thumbnail URL, or the placeholder until the render finishes
                 data.get('keywords', ''),  # Use keywords as tags
                 content_status
             ))
@@ -3908,23 +4009,6 @@ def create_research_paper(user_id):
                 data.get('abstract', ''),
             ))
 
-            # Generate thumbnail if PDF URL is provided and we have a content_id
-            if data.get('pdf_url') and not data.get('thumbnail_url'):
-                # Extract filename from PDF URL to get the file path
-                pdf_filename = data.get('pdf_url').split('/')[-1]
-                pdf_path = os.path.join(os.getcwd(), 'uploads', 'research_papers', pdf_filename)
-
-                # Generate thumbnail
-                thumbnail_success, thumbnail_url, thumbnail_error = generate_research_paper_thumbnail(
-                    pdf_path, new_content_id, user_id
-                )
-
-                # Update the content with the generated thumbnail URL
-                if thumbnail_success:
-                    cursor.execute("""
-                        UPDATE Content SET Thumbnail_URL = %s WHERE Content_ID = %s
-                    """, (thumbnail_url, new_content_id))
-
             # Create metrics entry
             cursor.execute("INSERT INTO Content_Metrics (Content_ID) VALUES (%s)", (new_content_id,))
 
@@ -3938,11 +4022,21 @@ def create_research_paper(user_id):
             connection.commit()
             cursor.close()
             connection.close()
+            sync_recommendation_index(new_content_id)
+            sync_search_index(new_content_id)
+
+            # The placeholder is committed, so the finished render can replace it
+            if generate_thumbnail:
+                queue_research_paper_thumbnail(new_content_id, user_id, data['pdf_url'])
+            if data.get('pdf_url'):
+                pdf_text_extractor.submit(new_content_id, research_paper_pdf_path(data['pdf_url']))
 
             return jsonify({
                 "success": True,
                 "message": "Research paper created successfully",
-                "content_id": new_content_id
+                "content_id": new_content_id,
+                "thumbnail_url": thumbnail_url,
+                "thumbnail_status": "queued" if generate_thumbnail else "ready" if thumbnail_url else "none"
             }), 201
 
         except Exception as db_error:
@@ -3965,7 +4059,8 @@ def update_research_paper(user_id, paper_id):
 
         # Get content info and user role
         cursor.execute("""
-            SELECT c.User_ID as content_owner_id, u.Role_ID as user_role
+            SELECT c.User_ID as content_owner_id, u.Role_ID as user_role,
+                   c.Featured_Image as current_pdf_url, c.Thumbnail_URL as current_thumbnail_url
             FROM Content c
             JOIN Users u ON u.User_ID = %s
             WHERE c.Content_ID = %s AND c.Content_Type = 'Research_Paper'
@@ -3991,6 +4086,14 @@ def update_research_paper(user_id, paper_id):
             connection.close()
             return jsonify({"success": False, "message": "Permission denied. You can only edit your own content."}), 403
 
+        # Regenerate the thumbnail in the background when the PDF changed or has no rendered thumbnail yet
+        current_thumbnail_url = result['current_thumbnail_url'] or ''
+        regenerate_thumbnail = bool(data.get('pdf_url')) and (
+            data['pdf_url'] != result['current_pdf_url']
+            or not current_thumbnail_url
+            or thumbnail_pipeline.is_placeholder(current_thumbnail_url)
+        ) and os.path.exists(research_paper_pdf_path(data['pdf_url']))
+
         # Update Content table
         content_updates = []
         content_params = []
@@ -4007,7 +4110,10 @@ def update_research_paper(user_id, paper_id):
         if 'pdf_url' in data:  # Frontend sends pdf_url
             content_updates.append("Featured_Image = %s")
             content_params.append(data['pdf_url'])
-        if 'thumbnail_url' in data:  # Frontend sends thumbnail_url
+        if regenerate_thumbnail:  # Placeholder until the background render finishes
+            content_updates.append("Thumbnail_URL = %s")
+            content_params.append(thumbnail_pipeline.placeholder_url)
+        elif 'thumbnail_url' in data:  # Frontend sends thumbnail_url
             content_updates.append("Thumbnail_URL = %s")
             content_params.append(data['thumbnail_url'])
         if 'keywords' in data:  # Use keywords as tags
@@ -4060,68 +4166,25 @@ def update_research_paper(user_id, paper_id):
                 WHERE Content_ID = %s
             """, paper_params)
 
-        # Check if PDF URL was updated and regenerate thumbnail if needed
-        pdf_url_updated = 'pdf_url' in data and data['pdf_url']
-        thumbnail_url_provided = 'thumbnail_url' in data and data['thumbnail_url']
-
-        print(f"🔍 DEBUG: pdf_url_updated={pdf_url_updated}, thumbnail_url_provided={thumbnail_url_provided}")
-        print(f"🔍 DEBUG: data keys: {list(data.keys())}")
-        if 'pdf_url' in data:
-            print(f"🔍 DEBUG: pdf_url value: {data['pdf_url']}")
-        if 'thumbnail_url' in data:
-            print(f"🔍 DEBUG: thumbnail_url value: {data['thumbnail_url']}")
-
-        if pdf_url_updated:
-            # Extract filename from PDF URL to get the file path
-            pdf_filename = data['pdf_url'].split('/')[-1]
-            pdf_path = os.path.join(os.getcwd(), 'uploads', 'research_papers', pdf_filename)
-
-            # Check if the PDF file exists
-            if os.path.exists(pdf_path):
-                # Import thumbnail generation function
-                from utils.pdf_thumbnail import generate_research_paper_thumbnail
-
-                # Generate new thumbnail (this will overwrite any existing thumbnail)
-                thumbnail_success, new_thumbnail_url, thumbnail_error = generate_research_paper_thumbnail(
-                    pdf_path, paper_id, user_id
-                )
-
-                # Update the content with the new thumbnail URL
-                if thumbnail_success:
-                    cursor.execute("""
-                        UPDATE Content SET Thumbnail_URL = %s WHERE Content_ID = %s
-                    """, (new_thumbnail_url, paper_id))
-                    print(f"✅ Thumbnail regenerated for research paper {paper_id}: {new_thumbnail_url}")
-                else:
-                    print(f"⚠️ Failed to regenerate thumbnail for research paper {paper_id}: {thumbnail_error}")
-                    # If thumbnail generation failed but a thumbnail URL was provided, use that
-                    if thumbnail_url_provided:
-                        cursor.execute("""
-                            UPDATE Content SET Thumbnail_URL = %s WHERE Content_ID = %s
-                        """, (data['thumbnail_url'], paper_id))
-                        print(f"📎 Using provided thumbnail URL for research paper {paper_id}: {data['thumbnail_url']}")
-            else:
-                print(f"⚠️ PDF file not found for thumbnail regeneration: {pdf_path}")
-                # If PDF file not found but thumbnail URL was provided, use that
-                if thumbnail_url_provided:
-                    cursor.execute("""
-                        UPDATE Content SET Thumbnail_URL = %s WHERE Content_ID = %s
-                    """, (data['thumbnail_url'], paper_id))
-                    print(f"📎 Using provided thumbnail URL for research paper {paper_id}: {data['thumbnail_url']}")
-        elif thumbnail_url_provided:
-            # Only thumbnail URL was provided (no PDF URL change)
-            cursor.execute("""
-                UPDATE Content SET Thumbnail_URL = %s WHERE Content_ID = %s
-            """, (data['thumbnail_url'], paper_id))
-            print(f"📎 Updated thumbnail URL for research paper {paper_id}: {data['thumbnail_url']}")
-
         connection.commit()
         cursor.close()
         connection.close()
+        sync_recommendation_index(paper_id)
+        sync_search_index(paper_id)
+
+        # The placeholder is committed, so the finished render can replace it
+        if regenerate_thumbnail:
+            fallback_url = data.get('thumbnail_url') or current_thumbnail_url
+            if thumbnail_pipeline.is_placeholder(fallback_url):
+                fallback_url = None
+            queue_research_paper_thumbnail(paper_id, user_id, data['pdf_url'], fallback_url)
+        if data.get('pdf_url') and data['pdf_url'] != result['current_pdf_url']:
+            pdf_text_extractor.submit(paper_id, research_paper_pdf_path(data['pdf_url']))
 
         return jsonify({
             "success": True,
-            "message": "Research paper updated successfully"
+            "message": "Research paper updated successfully",
+            "thumbnail_status": "queued" if regenerate_thumbnail else None
         })
     except Exception as e:
         return jsonify({"success": False, "message": str(e)}), 500
@@ -4178,6 +4241,8 @@ def delete_research_paper(user_id, paper_id):
         connection.commit()
         cursor.close()
         connection.close()
+        sync_recommendation_index(paper_id)
+        sync_search_index(paper_id)
 
         return jsonify({
             "success": True,
@@ -4382,9 +4447,9 @@ def get_notes():
 
         # Add search filters
         if search_keywords:
-            query += " AND (c.Title LIKE %s OR c.Content LIKE %s)"
+            query += " AND (c.Title LIKE %s OR c.Content LIKE %s OR" + PDF_TEXT_MATCH_FILTER + ")"
             search_param = f"%{search_keywords}%"
-            params.extend([search_param, search_param])
+            params.extend([search_param, search_param, search_keywords])
 
         if category:
             query += " AND n.Category = %s"
@@ -4432,9 +4497,9 @@ def get_notes():
 
         # Apply same filters for count
         if search_keywords:
-            count_query += " AND (c.Title LIKE %s OR c.Content LIKE %s)"
+            count_query += " AND (c.Title LIKE %s OR c.Content LIKE %s OR" + PDF_TEXT_MATCH_FILTER + ")"
             search_param = f"%{search_keywords}%"
-            count_params.extend([search_param, search_param])
+            count_params.extend([search_param, search_param, search_keywords])
 
         if category:
             count_query += " AND n.Category = %s"
@@ -4501,14 +4566,9 @@ def get_note(note_id):
             connection.close()
             return jsonify({"success": False, "message": "Note not found"}), 404
 
-        # Update view count
-        cursor.execute("""
-            UPDATE Content_Metrics
-            SET Views = Views + 1, Last_Updated = NOW()
-            WHERE Content_ID = %s
-        """, (note['content_id'],))
+        # Record the view; counts are flushed to Content_Metrics in batches
+        view_counter.increment(note['content_id'])
 
-        connection.commit()
         cursor.close()
         connection.close()
 
@@ -4602,6 +4662,12 @@ def create_note(user_id):
             connection.commit()
             cursor.close()
             connection.close()
+            sync_recommendation_index(new_content_id)
+            sync_search_index(new_content_id)
+
+            # Index every page of the PDF for search (the note content only keeps a preview)
+            if content_type == 'pdf' and data.get('pdf_file_path'):
+                pdf_text_extractor.submit(new_content_id, note_pdf_path(data['pdf_file_path']))
 
             return jsonify({
                 "success": True,
@@ -4694,6 +4760,8 @@ def update_note(user_id, note_id):
         connection.commit()
         cursor.close()
         connection.close()
+        sync_recommendation_index(note['Content_ID'])
+        sync_search_index(note['Content_ID'])
 
         return jsonify({
             "success": True,
@@ -4755,6 +4823,8 @@ def delete_note(user_id, note_id):
         connection.commit()
         cursor.close()
         connection.close()
+        sync_recommendation_index(note['Content_ID'])
+        sync_search_index(note['Content_ID'])
 
         return jsonify({
             "success": True,
@@ -5261,6 +5331,8 @@ def update_content_status(user_id, content_id):
         connection.commit()
         cursor.close()
         connection.close()
+        sync_recommendation_index(content_id)
+        sync_search_index(content_id)
 
         return jsonify({
             "success": True,
@@ -5450,14 +5522,9 @@ def get_job(user_id, job_id):
 
         application = cursor.fetchone()
 
-        # Update view count in metrics
-        cursor.execute("""
-            UPDATE Content_Metrics
-            SET Views = Views + 1, Last_Updated = NOW()
-            WHERE Content_ID = %s
-        """, (job['content_id'],))
+        # Record the view; counts are flushed to Content_Metrics in batches
+        view_counter.increment(job['content_id'])
 
-        connection.commit()
         cursor.close()
         connection.close()
 
@@ -5546,6 +5613,7 @@ def create_job(user_id):
             connection.commit()
             cursor.close()
             connection.close()
+            sync_search_index(new_content_id)
 
             return jsonify({
                 "success": True,
@@ -5741,6 +5809,7 @@ def update_job(user_id, job_id):
         connection.commit()
         cursor.close()
         connection.close()
+        sync_search_index(content_id)
 
         return jsonify({
             "success": True,
@@ -5804,6 +5873,7 @@ def delete_job(user_id, job_id):
         connection.commit()
         cursor.close()
         connection.close()
+        sync_search_index(content_id)
 
         return jsonify({
             "success": True,
@@ -5961,14 +6031,9 @@ def get_internship(user_id, internship_id):
 
         application = cursor.fetchone()
 
-        # Update view count in metrics
-        cursor.execute("""
-            UPDATE Content_Metrics
-            SET Views = Views + 1, Last_Updated = NOW()
-            WHERE Content_ID = %s
-        """, (internship['content_id'],))
+        # Record the view; counts are flushed to Content_Metrics in batches
+        view_counter.increment(internship['content_id'])
 
-        connection.commit()
         cursor.close()
         connection.close()
 
@@ -6057,6 +6122,7 @@ def create_internship(user_id):
             connection.commit()
             cursor.close()
             connection.close()
+            sync_search_index(new_content_id)
 
             return jsonify({
                 "success": True,
@@ -6252,6 +6318,7 @@ def update_internship(user_id, internship_id):
         connection.commit()
         cursor.close()
         connection.close()
+        sync_search_index(content_id)
 
         return jsonify({
             "success": True,
@@ -6315,6 +6382,7 @@ def delete_internship(user_id, internship_id):
         connection.commit()
         cursor.close()
         connection.close()
+        sync_search_index(content_id)
 
         return jsonify({
             "success": True,
@@ -6808,7 +6876,13 @@ def health_check():
         return jsonify({
             "status": "healthy",
             "message": "LawFort API is running",
-            "database": "connected"
+            "database": "connected",
+            "session_cache": session_cache.get_stats(),
+            "view_counter": view_counter.get_stats(),
+            "recommendation_index": recommendation_index.get_stats(),
+            "search_index": search_index.get_stats(),
+            "thumbnail_pipeline": thumbnail_pipeline.get_stats(),
+            "pdf_text": pdf_text_extractor.get_stats()
         }), 200
     except Exception as e:
         return jsonify({
@@ -7114,16 +7188,21 @@ def submit_research_paper_for_review(user_id):
         connection = get_db_connection()
         cursor = connection.cursor(dictionary=True)
 
+        # Render the thumbnail in the background; the placeholder is shown until then
+        generate_thumbnail = bool(data.get('pdf_url'))
+        thumbnail_url = thumbnail_pipeline.placeholder_url if generate_thumbnail else ''
+
         # Insert into Content table with 'Pending' status for review
         cursor.execute("""
-            INSERT INTO Content (User_ID, Content_Type, Title, Summary, Content, Featured_Image, Tags, Status)
-            VALUES (%s, 'Research_Paper', %s, %s, %s, %s, %s, 'Pending')
+            INSERT INTO Content (User_ID, Content_Type, Title, Summary, Content, Featured_Image, Thumbnail_URL, Tags, Status)
+            VALUES (%s, 'Research_Paper', %s, %s, %s, %s, %s, %s, 'Pending')
         """, (
             user_id,
             data.get('title'),
             data.get('abstract', ''),
             data.get('abstract', ''),
             data.get('pdf_url', ''),
+            thumbnail_url,
             data.get('keywords', ''),
         ))
 
@@ -7166,6 +7245,10 @@ def submit_research_paper_for_review(user_id):
         cursor.close()
         connection.close()
 
+        if generate_thumbnail:
+            queue_research_paper_thumbnail(new_content_id, user_id, data['pdf_url'])
+            pdf_text_extractor.submit(new_content_id, research_paper_pdf_path(data['pdf_url']))
+
         return jsonify({
             "success": True,
             "message": "Research paper submitted for review successfully",
@@ -7478,12 +7561,11 @@ def debug_user_permissions():
 @require_permission('job_apply')
 def upload_resume(user_id):
     try:
-        # Check if file is in request
-        if 'file' not in request.files:
+        # Stream the file field of the body (request.files would buffer the whole upload first)
+        file = open_multipart_file(request, 'file', MAX_FILE_SIZE)
+        if file is None:
             return jsonify({"success": False, "message": "No file provided"}), 400
 
-        file = request.files['file']
-
         # Check if file is selected
         if file.filename == '':
             return jsonify({"success": False, "message": "No file selected"}), 400
@@ -7497,9 +7579,8 @@ def upload_resume(user_id):
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"{user_id}_{timestamp}_{filename}"
 
-        # Save file
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(file_path)
+        # Store once per content hash; the friendly name links to the stored copy
+        upload_store.save(file, app.config['UPLOAD_FOLDER'], filename, max_size=MAX_FILE_SIZE, magic=PDF_MAGIC)
 
         # Generate file URL (you may want to serve files through a different route)
         file_url = f"http://localhost:5000/uploads/resumes/{filename}"
@@ -7511,6 +7592,8 @@ def upload_resume(user_id):
             "filename": filename
         }), 200
 
+    except UploadError as e:
+        return jsonify({"success": False, "message": str(e)}), e.status_code
     except Exception as e:
         return jsonify({"success": False, "message": f"Upload failed: {str(e)}"}), 500
 
@@ -7528,12 +7611,11 @@ def uploaded_file(filename):
 @require_permission('content_create_own')
 def upload_note_pdf(user_id):
     try:
-        # Check if file is in request
-        if 'file' not in request.files:
+        # Stream the file field of the body; the 10MB limit is enforced while reading
+        file = open_multipart_file(request, 'file', MAX_PDF_SIZE)
+        if file is None:
             return jsonify({"success": False, "message": "No file provided"}), 400
 
-        file = request.files['file']
-
         # Check if file is selected
         if file.filename == '':
             return jsonify({"success": False, "message": "No file selected"}), 400
@@ -7542,15 +7624,6 @@ def upload_note_pdf(user_id):
         if not file.filename.lower().endswith('.pdf'):
             return jsonify({"success": False, "message": "Only PDF files are allowed"}), 400
 
-        # Check file size (10MB limit for PDFs)
-        file.seek(0, 2)  # Seek to end of file
-        file_size = file.tell()
-        file.seek(0)  # Reset to beginning
-
-        max_size = 10 * 1024 * 1024  # 10MB
-        if file_size > max_size:
-            return jsonify({"success": False, "message": "File size must be less than 10MB"}), 400
-
         # Generate secure filename
         filename = secure_filename(file.filename)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -7560,18 +7633,15 @@ def upload_note_pdf(user_id):
         notes_upload_folder = os.path.join(os.getcwd(), 'uploads', 'notes')
         os.makedirs(notes_upload_folder, exist_ok=True)
 
-        # Save file
-        file_path = os.path.join(notes_upload_folder, filename)
-        file.save(file_path)
+        # Store once per content hash; the friendly name links to the stored copy
+        stored = upload_store.save(file, notes_upload_folder, filename, max_size=MAX_PDF_SIZE, magic=PDF_MAGIC)
+        file_size = stored.size
 
-        # Extract text from PDF for search functionality
+        # Extract text from PDF for search functionality (once per distinct PDF, time and page limited);
+        # the pages are indexed for search when the note is saved
         try:
-            with open(file_path, 'rb') as pdf_file:
-                pdf_reader = PyPDF2.PdfReader(pdf_file)
-                extracted_text = ""
-                for page in pdf_reader.pages:
-                    extracted_text += page.extract_text() + "\n"
-        except Exception as e:
+            extracted_text = "\n".join(pdf_text_extractor.extract(stored.path, stored.sha256))
+        except PdfTextError as e:
             print(f"PDF text extraction failed: {e}")
             extracted_text = ""
 
@@ -7587,6 +7657,8 @@ def upload_note_pdf(user_id):
             "extracted_text": extracted_text[:500] + "..." if len(extracted_text) > 500 else extracted_text
         }), 200
 
+    except UploadError as e:
+        return jsonify({"success": False, "message": str(e)}), e.status_code
     except Exception as e:
         return jsonify({"success": False, "message": f"Upload failed: {str(e)}"}), 500
 
@@ -7595,12 +7667,11 @@ def upload_note_pdf(user_id):
 @require_permission('content_create_own')
 def upload_research_paper_pdf(user_id):
     try:
-        # Check if file is in request
-        if 'file' not in request.files:
+        # Stream the file field of the body; the 10MB limit is enforced while reading
+        file = open_multipart_file(request, 'file', MAX_PDF_SIZE)
+        if file is None:
             return jsonify({"success": False, "message": "No file provided"}), 400
 
-        file = request.files['file']
-
         # Check if file is selected
         if file.filename == '':
             return jsonify({"success": False, "message": "No file selected"}), 400
@@ -7609,15 +7680,6 @@ def upload_research_paper_pdf(user_id):
         if not file.filename.lower().endswith('.pdf'):
             return jsonify({"success": False, "message": "Only PDF files are allowed"}), 400
 
-        # Check file size (10MB limit for PDFs)
-        file.seek(0, 2)  # Seek to end of file
-        file_size = file.tell()
-        file.seek(0)  # Reset to beginning
-
-        max_size = 10 * 1024 * 1024  # 10MB
-        if file_size > max_size:
-            return jsonify({"success": False, "message": "File size must be less than 10MB"}), 400
-
         # Generate secure filename
         filename = secure_filename(file.filename)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -7627,36 +7689,28 @@ def upload_research_paper_pdf(user_id):
         research_papers_upload_folder = os.path.join(os.getcwd(), 'uploads', 'research_papers')
         os.makedirs(research_papers_upload_folder, exist_ok=True)
 
-        # Save file
-        file_path = os.path.join(research_papers_upload_folder, filename)
-        file.save(file_path)
+        # Store once per content hash; the friendly name links to the stored copy
+        stored = upload_store.save(file, research_papers_upload_folder, filename,
+                                   max_size=MAX_PDF_SIZE, magic=PDF_MAGIC)
+        file_size = stored.size
 
         # Generate file URL
         file_url = f"http://localhost:5000/uploads/research_papers/{filename}"
 
-        # Generate thumbnail for the PDF
-        thumbnail_success, thumbnail_url, thumbnail_error = generate_research_paper_thumbnail(
-            file_path, 0, user_id  # content_id will be 0 for now, will be updated when research paper is created
-        )
-
+        # The thumbnail is rendered in the background once the research paper is saved
         response_data = {
             "success": True,
             "message": "Research paper PDF uploaded successfully",
             "file_url": file_url,
             "filename": filename,
-            "file_size": file_size
+            "file_size": file_size,
+            "thumbnail_generated": False
         }
 
-        # Add thumbnail information if generation was successful
-        if thumbnail_success:
-            response_data["thumbnail_url"] = thumbnail_url
-            response_data["thumbnail_generated"] = True
-        else:
-            response_data["thumbnail_generated"] = False
-            response_data["thumbnail_error"] = thumbnail_error
-
         return jsonify(response_data), 200
 
+    except UploadError as e:
+        return jsonify({"success": False, "message": str(e)}), e.status_code
     except Exception as e:
         return jsonify({"success": False, "message": f"Upload failed: {str(e)}"}), 500
 
@@ -7665,12 +7719,11 @@ def upload_research_paper_pdf(user_id):
 @require_permission('research_submit')
 def upload_research_paper_submission_pdf(user_id):
     try:
-        # Check if file is in request
-        if 'file' not in request.files:
+        # Stream the file field of the body; the 10MB limit is enforced while reading
+        file = open_multipart_file(request, 'file', MAX_PDF_SIZE)
+        if file is None:
             return jsonify({"success": False, "message": "No file provided"}), 400
 
-        file = request.files['file']
-
         # Check if file is selected
         if file.filename == '':
             return jsonify({"success": False, "message": "No file selected"}), 400
@@ -7679,15 +7732,6 @@ def upload_research_paper_submission_pdf(user_id):
         if not file.filename.lower().endswith('.pdf'):
             return jsonify({"success": False, "message": "Only PDF files are allowed"}), 400
 
-        # Check file size (10MB limit for PDFs)
-        file.seek(0, 2)  # Seek to end of file
-        file_size = file.tell()
-        file.seek(0)  # Reset to beginning
-
-        max_size = 10 * 1024 * 1024  # 10MB
-        if file_size > max_size:
-            return jsonify({"success": False, "message": "File size must be less than 10MB"}), 400
-
         # Generate secure filename
         filename = secure_filename(file.filename)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -7697,36 +7741,28 @@ def upload_research_paper_submission_pdf(user_id):
         research_papers_upload_folder = os.path.join(os.getcwd(), 'uploads', 'research_papers')
         os.makedirs(research_papers_upload_folder, exist_ok=True)
 
-        # Save file
-        file_path = os.path.join(research_papers_upload_folder, filename)
-        file.save(file_path)
+        # Store once per content hash; the friendly name links to the stored copy
+        stored = upload_store.save(file, research_papers_upload_folder, filename,
+                                   max_size=MAX_PDF_SIZE, magic=PDF_MAGIC)
+        file_size = stored.size
 
         # Generate file URL
         file_url = f"http://localhost:5000/uploads/research_papers/{filename}"
 
-        # Generate thumbnail for the PDF
-        thumbnail_success, thumbnail_url, thumbnail_error = generate_research_paper_thumbnail(
-            file_path, 0, user_id  # content_id will be 0 for now, will be updated when research paper is created
-        )
-
+        # The thumbnail is rendered in the background once the research paper is saved
         response_data = {
             "success": True,
             "message": "Research paper PDF uploaded successfully",
             "file_url": file_url,
             "filename": filename,
-            "file_size": file_size
+            "file_size": file_size,
+            "thumbnail_generated": False
         }
 
-        # Add thumbnail information if generation was successful
-        if thumbnail_success:
-            response_data["thumbnail_url"] = thumbnail_url
-            response_data["thumbnail_generated"] = True
-        else:
-            response_data["thumbnail_generated"] = False
-            response_data["thumbnail_error"] = thumbnail_error
-
         return jsonify(response_data), 200
 
+    except UploadError as e:
+        return jsonify({"success": False, "message": str(e)}), e.status_code
     except Exception as e:
         return jsonify({"success": False, "message": f"Upload failed: {str(e)}"}), 500
 
@@ -7864,6 +7900,36 @@ def check_grammar():
             'statistics': {'total_issues': 0, 'by_type': {}, 'severity_distribution': {}}
         }), 500
 
+@app.route('/api/grammar/check/stream', methods=['POST'])
+def check_grammar_stream():
+    """
+    Check text for grammar issues, streaming the issues of each paragraph as it is checked.
+    Responds with NDJSON, or Server-Sent Events for `?format=sse` / `Accept: text/event-stream`.
+    """
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({'success': False, 'error': 'No JSON data provided'}), 400
+
+    text = data.get('text', '')
+    use_sse = request.args.get('format') == 'sse' or \
+        'text/event-stream' in request.headers.get('Accept', '')
+
+    def generate():
+        for event in stream_grammar_api(text):
+            if use_sse:
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+            else:
+                yield json.dumps(event) + "\n"
+
+    response = Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream' if use_sse else 'application/x-ndjson'
+    )
+    # Keep proxies from buffering the stream
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
 @app.route('/api/grammar/apply-suggestion', methods=['POST'])
 def apply_grammar_suggestion():
     """
@@ -7902,12 +7968,16 @@ def grammar_checker_health():
     """
     try:
         # Test with a simple sentence
+        # Read the warm/cold state before the test check warms an in-process checker
+        health = get_grammar_health()
         test_result = check_grammar_api("This is a test.")
 
         return jsonify({
             'success': True,
             'service_available': test_result['success'],
-            'message': 'Grammar checker is working properly'
+            'warm': health.get('warm', False),
+            'message': 'Grammar checker is working properly',
+            'pool': health
         }), 200
 
     except Exception as e:
@@ -8023,6 +8093,279 @@ def get_contributor_stats(user_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# ===== RECOMMENDATION ROUTES =====
+
+# Content that can be recommended: active, published blog posts, research papers and public notes
+RECOMMENDABLE_CONTENT_QUERY = """
+    SELECT c.Content_ID as content_id, c.Content_Type as content_type, c.Title as title,
+           c.Summary as summary, c.Tags as tags, COALESCE(bp.Category, n.Category) as category
+    FROM Content c
+    LEFT JOIN Blog_Posts bp ON c.Content_ID = bp.Content_ID
+    LEFT JOIN Notes n ON c.Content_ID = n.Content_ID
+    WHERE c.Status = 'Active'
+      AND c.Content_Type IN ('Blog_Post', 'Research_Paper', 'Note')
+      AND (c.Content_Type <> 'Blog_Post' OR bp.Is_Published = TRUE)
+      AND (c.Content_Type <> 'Note' OR COALESCE(n.Is_Private, FALSE) = FALSE)
+"""
+
+def ensure_recommendation_index():
+    """Build the recommendation index from the database if nothing is persisted yet."""
+    if recommendation_index.is_built():
+        return
+
+    connection = get_db_connection()
+    cursor = connection.cursor(dictionary=True)
+    try:
+        cursor.execute(RECOMMENDABLE_CONTENT_QUERY)
+        recommendation_index.rebuild(cursor.fetchall())
+    finally:
+        cursor.close()
+        connection.close()
+
+def sync_recommendation_index(content_id):
+    """Re-index one content item after it was created, updated or deleted."""
+    try:
+        connection = get_db_connection()
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute(RECOMMENDABLE_CONTENT_QUERY + " AND c.Content_ID = %s", (content_id,))
+        row = cursor.fetchone()
+        cursor.close()
+        connection.close()
+
+        if row:
+            recommendation_index.upsert(row['content_id'], row['content_type'], row['title'],
+                                        row['summary'], row['tags'], row['category'])
+        else:
+            recommendation_index.remove(content_id)
+    except Exception as e:
+        logger.warning(f"Failed to update recommendation index for content {content_id}: {str(e)}")
+
+@app.route('/api/recommendations', methods=['GET'])
+@require_permission('content_read_public')
+def get_recommendations(user_id):
+    """Top-k content for the current user by TF-IDF cosine similarity with their profile."""
+    try:
+        limit = max(1, min(request.args.get('limit', 10, type=int), 50))
+        content_type = request.args.get('type')
+
+        ensure_recommendation_index()
+
+        connection = get_db_connection()
+        cursor = connection.cursor(dictionary=True)
+
+        cursor.execute("""
+            SELECT Practice_Area, Law_Specialization, Bio
+            FROM User_Profile
+            WHERE User_ID = %s
+        """, (user_id,))
+        profile = cursor.fetchone() or {}
+
+        practice_area = profile.get('Practice_Area')
+        keywords = []
+        for area in PRACTICE_AREAS:
+            if area['value'] == practice_area:
+                keywords = area.get('keywords', [])
+                break
+
+        profile_text = ' '.join([
+            ' '.join(keywords),
+            profile.get('Law_Specialization') or '',
+            profile.get('Bio') or ''
+        ])
+
+        ranked = recommendation_index.recommend(profile_text, practice_area=practice_area,
+                                                limit=limit, content_type=content_type)
+
+        recommendations = []
+        if ranked:
+            content_ids = [item['content_id'] for item in ranked]
+            placeholders = ', '.join(['%s'] * len(content_ids))
+            cursor.execute(f"""
+                SELECT c.Content_ID as content_id, c.Content_Type as content_type, c.Title as title,
+                       c.Summary as summary, c.Featured_Image as featured_image, c.Tags as tags,
+                       c.Created_At as created_at, COALESCE(bp.Category, n.Category) as category,
+                       up.Full_Name as author_name,
+                       COALESCE(cm.Views, 0) as views, COALESCE(cm.Likes, 0) as likes
+                FROM Content c
+                LEFT JOIN Blog_Posts bp ON c.Content_ID = bp.Content_ID
+                LEFT JOIN Notes n ON c.Content_ID = n.Content_ID
+                LEFT JOIN User_Profile up ON c.User_ID = up.User_ID
+                LEFT JOIN Content_Metrics cm ON c.Content_ID = cm.Content_ID
+                WHERE c.Content_ID IN ({placeholders})
+            """, content_ids)
+            details = {row['content_id']: row for row in cursor.fetchall()}
+
+            for item in ranked:
+                row = details.get(item['content_id'])
+                if not row:
+                    continue
+
+                reasons = []
+                if item['practice_area_match']:
+                    reasons.append(f"Matches your practice area: {practice_area}")
+                if item['text_similarity'] > 0.1:
+                    reasons.append("Similar to your interests")
+
+                recommendations.append({
+                    **row,
+                    'score': item['score'],
+                    'reasons': reasons
+                })
+
+        cursor.close()
+        connection.close()
+
+        return jsonify({
+            "success": True,
+            "recommendations": recommendations,
+            "limit": limit
+        })
+    except Exception as e:
+        logger.error(f"Error getting recommendations: {str(e)}")
+        return jsonify({"success": False, "message": str(e)}), 500
+
+# ===== SEARCH ROUTES =====
+
+# Content that can be searched: active, published blog posts, public notes, research papers, jobs and internships
+SEARCHABLE_CONTENT_QUERY = """
+    SELECT c.Content_ID as content_id, c.Content_Type as content_type, c.Title as title,
+           c.Summary as summary, c.Content as content, c.Tags as tags,
+           COALESCE(bp.Category, n.Category, rp.Keywords) as category,
+           rp.Authors as authors,
+           COALESCE(j.Company_Name, i.Company_Name) as company,
+           COALESCE(j.Location, i.Location) as location
+    FROM Content c
+    LEFT JOIN Blog_Posts bp ON c.Content_ID = bp.Content_ID
+    LEFT JOIN Notes n ON c.Content_ID = n.Content_ID
+    LEFT JOIN Research_Papers rp ON c.Content_ID = rp.Content_ID
+    LEFT JOIN Jobs j ON c.Content_ID = j.Content_ID
+    LEFT JOIN Internships i ON c.Content_ID = i.Content_ID
+    WHERE c.Status = 'Active'
+      AND c.Content_Type IN ('Blog_Post', 'Research_Paper', 'Note', 'Job', 'Internship')
+      AND (c.Content_Type <> 'Blog_Post' OR bp.Is_Published = TRUE)
+      AND (c.Content_Type <> 'Note' OR COALESCE(n.Is_Private, FALSE) = FALSE)
+"""
+
+SEARCH_TYPES = {
+    'blog': 'Blog_Post',
+    'note': 'Note',
+    'research_paper': 'Research_Paper',
+    'job': 'Job',
+    'internship': 'Internship'
+}
+
+# Upper bound of ranked results fetched to fill one page when indexed content is no longer Active
+SEARCH_MAX_WINDOW = 1000
+
+def load_searchable_content():
+    """All searchable rows; runs in the compaction thread, so it uses its own pooled connection."""
+    connection = connection_pool.get_connection()
+    cursor = connection.cursor(dictionary=True)
+    try:
+        cursor.execute(SEARCHABLE_CONTENT_QUERY)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+        connection.close()
+
+def ensure_search_index():
+    """Build the search index from the database if nothing is persisted yet."""
+    if search_index.is_empty():
+        search_index.rebuild(load_searchable_content)
+
+def sync_search_index(content_id):
+    """Re-index one content item after it was created, updated or deleted."""
+    try:
+        connection = get_db_connection()
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute(SEARCHABLE_CONTENT_QUERY + " AND c.Content_ID = %s", (content_id,))
+        row = cursor.fetchone()
+        cursor.close()
+        connection.close()
+
+        if row:
+            compact = search_index.upsert(row.pop('content_id'), row.pop('content_type'), row)
+        else:
+            compact = search_index.remove(content_id)
+        if compact:
+            search_index.compact_in_background(load_searchable_content)
+    except Exception as e:
+        logger.warning(f"Failed to update search index for content {content_id}: {str(e)}")
+
+@app.route('/api/search', methods=['GET'])
+def search_content():
+    """Ranked full-text search over blog posts, notes, research papers, jobs and internships."""
+    try:
+        query = request.args.get('q', '').strip()
+        content_type = request.args.get('type')
+        limit = max(1, min(request.args.get('limit', 20, type=int), 50))
+        offset = max(0, min(request.args.get('offset', 0, type=int), 200))
+
+        if content_type and content_type not in SEARCH_TYPES:
+            return jsonify({
+                "success": False,
+                "message": f"Invalid type. Must be one of: {', '.join(SEARCH_TYPES)}"
+            }), 400
+        if not query:
+            return jsonify({"success": True, "results": [], "query": query, "limit": limit, "offset": offset})
+
+        ensure_search_index()
+
+        # The index still holds content that is no longer Active until it is synced, so rank
+        # from the top in growing windows until the requested page is full or the index runs out
+        wanted = offset + limit
+        window = wanted
+        details = {}
+        checked = set()
+        connection = get_db_connection()
+        cursor = connection.cursor(dictionary=True)
+        while True:
+            ranked = search_index.search(query, content_type=SEARCH_TYPES.get(content_type), limit=window)
+            content_ids = [item['content_id'] for item in ranked if item['content_id'] not in checked]
+            if content_ids:
+                placeholders = ', '.join(['%s'] * len(content_ids))
+                cursor.execute(f"""
+                    SELECT c.Content_ID as content_id, c.Title as title, c.Summary as summary,
+                           c.Featured_Image as featured_image, c.Tags as tags, c.Created_At as created_at,
+                           COALESCE(bp.Category, n.Category) as category,
+                           n.Note_ID as note_id, rp.Paper_ID as paper_id, j.Job_ID as job_id,
+                           i.Internship_ID as internship_id,
+                           COALESCE(j.Company_Name, i.Company_Name) as company_name,
+                           COALESCE(j.Location, i.Location) as location,
+                           up.Full_Name as author_name
+                    FROM Content c
+                    LEFT JOIN Blog_Posts bp ON c.Content_ID = bp.Content_ID
+                    LEFT JOIN Notes n ON c.Content_ID = n.Content_ID
+                    LEFT JOIN Research_Papers rp ON c.Content_ID = rp.Content_ID
+                    LEFT JOIN Jobs j ON c.Content_ID = j.Content_ID
+                    LEFT JOIN Internships i ON c.Content_ID = i.Content_ID
+                    LEFT JOIN User_Profile up ON c.User_ID = up.User_ID
+                    WHERE c.Content_ID IN ({placeholders}) AND c.Status = 'Active'
+                """, content_ids)
+                details.update({row['content_id']: row for row in cursor.fetchall()})
+                checked.update(content_ids)
+
+            active = [item for item in ranked if item['content_id'] in details]
+            if len(active) >= wanted or len(ranked) < window or window >= SEARCH_MAX_WINDOW:
+                break
+            window = min(window * 2, SEARCH_MAX_WINDOW)
+        cursor.close()
+        connection.close()
+
+        results = [{**details[item['content_id']], 'content_type': item['content_type'], 'score': item['score']}
+                   for item in active[offset:offset + limit]]
+
+        return jsonify({
+            "success": True,
+            "results": results,
+            "query": query,
+            "limit": limit,
+            "offset": offset
+        })
+    except Exception as e:
+        logger.error(f"Error searching content: {str(e)}")
+        return jsonify({"success": False, "message": str(e)}), 500
+
 # ===== PRACTICE AREAS ROUTES =====
 
 @app.route('/api/practice-areas', methods=['GET'])
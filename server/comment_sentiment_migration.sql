@@ -0,0 +1,42 @@
+-- Comment Sentiment Migration Script
+-- Stores the sentiment of every comment once and keeps running sums in
+-- Content_Metrics, so a new comment costs one classification instead of
+-- re-scoring every comment of the content item
+
+-- Sentiment of each analyzed comment
+CREATE TABLE IF NOT EXISTS Comment_Sentiment (
+    Comment_ID INT PRIMARY KEY,
+    Content_ID INT NOT NULL,
+    Positive DECIMAL(5,4) NOT NULL DEFAULT 0.0000,
+    Negative DECIMAL(5,4) NOT NULL DEFAULT 0.0000,
+    Neutral DECIMAL(5,4) NOT NULL DEFAULT 1.0000,
+    Analyzed_At DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (Comment_ID) REFERENCES Content_Comments(Comment_ID) ON DELETE CASCADE,
+    FOREIGN KEY (Content_ID) REFERENCES Content(Content_ID) ON DELETE CASCADE
+);
+
+CREATE INDEX idx_comment_sentiment_content ON Comment_Sentiment(Content_ID);
+
+-- Running sums over Comment_Sentiment; Sentiment_Comment_Count is the number of summed comments
+ALTER TABLE Content_Metrics
+ADD COLUMN Sentiment_Positive_Sum DECIMAL(12,4) NOT NULL DEFAULT 0.0000 COMMENT 'Sum of positive scores of analyzed comments',
+ADD COLUMN Sentiment_Negative_Sum DECIMAL(12,4) NOT NULL DEFAULT 0.0000 COMMENT 'Sum of negative scores of analyzed comments',
+ADD COLUMN Sentiment_Neutral_Sum DECIMAL(12,4) NOT NULL DEFAULT 0.0000 COMMENT 'Sum of neutral scores of analyzed comments';
+
+-- Start the counters from an empty Comment_Sentiment table; the next sentiment
+-- job for each content item (e.g. queued by /api/admin/sentiment/batch-update)
+-- classifies its existing comments once
+UPDATE Content_Metrics cm
+LEFT JOIN (
+    SELECT Content_ID,
+           COUNT(*) as analyzed,
+           SUM(Positive) as positive_sum,
+           SUM(Negative) as negative_sum,
+           SUM(Neutral) as neutral_sum
+    FROM Comment_Sentiment
+    GROUP BY Content_ID
+) cs ON cm.Content_ID = cs.Content_ID
+SET cm.Sentiment_Comment_Count = COALESCE(cs.analyzed, 0),
+    cm.Sentiment_Positive_Sum = COALESCE(cs.positive_sum, 0),
+    cm.Sentiment_Negative_Sum = COALESCE(cs.negative_sum, 0),
+    cm.Sentiment_Neutral_Sum = COALESCE(cs.neutral_sum, 0);
@@ -0,0 +1,50 @@
+-- Content Metrics Migration Script
+-- Supports listing blog posts from denormalized Content_Metrics counters
+-- and keyset (cursor) pagination on /api/blog-posts
+
+-- Index for "recent" listings and keyset pagination (Created_At, Content_ID)
+-- InnoDB appends the primary key (Content_ID) to every secondary index
+CREATE INDEX idx_content_type_status_created ON Content(Content_Type, Status, Created_At);
+
+-- Make sure every content item has a metrics row
+INSERT INTO Content_Metrics (Content_ID)
+SELECT c.Content_ID
+FROM Content c
+LEFT JOIN Content_Metrics cm ON c.Content_ID = cm.Content_ID
+WHERE cm.Content_ID IS NULL;
+
+-- Reconcile comment counters with the active comments
+UPDATE Content_Metrics cm
+LEFT JOIN (
+    SELECT Content_ID, COUNT(*) as active_comments
+    FROM Content_Comments
+    WHERE Status = 'Active'
+    GROUP BY Content_ID
+) cc ON cm.Content_ID = cc.Content_ID
+SET cm.Comments_Count = COALESCE(cc.active_comments, 0)
+WHERE cm.Comments_Count <> COALESCE(cc.active_comments, 0);
+
+-- Merge duplicate metrics rows (one per content item) before adding the unique key
+-- Views and shares are summed into the oldest row; likes are recounted
+UPDATE Content_Metrics keep_row
+JOIN (
+    SELECT Content_ID, MIN(Metric_ID) as keep_id, SUM(Views) as total_views, SUM(Shares) as total_shares
+    FROM Content_Metrics
+    GROUP BY Content_ID
+    HAVING COUNT(*) > 1
+) dup ON keep_row.Metric_ID = dup.keep_id
+SET keep_row.Views = dup.total_views,
+    keep_row.Shares = dup.total_shares,
+    keep_row.Likes = (SELECT COUNT(*) FROM Content_Likes cl WHERE cl.Content_ID = dup.Content_ID);
+
+DELETE cm FROM Content_Metrics cm
+JOIN (
+    SELECT Content_ID, MIN(Metric_ID) as keep_id
+    FROM Content_Metrics
+    GROUP BY Content_ID
+    HAVING COUNT(*) > 1
+) dup ON cm.Content_ID = dup.Content_ID AND cm.Metric_ID <> dup.keep_id;
+
+-- One metrics row per content item, required by the batched view counter
+-- (INSERT ... ON DUPLICATE KEY UPDATE Views = Views + n)
+ALTER TABLE Content_Metrics ADD UNIQUE KEY unique_content_metrics (Content_ID);
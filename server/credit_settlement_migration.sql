@@ -0,0 +1,16 @@
+-- Credit Settlement Migration Script
+-- Event log for the batched credit settlement mode (CREDIT_SETTLEMENT_MODE=batched)
+-- The like route appends one row per like/unlike; credit_settler.py nets them
+-- per (creator, content) into Credit_Transactions and marks them settled
+
+CREATE TABLE IF NOT EXISTS Credit_Like_Events (
+    Event_ID BIGINT AUTO_INCREMENT PRIMARY KEY,
+    Content_ID INT NOT NULL,
+    User_ID INT NOT NULL COMMENT 'User who liked or unliked the content',
+    Delta TINYINT NOT NULL COMMENT '1 for a like, -1 for an unlike',
+    Created_At DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    Settled_At DATETIME(6) NULL,
+    Transaction_ID INT NULL COMMENT 'Credit_Transactions row the event was settled into; NULL if it earned no credit',
+    INDEX idx_credit_like_events_unsettled (Settled_At, Event_ID),
+    INDEX idx_credit_like_events_transaction (Transaction_ID)
+);
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Credit Settler
+
+With CREDIT_SETTLEMENT_MODE=batched the like route no longer writes the
+credit ledger; it appends a row to Credit_Like_Events in the same transaction
+as the like. This worker settles those events every window: the net likes per
+(creator, content) become one Credit_Transactions row and each creator's
+balance is updated once (see CreditSystem.settle_like_events). Every settled
+event points at its ledger row, so balances stay reconcilable with the likes.
+
+Keep it running while batched mode is on, and let it drain the log after
+switching back to immediate mode. Run it next to the web server:
+
+Usage:
+    python credit_settler.py            # settle every window until stopped
+    python credit_settler.py --once     # settle pending events and exit
+    python credit_settler.py --migrate  # apply credit_settlement_migration.sql first
+"""
+
+import os
+import sys
+import time
+import signal
+import logging
+import mysql.connector
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+from credit_system import CreditSystem
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+SETTLEMENT_INTERVAL = float(os.getenv('CREDIT_SETTLEMENT_INTERVAL', 30))
+BATCH_SIZE = int(os.getenv('CREDIT_SETTLEMENT_BATCH_SIZE', 10000))
+
+_stopping = False
+
+
+def _request_stop(signum, frame):
+    global _stopping
+    logger.info("Credit settler stopping after the current window")
+    _stopping = True
+
+
+def get_connection():
+    """Connect using the same environment variables as the main app"""
+    return mysql.connector.connect(
+        host=os.getenv('DB_HOST', 'localhost'),
+        port=int(os.getenv('DB_PORT', 3306)),
+        user=os.getenv('DB_USER', 'root'),
+        password=os.getenv('DB_PASSWORD', ''),
+        database=os.getenv('DB_NAME', 'lawfort')
+    )
+
+
+def run_migration(connection):
+    """Apply credit_settlement_migration.sql, skipping objects that already exist"""
+    cursor = connection.cursor()
+    with open('credit_settlement_migration.sql', 'r', encoding='utf-8') as file:
+        sql_content = file.read()
+
+    # Drop comment lines, then split into statements
+    sql_content = '\n'.join(line for line in sql_content.splitlines() if not line.strip().startswith('--'))
+    statements = [stmt.strip() for stmt in sql_content.split(';') if stmt.strip()]
+
+    for i, statement in enumerate(statements):
+        try:
+            cursor.execute(statement)
+            print(f"Executed statement {i+1}/{len(statements)}")
+        except mysql.connector.Error as e:
+            if "duplicate key name" in str(e).lower() or "already exists" in str(e).lower():
+                print(f"Statement {i+1} skipped (already exists): {e}")
+            else:
+                raise
+
+    connection.commit()
+    cursor.close()
+
+
+def run_settler(once: bool = False):
+    """
+    Settle like events until stopped
+
+    Args:
+        once: Exit as soon as no event is pending
+    """
+    credit_system = CreditSystem(None, get_connection=get_connection)
+    connection = None
+
+    while not _stopping:
+        settled = 0
+        try:
+            if connection is None or not connection.is_connected():
+                connection = get_connection()
+            settled = credit_system.settle_like_events(connection, limit=BATCH_SIZE)['events']
+        except mysql.connector.Error as e:
+            logger.error(f"Database error in credit settler: {str(e)}")
+            try:
+                connection.close()
+            except Exception:
+                pass
+            connection = None
+
+        if settled < BATCH_SIZE:
+            if once:
+                break
+            time.sleep(SETTLEMENT_INTERVAL)
+
+    if connection is not None:
+        connection.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    signal.signal(signal.SIGTERM, _request_stop)
+    signal.signal(signal.SIGINT, _request_stop)
+
+    if '--migrate' in sys.argv:
+        migration_connection = get_connection()
+        try:
+            run_migration(migration_connection)
+        finally:
+            migration_connection.close()
+
+    logger.info("Credit settler started")
+    run_settler(once='--once' in sys.argv)
@@ -0,0 +1,29 @@
+-- Credit Statistics Migration Script
+-- Running totals on User_Credits, maintained by CreditSystem whenever a
+-- Credit_Transactions row is written, so /api/credits/statistics reads one row
+-- run_credit_stats_verification.py recomputes them from the ledger and reports drift
+
+ALTER TABLE User_Credits
+    ADD COLUMN Total_Earned DECIMAL(12,2) NOT NULL DEFAULT 0.00 COMMENT 'Sum of positive transaction amounts',
+    ADD COLUMN Total_Spent DECIMAL(12,2) NOT NULL DEFAULT 0.00 COMMENT 'Sum of negative transaction amounts, as a positive number',
+    ADD COLUMN Likes_Received INT NOT NULL DEFAULT 0 COMMENT 'Likes in LIKE_RECEIVED transactions',
+    ADD COLUMN Likes_Removed INT NOT NULL DEFAULT 0 COMMENT 'Likes in LIKE_REMOVED transactions',
+    ADD COLUMN Transaction_Count INT NOT NULL DEFAULT 0;
+
+-- Backfill from the ledger; likes are counted from the amount (CreditSystem.CREDIT_PER_LIKE = 10 each)
+UPDATE User_Credits uc
+JOIN (
+    SELECT User_ID,
+           SUM(CASE WHEN Amount > 0 THEN Amount ELSE 0 END) as total_earned,
+           SUM(CASE WHEN Amount < 0 THEN ABS(Amount) ELSE 0 END) as total_spent,
+           SUM(CASE WHEN Transaction_Type = 'LIKE_RECEIVED' THEN ROUND(ABS(Amount) / 10) ELSE 0 END) as likes_received,
+           SUM(CASE WHEN Transaction_Type = 'LIKE_REMOVED' THEN ROUND(ABS(Amount) / 10) ELSE 0 END) as likes_removed,
+           COUNT(*) as transaction_count
+    FROM Credit_Transactions
+    GROUP BY User_ID
+) ct ON uc.User_ID = ct.User_ID
+SET uc.Total_Earned = ct.total_earned,
+    uc.Total_Spent = ct.total_spent,
+    uc.Likes_Received = ct.likes_received,
+    uc.Likes_Removed = ct.likes_removed,
+    uc.Transaction_Count = ct.transaction_count;
@@ -10,6 +10,9 @@ Features:
 - Track all credit transactions
 - Provide credit balance and transaction history
 - Support for future monetization features (ads, engagement time, etc.)
+- Optional batched settlement of like credits (CREDIT_SETTLEMENT_MODE=batched):
+  the like route only appends to Credit_Like_Events and credit_settler.py
+  settles the net likes per creator and content once per window
 """
 
 import mysql.connector
@@ -20,6 +23,15 @@ import logging
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Creator and role of an active content item (also read by the like route and passed in as content_info)
+CONTENT_CREATOR_QUERY = """
+    SELECT c.User_ID as creator_id, u.Role_ID, r.Role_Name, c.Title
+    FROM Content c
+    JOIN Users u ON c.User_ID = u.User_ID
+    JOIN Roles r ON u.Role_ID = r.Role_ID
+    WHERE c.Content_ID = %s AND c.Status = 'Active'
+"""
+
 class CreditSystem:
     """
     Handles all credit-related operations for the LawFort platform
@@ -37,44 +49,63 @@ class CreditSystem:
         'MANUAL_ADJUSTMENT': 'Manual credit adjustment by admin'
     }
     
-    def __init__(self, connection_pool):
+    # User_Credits columns maintained on every ledger write (see credit_stats_migration.sql)
+    CREDIT_TOTAL_COLUMNS = ['Credit_Balance', 'Total_Earned', 'Total_Spent',
+                            'Likes_Received', 'Likes_Removed', 'Transaction_Count']
+    
+    # Settlement modes
+    SETTLEMENT_IMMEDIATE = 'immediate'
+    SETTLEMENT_BATCHED = 'batched'
+    
+    def __init__(self, connection_pool, get_connection=None, settlement_mode: str = SETTLEMENT_IMMEDIATE):
         """
         Initialize credit system with database connection pool
         
         Args:
             connection_pool: MySQL connection pool instance
+            get_connection: Optional callable returning a connection (e.g. the
+                request-scoped one); defaults to checking out from the pool
+            settlement_mode: 'immediate' to write the ledger on every like,
+                'batched' to record like events for credit_settler.py
         """
         self.connection_pool = connection_pool
+        self._get_connection = get_connection or connection_pool.get_connection
+        if settlement_mode not in (self.SETTLEMENT_IMMEDIATE, self.SETTLEMENT_BATCHED):
+            raise ValueError(f"Unknown credit settlement mode: {settlement_mode}")
+        self.settlement_mode = settlement_mode
+    
+    @property
+    def batched_settlement(self) -> bool:
+        return self.settlement_mode == self.SETTLEMENT_BATCHED
     
     def get_db_connection(self):
         """Get database connection from pool"""
-        return self.connection_pool.get_connection()
+        return self._get_connection()
     
-    def award_like_credit(self, content_id: int, liker_user_id: int) -> Dict:
+    def award_like_credit(self, content_id: int, liker_user_id: int, connection=None,
+                          content_info: Optional[Dict] = None) -> Dict:
         """
         Award credit to content creator when their content receives a like
         
         Args:
             content_id: ID of the content that was liked
             liker_user_id: ID of the user who liked the content
+            connection: Caller's connection; when given, the caller commits or rolls back
+            content_info: Creator row (creator_id, Role_ID, Role_Name, Title) if the caller already read it
             
         Returns:
             Dict with success status, message, and transaction details
         """
+        owns_connection = connection is None
         try:
-            connection = self.get_db_connection()
+            if owns_connection:
+                connection = self.get_db_connection()
             cursor = connection.cursor(dictionary=True)
             
             # Get content creator and their role
-            cursor.execute("""
-                SELECT c.User_ID as creator_id, u.Role_ID, r.Role_Name, c.Title
-                FROM Content c
-                JOIN Users u ON c.User_ID = u.User_ID
-                JOIN Roles r ON u.Role_ID = r.Role_ID
-                WHERE c.Content_ID = %s AND c.Status = 'Active'
-            """, (content_id,))
-            
-            content_info = cursor.fetchone()
+            if content_info is None:
+                cursor.execute(CONTENT_CREATOR_QUERY, (content_id,))
+                content_info = cursor.fetchone()
             
             if not content_info:
                 return {
@@ -114,7 +145,8 @@ class CreditSystem:
             )
             
             if transaction_result['success']:
-                connection.commit()
+                if owns_connection:
+                    connection.commit()
                 logger.info(f"Awarded {credit_amount} credits to user {creator_id} for like on content {content_id}")
                 
                 return {
@@ -125,11 +157,12 @@ class CreditSystem:
                     'new_balance': transaction_result['new_balance']
                 }
             else:
-                connection.rollback()
+                if owns_connection:
+                    connection.rollback()
                 return transaction_result
                 
         except Exception as e:
-            if 'connection' in locals():
+            if owns_connection and connection is not None:
                 connection.rollback()
             logger.error(f"Error awarding like credit: {str(e)}")
             return {
@@ -139,34 +172,33 @@ class CreditSystem:
         finally:
             if 'cursor' in locals():
                 cursor.close()
-            if 'connection' in locals():
+            if owns_connection and connection is not None:
                 connection.close()
     
-    def deduct_like_credit(self, content_id: int, unliker_user_id: int) -> Dict:
+    def deduct_like_credit(self, content_id: int, unliker_user_id: int, connection=None,
+                           content_info: Optional[Dict] = None) -> Dict:
         """
         Deduct credit from content creator when a like is removed
         
         Args:
             content_id: ID of the content that was unliked
             unliker_user_id: ID of the user who removed the like
+            connection: Caller's connection; when given, the caller commits or rolls back
+            content_info: Creator row (creator_id, Role_ID, Role_Name, Title) if the caller already read it
             
         Returns:
             Dict with success status, message, and transaction details
         """
+        owns_connection = connection is None
         try:
-            connection = self.get_db_connection()
+            if owns_connection:
+                connection = self.get_db_connection()
             cursor = connection.cursor(dictionary=True)
             
             # Get content creator and their role
-            cursor.execute("""
-                SELECT c.User_ID as creator_id, u.Role_ID, r.Role_Name, c.Title
-                FROM Content c
-                JOIN Users u ON c.User_ID = u.User_ID
-                JOIN Roles r ON u.Role_ID = r.Role_ID
-                WHERE c.Content_ID = %s AND c.Status = 'Active'
-            """, (content_id,))
-            
-            content_info = cursor.fetchone()
+            if content_info is None:
+                cursor.execute(CONTENT_CREATOR_QUERY, (content_id,))
+                content_info = cursor.fetchone()
             
             if not content_info:
                 return {
@@ -206,7 +238,8 @@ class CreditSystem:
             )
             
             if transaction_result['success']:
-                connection.commit()
+                if owns_connection:
+                    connection.commit()
                 logger.info(f"Deducted {abs(credit_amount)} credits from user {creator_id} for unlike on content {content_id}")
                 
                 return {
@@ -217,11 +250,12 @@ class CreditSystem:
                     'new_balance': transaction_result['new_balance']
                 }
             else:
-                connection.rollback()
+                if owns_connection:
+                    connection.rollback()
                 return transaction_result
                 
         except Exception as e:
-            if 'connection' in locals():
+            if owns_connection and connection is not None:
                 connection.rollback()
             logger.error(f"Error deducting like credit: {str(e)}")
             return {
@@ -231,9 +265,185 @@ class CreditSystem:
         finally:
             if 'cursor' in locals():
                 cursor.close()
-            if 'connection' in locals():
+            if owns_connection and connection is not None:
                 connection.close()
     
+    def record_like_event(self, content_id: int, user_id: int, delta: int, connection) -> Dict:
+        """
+        Record a like (delta 1) or unlike (delta -1) for batched settlement
+
+        Runs in the caller's transaction, so the event commits together with
+        the like itself; the caller commits.
+
+        Args:
+            content_id: ID of the content that was liked or unliked
+            user_id: ID of the user who liked or unliked
+            delta: 1 for a like, -1 for an unlike
+            connection: Caller's connection
+
+        Returns:
+            Dict with success status and message
+        """
+        cursor = connection.cursor()
+        try:
+            cursor.execute("""
+                INSERT INTO Credit_Like_Events (Content_ID, User_ID, Delta)
+                VALUES (%s, %s, %s)
+            """, (content_id, user_id, delta))
+            return {
+                'success': True,
+                'message': 'Credit will be settled in the next settlement window',
+                'credit_pending': True
+            }
+        finally:
+            cursor.close()
+
+    def settle_like_events(self, connection, limit: int = 10000) -> Dict:
+        """
+        Settle recorded like events into the ledger
+
+        Events are netted per (creator, content) into one Credit_Transactions
+        row, and every creator's balance is updated once. Each event keeps the
+        ID of the transaction it was settled into, so every ledger row can be
+        reconciled with its events. Everything commits in one transaction;
+        a MySQL named lock keeps concurrent settlers from overlapping.
+
+        Args:
+            connection: Database connection (not shared with other work)
+            limit: Maximum number of events to settle in this window
+
+        Returns:
+            Dict with the number of settled events, ledger rows and credited users
+        """
+        cursor = connection.cursor(dictionary=True)
+        try:
+            cursor.execute("SELECT GET_LOCK('credit_like_settlement', 0) as acquired")
+            if not cursor.fetchone()['acquired']:
+                return {'events': 0, 'transactions': 0, 'users': 0, 'skipped': True}
+
+            try:
+                # Role and self-like rules are the ones award_like_credit applies
+                cursor.execute("""
+                    SELECT e.Event_ID, e.Content_ID, e.User_ID, e.Delta,
+                           c.User_ID as creator_id, u.Role_ID, c.Title
+                    FROM Credit_Like_Events e
+                    LEFT JOIN Content c ON e.Content_ID = c.Content_ID
+                    LEFT JOIN Users u ON c.User_ID = u.User_ID
+                    WHERE e.Settled_At IS NULL
+                    ORDER BY e.Event_ID
+                    LIMIT %s
+                """, (limit,))
+                events = cursor.fetchall()
+                if not events:
+                    connection.commit()
+                    return {'events': 0, 'transactions': 0, 'users': 0, 'skipped': False}
+
+                groups = {}
+                uncredited = []
+                for event in events:
+                    if event['Role_ID'] != 2 or event['creator_id'] == event['User_ID']:
+                        uncredited.append(event['Event_ID'])
+                        continue
+                    key = (event['creator_id'], event['Content_ID'])
+                    group = groups.setdefault(key, {'net': 0, 'title': event['Title'], 'event_ids': []})
+                    group['net'] += event['Delta']
+                    group['event_ids'].append(event['Event_ID'])
+
+                balance_changes = {}
+                transactions = 0
+                for (creator_id, content_id), group in sorted(groups.items()):
+                    if group['net'] == 0:
+                        # Likes and unlikes cancelled out within the window
+                        uncredited.extend(group['event_ids'])
+                        continue
+
+                    amount = group['net'] * self.CREDIT_PER_LIKE
+                    if group['net'] > 0:
+                        transaction_type = 'LIKE_RECEIVED'
+                        description = f'Credit earned from {group["net"]} like(s) on content: {group["title"]}'
+                    else:
+                        transaction_type = 'LIKE_REMOVED'
+                        description = f'Credit deducted from {-group["net"]} like removal(s) on content: {group["title"]}'
+
+                    cursor.execute("""
+                        INSERT INTO Credit_Transactions
+                        (User_ID, Amount, Transaction_Type, Description, Related_Content_ID, Related_User_ID)
+                        VALUES (%s, %s, %s, %s, %s, NULL)
+                    """, (creator_id, amount, transaction_type, description, content_id))
+                    transaction_id = cursor.lastrowid
+                    transactions += 1
+
+                    self._mark_events_settled(cursor, group['event_ids'], transaction_id)
+                    totals = self._credit_totals(amount, transaction_type)
+                    if creator_id in balance_changes:
+                        totals = [a + b for a, b in zip(balance_changes[creator_id], totals)]
+                    balance_changes[creator_id] = totals
+
+                self._mark_events_settled(cursor, uncredited, None)
+
+                self._apply_credit_totals(cursor, balance_changes)
+
+                connection.commit()
+                logger.info(f"Settled {len(events)} like event(s) into {transactions} credit transaction(s) "
+                            f"for {len(balance_changes)} user(s)")
+                return {'events': len(events), 'transactions': transactions,
+                        'users': len(balance_changes), 'skipped': False}
+            except Exception:
+                connection.rollback()
+                raise
+            finally:
+                cursor.execute("SELECT RELEASE_LOCK('credit_like_settlement')")
+                cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def _credit_totals(self, amount: float, transaction_type: str) -> List:
+        """Changes of the User_Credits running totals (CREDIT_TOTAL_COLUMNS order) for one transaction"""
+        # A settled transaction covers the net likes of a whole window, so count likes from the amount
+        likes = round(abs(amount) / self.CREDIT_PER_LIKE)
+        return [
+            amount,
+            amount if amount > 0 else 0,
+            -amount if amount < 0 else 0,
+            likes if transaction_type == 'LIKE_RECEIVED' else 0,
+            likes if transaction_type == 'LIKE_REMOVED' else 0,
+            1
+        ]
+
+    def _apply_credit_totals(self, cursor, changes: Dict[int, List]):
+        """
+        Add balance and running total changes to User_Credits in one statement
+
+        Args:
+            cursor: Cursor of the transaction that wrote the ledger rows
+            changes: User ID -> changes as returned by _credit_totals (summed per user)
+        """
+        if not changes:
+            return
+        columns = ', '.join(self.CREDIT_TOTAL_COLUMNS)
+        increments = ', '.join(f"{column} = {column} + VALUES({column})" for column in self.CREDIT_TOTAL_COLUMNS)
+        row = '(' + ', '.join(['%s'] * (len(self.CREDIT_TOTAL_COLUMNS) + 1)) + ')'
+        # Sorted so concurrent writers lock rows in the same order
+        params = []
+        for user_id, totals in sorted(changes.items()):
+            params.append(user_id)
+            params.extend(totals)
+        cursor.execute(f"""
+            INSERT INTO User_Credits (User_ID, {columns})
+            VALUES {', '.join([row] * len(changes))}
+            ON DUPLICATE KEY UPDATE {increments}, Last_Updated = NOW()
+        """, params)
+
+    def _mark_events_settled(self, cursor, event_ids: List[int], transaction_id: Optional[int]):
+        if not event_ids:
+            return
+        placeholders = ', '.join(['%s'] * len(event_ids))
+        cursor.execute(f"""
+            UPDATE Credit_Like_Events
+            SET Settled_At = NOW(6), Transaction_ID = %s
+            WHERE Event_ID IN ({placeholders})
+        """, [transaction_id] + list(event_ids))
+
     def get_user_credit_balance(self, user_id: int) -> Dict:
         """
         Get current credit balance for a user
@@ -282,58 +492,102 @@ class CreditSystem:
             if 'connection' in locals():
                 connection.close()
 
-    def get_user_transaction_history(self, user_id: int, limit: int = 50, offset: int = 0) -> Dict:
+    def get_user_transaction_history(self, user_id: int, limit: int = 50, offset: int = 0,
+                                     before: Optional[int] = None, include_total: bool = True) -> Dict:
         """
-        Get transaction history for a user
+        Get transaction history for a user, newest first
+
+        Pages either by offset or, with `before`, by keyset: the page starts
+        after the given transaction in (Created_At, Transaction_ID) order, which
+        idx_credit_transactions_user_keyset serves in constant time however
+        long the history is.
 
         Args:
             user_id: ID of the user
             limit: Maximum number of transactions to return
-            offset: Number of transactions to skip
+            offset: Number of transactions to skip (ignored with before)
+            before: Transaction_ID of the last row of the previous page
+            include_total: Also return the user's total transaction count
 
         Returns:
-            Dict with success status and transaction list
+            Dict with success status, transaction list and the next cursor
         """
         try:
             connection = self.get_db_connection()
             cursor = connection.cursor(dictionary=True)
 
-            cursor.execute("""
-                SELECT
-                    ct.Transaction_ID,
-                    ct.Amount,
-                    ct.Transaction_Type,
-                    ct.Description,
-                    ct.Created_At,
-                    ct.Related_Content_ID,
-                    ct.Related_User_ID,
-                    c.Title as content_title,
-                    up.Full_Name as related_user_name
-                FROM Credit_Transactions ct
-                LEFT JOIN Content c ON ct.Related_Content_ID = c.Content_ID
-                LEFT JOIN User_Profile up ON ct.Related_User_ID = up.User_ID
-                WHERE ct.User_ID = %s
-                ORDER BY ct.Created_At DESC
-                LIMIT %s OFFSET %s
-            """, (user_id, limit, offset))
+            query = """
+                SELECT Transaction_ID, Amount, Transaction_Type, Description, Created_At,
+                       Related_Content_ID, Related_User_ID
+                FROM Credit_Transactions
+                WHERE User_ID = %s
+            """
+            params = [user_id]
+
+            if before is not None:
+                cursor.execute("""
+                    SELECT Created_At FROM Credit_Transactions
+                    WHERE Transaction_ID = %s AND User_ID = %s
+                """, (before, user_id))
+                cursor_row = cursor.fetchone()
+                if not cursor_row:
+                    return {
+                        'success': False,
+                        'invalid_cursor': True,
+                        'message': 'Invalid cursor: transaction not found'
+                    }
+                # Seek past the previous page instead of scanning OFFSET rows
+                query += " AND (Created_At < %s OR (Created_At = %s AND Transaction_ID < %s))"
+                params.extend([cursor_row['Created_At'], cursor_row['Created_At'], before])
+                query += " ORDER BY Created_At DESC, Transaction_ID DESC LIMIT %s"
+                params.append(limit)
+            else:
+                query += " ORDER BY Created_At DESC, Transaction_ID DESC LIMIT %s OFFSET %s"
+                params.extend([limit, offset])
 
+            cursor.execute(query, params)
             transactions = cursor.fetchall()
 
-            # Get total count
-            cursor.execute("""
-                SELECT COUNT(*) as total_count
-                FROM Credit_Transactions
-                WHERE User_ID = %s
-            """, (user_id,))
+            # Titles and names for the page rows only, one query each
+            content_ids = sorted({row['Related_Content_ID'] for row in transactions if row['Related_Content_ID']})
+            user_ids = sorted({row['Related_User_ID'] for row in transactions if row['Related_User_ID']})
+            titles = {}
+            names = {}
+            if content_ids:
+                cursor.execute(f"""
+                    SELECT Content_ID, Title FROM Content
+                    WHERE Content_ID IN ({', '.join(['%s'] * len(content_ids))})
+                """, content_ids)
+                titles = {row['Content_ID']: row['Title'] for row in cursor.fetchall()}
+            if user_ids:
+                cursor.execute(f"""
+                    SELECT User_ID, Full_Name FROM User_Profile
+                    WHERE User_ID IN ({', '.join(['%s'] * len(user_ids))})
+                """, user_ids)
+                names = {row['User_ID']: row['Full_Name'] for row in cursor.fetchall()}
+
+            for row in transactions:
+                row['content_title'] = titles.get(row['Related_Content_ID'])
+                row['related_user_name'] = names.get(row['Related_User_ID'])
+
+            # Kept on User_Credits by the ledger write path (see credit_stats_migration.sql)
+            total_count = None
+            if include_total:
+                cursor.execute("""
+                    SELECT Transaction_Count FROM User_Credits WHERE User_ID = %s
+                """, (user_id,))
+                count_row = cursor.fetchone()
+                total_count = count_row['Transaction_Count'] if count_row else 0
 
-            total_count = cursor.fetchone()['total_count']
+            next_cursor = transactions[-1]['Transaction_ID'] if len(transactions) == limit else None
 
             return {
                 'success': True,
                 'transactions': transactions,
                 'total_count': total_count,
                 'limit': limit,
-                'offset': offset
+                'offset': offset,
+                'next_cursor': next_cursor
             }
 
         except Exception as e:
@@ -354,6 +608,10 @@ class CreditSystem:
         """
         Internal method to add a credit transaction and update user balance
 
+        The balance is changed with a single upsert (Credit_Balance = Credit_Balance + amount),
+        which locks the user's credit row until the caller's transaction ends, so concurrent
+        likes on the same editor's content cannot overwrite each other's update.
+
         Args:
             user_id: ID of the user receiving/losing credits
             amount: Amount of credits (positive for credit, negative for debit)
@@ -373,36 +631,8 @@ class CreditSystem:
                 cursor = connection.cursor(dictionary=True)
                 close_connection = True
 
-            # Get current balance or create new credit record
-            cursor.execute("""
-                SELECT Credit_Balance FROM User_Credits WHERE User_ID = %s
-            """, (user_id,))
-
-            current_balance_result = cursor.fetchone()
-
-            if current_balance_result:
-                current_balance = float(current_balance_result['Credit_Balance'])
-            else:
-                current_balance = 0.0
-                # Create new credit record
-                cursor.execute("""
-                    INSERT INTO User_Credits (User_ID, Credit_Balance)
-                    VALUES (%s, 0.0)
-                """, (user_id,))
-
-            # Calculate new balance
-            new_balance = current_balance + amount
-
-            # Prevent negative balance (optional - you might want to allow debt)
-            if new_balance < 0:
-                logger.warning(f"Transaction would result in negative balance for user {user_id}. Current: {current_balance}, Amount: {amount}")
-                # You can choose to either:
-                # 1. Allow negative balance (comment out the return below)
-                # 2. Reject the transaction (uncomment the return below)
-                # return {
-                #     'success': False,
-                #     'message': 'Insufficient credit balance'
-                # }
+            # Create the credit record or apply the amount and running totals to it atomically
+            self._apply_credit_totals(cursor, {user_id: self._credit_totals(amount, transaction_type)})
 
             # Add transaction record
             cursor.execute("""
@@ -413,12 +643,16 @@ class CreditSystem:
 
             transaction_id = cursor.lastrowid
 
-            # Update user balance
+            # The row is locked by the upsert above, so this is the balance this transaction produced
             cursor.execute("""
-                UPDATE User_Credits
-                SET Credit_Balance = %s, Last_Updated = NOW()
-                WHERE User_ID = %s
-            """, (new_balance, user_id))
+                SELECT Credit_Balance FROM User_Credits WHERE User_ID = %s
+            """, (user_id,))
+            new_balance = float(cursor.fetchone()['Credit_Balance'])
+            current_balance = new_balance - amount
+
+            # Negative balances are allowed (e.g. a like removed after the credit was spent)
+            if new_balance < 0:
+                logger.warning(f"Transaction resulted in negative balance for user {user_id}. Previous: {current_balance}, Amount: {amount}")
 
             if close_connection:
                 connection.commit()
@@ -450,6 +684,9 @@ class CreditSystem:
         """
         Get credit statistics for a user
 
+        Reads the running totals kept on User_Credits; see
+        run_credit_stats_verification.py for checking them against the ledger.
+
         Args:
             user_id: ID of the user
 
@@ -460,31 +697,24 @@ class CreditSystem:
             connection = self.get_db_connection()
             cursor = connection.cursor(dictionary=True)
 
-            # Get current balance
-            balance_result = self.get_user_credit_balance(user_id)
-
-            # Get total earned and spent
             cursor.execute("""
-                SELECT
-                    SUM(CASE WHEN Amount > 0 THEN Amount ELSE 0 END) as total_earned,
-                    SUM(CASE WHEN Amount < 0 THEN ABS(Amount) ELSE 0 END) as total_spent,
-                    COUNT(*) as total_transactions,
-                    COUNT(CASE WHEN Transaction_Type = 'LIKE_RECEIVED' THEN 1 END) as likes_received,
-                    COUNT(CASE WHEN Transaction_Type = 'LIKE_REMOVED' THEN 1 END) as likes_removed
-                FROM Credit_Transactions
+                SELECT Credit_Balance, Total_Earned, Total_Spent, Transaction_Count,
+                       Likes_Received, Likes_Removed
+                FROM User_Credits
                 WHERE User_ID = %s
             """, (user_id,))
 
-            stats = cursor.fetchone()
+            # User doesn't have a credit record yet: everything is 0
+            stats = cursor.fetchone() or {}
 
             return {
                 'success': True,
-                'current_balance': balance_result.get('balance', 0.0),
-                'total_earned': float(stats['total_earned'] or 0),
-                'total_spent': float(stats['total_spent'] or 0),
-                'total_transactions': stats['total_transactions'],
-                'likes_received': stats['likes_received'],
-                'likes_removed': stats['likes_removed']
+                'current_balance': float(stats.get('Credit_Balance') or 0),
+                'total_earned': float(stats.get('Total_Earned') or 0),
+                'total_spent': float(stats.get('Total_Spent') or 0),
+                'total_transactions': stats.get('Transaction_Count') or 0,
+                'likes_received': stats.get('Likes_Received') or 0,
+                'likes_removed': stats.get('Likes_Removed') or 0
             }
 
         except Exception as e:
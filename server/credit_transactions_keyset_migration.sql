@@ -0,0 +1,5 @@
+-- Credit Transactions Keyset Migration Script
+-- Supports keyset (cursor) pagination on /api/credits/transactions?before=<id>
+-- Seeks and orders by (Created_At, Transaction_ID) within one user's ledger
+
+CREATE INDEX idx_credit_transactions_user_keyset ON Credit_Transactions(User_ID, Created_At, Transaction_ID);
@@ -0,0 +1,231 @@
+"""
+Paragraph Result Cache for the Grammar Checker
+
+The editor sends the whole document on every grammar pass, but between two
+passes usually only one paragraph changed. GrammarChecker splits the text
+into paragraphs and looks up each paragraph's issues here by content hash;
+only paragraphs that miss are sent to LanguageTool.
+
+Issues are stored with paragraph-relative offsets in a bounded in-process
+LRU. When GRAMMAR_CACHE_PATH is set, results are also kept in a local SQLite
+file so all gunicorn workers (and restarts) share them.
+"""
+
+import os
+import re
+import time
+import json
+import sqlite3
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Paragraphs are separated by blank lines
+_SEPARATOR_PATTERN = re.compile(r'\n[ \t\r]*\n')
+# Whitespace after a sentence end, before the next sentence starts
+_SENTENCE_END_PATTERN = re.compile(r'(?<=[.!?])\s+(?=["\'(\[]?[A-Z0-9])')
+
+
+def split_paragraphs(text: str) -> List[Tuple[int, str]]:
+    """
+    Split text into paragraphs
+
+    Args:
+        text: Document text
+
+    Returns:
+        List of (offset in text, paragraph text) without surrounding whitespace
+    """
+    paragraphs = []
+    start = 0
+    bounds = [(separator.start(), separator.end()) for separator in _SEPARATOR_PATTERN.finditer(text)]
+    bounds.append((len(text), len(text)))
+
+    for end, next_start in bounds:
+        chunk = text[start:end]
+        stripped = chunk.strip()
+        if stripped:
+            paragraphs.append((start + len(chunk) - len(chunk.lstrip()), stripped))
+        start = next_start
+
+    return paragraphs
+
+
+def split_segments(text: str, max_chars: int = 600) -> List[Tuple[int, str]]:
+    """
+    Split text into paragraphs, breaking long paragraphs into groups of sentences
+
+    Used for streaming, so a single long paragraph (e.g. an abstract) still
+    produces results before the whole of it is checked.
+
+    Args:
+        text: Document text
+        max_chars: Paragraphs longer than this are split at sentence ends
+
+    Returns:
+        List of (offset in text, segment text)
+    """
+    segments = []
+    for start, paragraph in split_paragraphs(text):
+        if len(paragraph) <= max_chars:
+            segments.append((start, paragraph))
+            continue
+
+        segment_start = 0
+        for boundary in _SENTENCE_END_PATTERN.finditer(paragraph):
+            if boundary.start() - segment_start >= max_chars:
+                segments.append((start + segment_start, paragraph[segment_start:boundary.start()]))
+                segment_start = boundary.end()
+        segments.append((start + segment_start, paragraph[segment_start:]))
+
+    return segments
+
+
+def paragraph_key(language: str, paragraph: str) -> str:
+    """Cache key of a paragraph's check result"""
+    return hashlib.sha256(f"{language}\0{paragraph}".encode('utf-8')).hexdigest()
+
+
+class ParagraphCache:
+    """
+    LRU of serialized grammar issues per paragraph hash, optionally backed by SQLite
+    """
+
+    def __init__(self, max_entries: int = 5000, disk_path: Optional[str] = None,
+                 max_disk_entries: int = 100000):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Paragraphs kept in memory
+            disk_path: SQLite file shared between processes (disabled if empty)
+            max_disk_entries: Paragraphs kept on disk before the oldest are pruned
+        """
+        self.max_entries = max_entries
+        self.disk_path = disk_path or None
+        self.max_disk_entries = max_disk_entries
+
+        self._entries: "OrderedDict[str, List[Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._disk_writes = 0
+
+        if self.disk_path:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.disk_path)), exist_ok=True)
+                self._disk().execute("""
+                    CREATE TABLE IF NOT EXISTS paragraph_issues (
+                        key TEXT PRIMARY KEY,
+                        issues TEXT NOT NULL,
+                        used_at REAL NOT NULL
+                    )
+                """)
+                self._disk().commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Grammar disk cache disabled ({self.disk_path}): {e}")
+                self.disk_path = None
+
+    def _disk(self) -> sqlite3.Connection:
+        # SQLite connections must not be shared across threads or forked processes
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or getattr(self._local, 'pid', None) != os.getpid():
+            connection = sqlite3.connect(self.disk_path, timeout=2.0)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        """
+        Look up the issues of a paragraph
+
+        Args:
+            key: paragraph_key() of the paragraph
+
+        Returns:
+            List of issue dicts with paragraph-relative offsets, or None on a miss
+        """
+        with self._lock:
+            issues = self._entries.get(key)
+            if issues is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return issues
+
+        if self.disk_path:
+            try:
+                row = self._disk().execute(
+                    "SELECT issues FROM paragraph_issues WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    issues = json.loads(row[0])
+                    self._store_memory(key, issues)
+                    with self._lock:
+                        self._disk_hits += 1
+                    return issues
+            except (sqlite3.Error, ValueError) as e:
+                logger.warning(f"Grammar disk cache read failed: {e}")
+
+        with self._lock:
+            self._misses += 1
+        return None
+
+    def _store_memory(self, key: str, issues: List[Dict]):
+        with self._lock:
+            self._entries[key] = issues
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def set_many(self, items: Dict[str, List[Dict]]):
+        """
+        Store the issues of freshly checked paragraphs
+
+        Args:
+            items: Issue dict lists by paragraph key
+        """
+        for key, issues in items.items():
+            self._store_memory(key, issues)
+
+        if self.disk_path and items:
+            try:
+                connection = self._disk()
+                now = time.time()
+                connection.executemany(
+                    "INSERT OR REPLACE INTO paragraph_issues (key, issues, used_at) VALUES (?, ?, ?)",
+                    [(key, json.dumps(issues), now) for key, issues in items.items()]
+                )
+                with self._lock:
+                    self._disk_writes += len(items)
+                    prune = self._disk_writes % 1000 < len(items)
+                if prune:
+                    connection.execute("""
+                        DELETE FROM paragraph_issues WHERE key IN (
+                            SELECT key FROM paragraph_issues ORDER BY used_at DESC LIMIT -1 OFFSET ?
+                        )
+                    """, (self.max_disk_entries,))
+                connection.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Grammar disk cache write failed: {e}")
+
+    def get_stats(self) -> Dict:
+        """Get cache counters"""
+        with self._lock:
+            lookups = self._hits + self._disk_hits + self._misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'disk_path': self.disk_path,
+                'hits': self._hits,
+                'disk_hits': self._disk_hits,
+                'misses': self._misses,
+                'hit_rate': round((self._hits + self._disk_hits) / lookups, 4) if lookups else 0.0
+            }
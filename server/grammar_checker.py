@@ -3,12 +3,16 @@ Grammar Checker Service using LanguageTool
 Provides grammar checking functionality for the MinimalBlogWriter
 """
 
-import language_tool_python
-from typing import List, Dict, Any, Optional
+import os
+import bisect
+import threading
+from typing import List, Dict, Any, Optional, Iterator, Tuple
 import json
 import logging
 from dataclasses import dataclass
 from enum import Enum
+from grammar_pool import LanguageToolPool, GrammarPoolTimeout
+from grammar_cache import ParagraphCache, split_paragraphs, split_segments, paragraph_key
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -51,21 +55,35 @@ class GrammarIssue:
 class GrammarChecker:
     """Grammar checker service using LanguageTool"""
     
-    def __init__(self, language: str = 'en-US'):
+    def __init__(self, language: str = 'en-US', pool_size: int = 2, remote_server: Optional[str] = None,
+                 checkout_timeout: float = 10.0, check_timeout: float = 30.0,
+                 cache: Optional[ParagraphCache] = None):
         """
         Initialize the grammar checker
         
         Args:
             language: Language code for LanguageTool (default: en-US)
+            pool_size: Maximum number of LanguageTool backends
+            remote_server: URL of a shared LanguageTool server (default: in-process instances)
+            checkout_timeout: Seconds to wait for a free backend
+            check_timeout: Seconds a single check may take
+            cache: Paragraph result cache (default: in-memory LRU)
         """
         self.language = language
-        self._tool = None
+        self._cache = cache if cache is not None else ParagraphCache()
+        self._pool = LanguageToolPool(
+            language=language,
+            size=pool_size,
+            remote_server=remote_server,
+            checkout_timeout=checkout_timeout,
+            check_timeout=check_timeout
+        )
         self._initialize_tool()
     
     def _initialize_tool(self):
-        """Initialize LanguageTool instance"""
+        """Start the first LanguageTool backend"""
         try:
-            self._tool = language_tool_python.LanguageTool(self.language)
+            self._pool.warm(1)
             logger.info(f"LanguageTool initialized for language: {self.language}")
         except Exception as e:
             logger.error(f"Failed to initialize LanguageTool: {e}")
@@ -74,6 +92,9 @@ class GrammarChecker:
     def check_text(self, text: str) -> List[GrammarIssue]:
         """
         Check text for grammar, spelling, and style issues
+
+        The text is split into paragraphs; paragraphs checked before are served
+        from the paragraph cache and only the others go to LanguageTool.
         
         Args:
             text: Text to check
@@ -85,49 +106,145 @@ class GrammarChecker:
             return []
         
         try:
-            matches = self._tool.check(text)
-            issues = []
+            paragraphs = split_paragraphs(text)
+            keys = [paragraph_key(self.language, paragraph) for _, paragraph in paragraphs]
 
-            for match in matches:
-                try:
-                    issue_type = self._categorize_issue(match)
-
-                    # Get short message - LanguageTool doesn't have shortMessage attribute
-                    short_msg = getattr(match, 'shortMessage', None) or match.message
-                    if len(short_msg) > 100:
-                        short_msg = short_msg[:97] + "..."
-
-                    # Safely get all match attributes
-                    offset = getattr(match, 'offset', 0)
-                    length = getattr(match, 'errorLength', 0)
-                    message = getattr(match, 'message', 'Grammar issue detected')
-                    rule_id = getattr(match, 'ruleId', 'UNKNOWN')
-                    replacements = getattr(match, 'replacements', [])[:5]
-                    context = getattr(match, 'context', '')
-                    sentence = getattr(match, 'sentence', '')
-
-                    issue = GrammarIssue(
-                        offset=offset,
-                        length=length,
-                        message=message,
-                        short_message=short_msg,
-                        issue_type=issue_type.value,
-                        rule_id=rule_id,
-                        replacements=replacements,
-                        context=context,
-                        sentence=sentence
-                    )
-                    issues.append(issue)
-
-                except Exception as match_error:
-                    logger.warning(f"Error processing match: {match_error}")
+            results = {}
+            unchecked = {}
+            for key, (_, paragraph) in zip(keys, paragraphs):
+                if key in results or key in unchecked:
                     continue
+                cached = self._cache.get(key) if self._cache else None
+                if cached is not None:
+                    results[key] = cached
+                else:
+                    unchecked[key] = paragraph
+
+            if unchecked:
+                fresh = dict(zip(unchecked.keys(), self._check_paragraphs(list(unchecked.values()))))
+                if self._cache:
+                    self._cache.set_many(fresh)
+                results.update(fresh)
+
+            # Shift paragraph-relative offsets back to document coordinates
+            issues = []
+            for key, (start, _) in zip(keys, paragraphs):
+                for item in results[key]:
+                    issues.append(GrammarIssue(**{**item, 'offset': item['offset'] + start}))
 
             return issues
 
+        except GrammarPoolTimeout:
+            raise
         except Exception as e:
             logger.error(f"Error checking text: {e}")
             return []
+
+    def iter_check_text(self, text: str) -> Iterator[Tuple[int, int, List[GrammarIssue]]]:
+        """
+        Check text segment by segment, yielding results as each segment is done
+
+        Segments are paragraphs, with long paragraphs broken into groups of
+        sentences. Segment results share the paragraph cache.
+
+        Args:
+            text: Text to check
+
+        Yields:
+            Tuples of (segment offset, segment length, GrammarIssue objects in
+            document coordinates)
+        """
+        if not text or not text.strip():
+            return
+
+        for start, segment in split_segments(text):
+            key = paragraph_key(self.language, segment)
+            items = self._cache.get(key)
+            if items is None:
+                items = self._check_paragraphs([segment])[0]
+                self._cache.set_many({key: items})
+
+            yield start, len(segment), [GrammarIssue(**{**item, 'offset': item['offset'] + start}) for item in items]
+
+    def _check_paragraphs(self, paragraphs: List[str]) -> List[List[Dict[str, Any]]]:
+        """
+        Check paragraphs with a single LanguageTool request
+
+        Args:
+            paragraphs: Paragraph texts
+
+        Returns:
+            Issue dicts with paragraph-relative offsets, one list per paragraph
+        """
+        separator = "\n\n"
+        starts = []
+        position = 0
+        for paragraph in paragraphs:
+            starts.append(position)
+            position += len(paragraph) + len(separator)
+        combined = separator.join(paragraphs)
+
+        with self._pool.checkout() as tool:
+            matches = tool.check(combined)
+
+        per_paragraph = [[] for _ in paragraphs]
+        for match in matches:
+            issue = self._match_to_issue(match)
+            if issue is None:
+                continue
+
+            index = bisect.bisect_right(starts, issue.offset) - 1
+            relative_offset = issue.offset - starts[index]
+            # Drop matches on the separator we inserted
+            if index < 0 or relative_offset + issue.length > len(paragraphs[index]):
+                continue
+
+            per_paragraph[index].append({**issue.to_dict(), 'offset': relative_offset})
+
+        return per_paragraph
+
+    def _match_to_issue(self, match) -> Optional[GrammarIssue]:
+        """
+        Convert a LanguageTool match into a GrammarIssue
+
+        Args:
+            match: LanguageTool match object
+
+        Returns:
+            GrammarIssue, or None if the match could not be processed
+        """
+        try:
+            issue_type = self._categorize_issue(match)
+
+            # Get short message - LanguageTool doesn't have shortMessage attribute
+            short_msg = getattr(match, 'shortMessage', None) or match.message
+            if len(short_msg) > 100:
+                short_msg = short_msg[:97] + "..."
+
+            # Safely get all match attributes
+            offset = getattr(match, 'offset', 0)
+            length = getattr(match, 'errorLength', 0)
+            message = getattr(match, 'message', 'Grammar issue detected')
+            rule_id = getattr(match, 'ruleId', 'UNKNOWN')
+            replacements = getattr(match, 'replacements', [])[:5]
+            context = getattr(match, 'context', '')
+            sentence = getattr(match, 'sentence', '')
+
+            return GrammarIssue(
+                offset=offset,
+                length=length,
+                message=message,
+                short_message=short_msg,
+                issue_type=issue_type.value,
+                rule_id=rule_id,
+                replacements=replacements,
+                context=context,
+                sentence=sentence
+            )
+
+        except Exception as match_error:
+            logger.warning(f"Error processing match: {match_error}")
+            return None
     
     def _categorize_issue(self, match) -> IssueType:
         """
@@ -219,22 +336,81 @@ class GrammarChecker:
         
         return text[:start] + replacement + text[end:]
     
+    def warm(self, count: Optional[int] = None) -> int:
+        """
+        Start LanguageTool backends ahead of the first check
+
+        Args:
+            count: Number of backends to have ready (default: the pool size)
+
+        Returns:
+            Number of backends created
+        """
+        return self._pool.warm(count or self._pool.size)
+
+    def get_health(self) -> Dict[str, Any]:
+        """Get the state of the LanguageTool backend pool and the paragraph cache"""
+        return {**self._pool.get_health(), 'cache': self._cache.get_stats()}
+
     def close(self):
-        """Close the LanguageTool instance"""
-        if self._tool:
-            self._tool.close()
-            logger.info("LanguageTool instance closed")
+        """Close the LanguageTool instances"""
+        self._pool.close()
+        logger.info("LanguageTool instances closed")
 
 # Global grammar checker instance
 _grammar_checker = None
+_grammar_checker_lock = threading.Lock()
+
+def create_grammar_checker() -> GrammarChecker:
+    """Create an in-process grammar checker configured from the environment"""
+    return GrammarChecker(
+        language=os.getenv('LANGUAGE_TOOL_LANGUAGE', 'en-US'),
+        pool_size=int(os.getenv('GRAMMAR_POOL_SIZE', 2)),
+        remote_server=os.getenv('LANGUAGE_TOOL_SERVER'),
+        checkout_timeout=float(os.getenv('GRAMMAR_CHECKOUT_TIMEOUT', 10)),
+        check_timeout=float(os.getenv('GRAMMAR_CHECK_TIMEOUT', 30)),
+        cache=ParagraphCache(
+            max_entries=int(os.getenv('GRAMMAR_CACHE_SIZE', 5000)),
+            disk_path=os.getenv('GRAMMAR_CACHE_PATH')
+        )
+    )
 
 def get_grammar_checker() -> GrammarChecker:
-    """Get or create global grammar checker instance"""
+    """
+    Get or create global grammar checker instance
+
+    Under gunicorn this is a client of the grammar sidecar process started
+    before the workers forked; otherwise LanguageTool runs in-process.
+    """
     global _grammar_checker
     if _grammar_checker is None:
-        _grammar_checker = GrammarChecker()
+        with _grammar_checker_lock:
+            if _grammar_checker is None:
+                from grammar_sidecar import get_sidecar_checker
+                _grammar_checker = get_sidecar_checker() or create_grammar_checker()
     return _grammar_checker
 
+def get_grammar_health() -> Dict[str, Any]:
+    """
+    Health of the grammar checker without running a check
+
+    Returns:
+        Dictionary with warm/cold state and the pool and cache state
+    """
+    from grammar_sidecar import get_sidecar_checker
+
+    checker = _grammar_checker
+    if checker is None:
+        # Ask the sidecar even before this worker's first check
+        checker = get_sidecar_checker()
+        if checker is None:
+            return {'initialized': False, 'warm': False}
+
+    try:
+        return {'initialized': True, **checker.get_health()}
+    except Exception as e:
+        return {'initialized': True, 'warm': False, 'error': str(e)}
+
 def check_grammar_api(text: str) -> Dict[str, Any]:
     """
     API function for grammar checking
@@ -267,6 +443,40 @@ def check_grammar_api(text: str) -> Dict[str, Any]:
             'statistics': {'total_issues': 0, 'by_type': {}, 'severity_distribution': {}}
         }
 
+def stream_grammar_api(text: str) -> Iterator[Dict[str, Any]]:
+    """
+    API function for streaming grammar checking
+
+    Args:
+        text: Text to check
+
+    Yields:
+        'segment' events with the issues of each checked segment, then a 'done'
+        event with the statistics, or an 'error' event
+    """
+    issues = []
+    try:
+        checker = get_grammar_checker()
+        for offset, length, segment_issues in checker.iter_check_text(text):
+            issues.extend(segment_issues)
+            yield {
+                'type': 'segment',
+                'offset': offset,
+                'length': length,
+                'issues': [issue.to_dict() for issue in segment_issues]
+            }
+
+        yield {
+            'type': 'done',
+            'statistics': checker.get_statistics(issues),
+            'text_length': len(text),
+            'word_count': len(text.split()) if text else 0
+        }
+
+    except Exception as e:
+        logger.error(f"Grammar stream API error: {e}")
+        yield {'type': 'error', 'error': str(e)}
+
 if __name__ == "__main__":
     # Test the grammar checker
     test_text = "This are a test sentence with some grammar errors. I has been working on this project."
@@ -0,0 +1,210 @@
+"""
+LanguageTool Backend Pool for the Grammar Checker
+
+A single language_tool_python.LanguageTool instance serialized every grammar
+check in the process. This pool hands out LanguageTool backends through a
+checkout queue so concurrent checks run in parallel:
+
+- remote mode (LANGUAGE_TOOL_SERVER set): every backend is a lightweight
+  client of one shared LanguageTool server, so no JVM runs in the web workers
+- local mode: up to `size` in-process LanguageTool instances, each with its
+  own local server, created on demand
+
+Checkouts wait at most `checkout_timeout` seconds. A backend whose check
+raises is discarded and replaced on the next checkout, and the pool keeps
+counters for /api/grammar/health.
+"""
+
+import time
+import queue
+import threading
+import logging
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+import language_tool_python
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class GrammarPoolTimeout(Exception):
+    """Raised when no LanguageTool backend became available in time"""
+    pass
+
+
+class LanguageToolPool:
+    """
+    Bounded pool of LanguageTool backends
+    """
+
+    def __init__(self, language: str = 'en-US', size: int = 2, remote_server: Optional[str] = None,
+                 checkout_timeout: float = 10.0, check_timeout: float = 30.0):
+        """
+        Initialize the pool
+
+        Args:
+            language: Language code for LanguageTool
+            size: Maximum number of backends
+            remote_server: URL of a shared LanguageTool server; local instances are
+                started when empty
+            checkout_timeout: Seconds to wait for a free backend
+            check_timeout: HTTP timeout in seconds for a single check request
+        """
+        self.language = language
+        self.size = max(1, size)
+        self.remote_server = remote_server or None
+        self.checkout_timeout = checkout_timeout
+        self.check_timeout = check_timeout
+
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._in_use = 0
+        self._checkouts = 0
+        self._timeouts = 0
+        self._failures = 0
+        self._total_wait = 0.0
+        self._last_error = None
+
+    @property
+    def mode(self) -> str:
+        return 'remote' if self.remote_server else 'local'
+
+    def _create_backend(self):
+        if self.remote_server:
+            tool = language_tool_python.LanguageTool(self.language, remote_server=self.remote_server)
+        else:
+            tool = language_tool_python.LanguageTool(self.language)
+
+        # language_tool_python reads the request timeout from this attribute
+        if hasattr(tool, '_TIMEOUT'):
+            tool._TIMEOUT = self.check_timeout
+
+        logger.info(f"LanguageTool backend started ({self.mode}, language: {self.language})")
+        return tool
+
+    def _close_backend(self, tool):
+        try:
+            tool.close()
+        except Exception as e:
+            logger.warning(f"Error closing LanguageTool backend: {e}")
+
+    def warm(self, count: int = 1) -> int:
+        """
+        Start backends ahead of the first check
+
+        Args:
+            count: Number of backends to have ready
+
+        Returns:
+            Number of backends created
+        """
+        created = 0
+        while True:
+            with self._lock:
+                if self._created >= min(count, self.size):
+                    break
+                self._created += 1
+            try:
+                self._idle.put(self._create_backend())
+                created += 1
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        return created
+
+    def _acquire(self):
+        started = time.monotonic()
+
+        # Reuse an idle backend, else start a new one while under the limit
+        try:
+            return self._idle.get_nowait(), started
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_create = self._created < self.size
+            if can_create:
+                self._created += 1
+
+        if can_create:
+            try:
+                return self._create_backend(), started
+            except Exception as e:
+                with self._lock:
+                    self._created -= 1
+                    self._failures += 1
+                    self._last_error = str(e)
+                raise
+
+        try:
+            return self._idle.get(timeout=self.checkout_timeout), started
+        except queue.Empty:
+            with self._lock:
+                self._timeouts += 1
+            raise GrammarPoolTimeout(f"No grammar checker available within {self.checkout_timeout}s")
+
+    @contextmanager
+    def checkout(self):
+        """
+        Borrow a LanguageTool backend
+
+        Yields:
+            language_tool_python.LanguageTool instance
+        """
+        tool, started = self._acquire()
+        with self._lock:
+            self._in_use += 1
+            self._checkouts += 1
+            self._total_wait += time.monotonic() - started
+
+        healthy = True
+        try:
+            yield tool
+        except Exception as e:
+            healthy = False
+            with self._lock:
+                self._failures += 1
+                self._last_error = str(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_use -= 1
+                if not healthy:
+                    self._created -= 1
+            if healthy:
+                self._idle.put(tool)
+            else:
+                # The backend may have lost its server; start a fresh one next time
+                self._close_backend(tool)
+
+    def get_health(self) -> Dict[str, Any]:
+        """Get pool state and counters"""
+        with self._lock:
+            return {
+                'mode': self.mode,
+                'language': self.language,
+                'size': self.size,
+                'warm': self._created > 0,
+                'started': self._created,
+                'idle': self._idle.qsize(),
+                'in_use': self._in_use,
+                'checkouts': self._checkouts,
+                'checkout_timeouts': self._timeouts,
+                'failures': self._failures,
+                'average_wait_ms': round(1000 * self._total_wait / self._checkouts, 2) if self._checkouts else 0.0,
+                'last_error': self._last_error
+            }
+
+    def close(self):
+        """Close all idle backends"""
+        while True:
+            try:
+                tool = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._created -= 1
+            self._close_backend(tool)
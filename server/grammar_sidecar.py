@@ -0,0 +1,414 @@
+"""
+Grammar Checker Sidecar Process
+
+Under gunicorn every worker used to start its own LanguageTool JVM lazily,
+on the first grammar request it handled: a multi-second latency spike and
+one JVM per worker. The gunicorn `on_starting` hook now starts this module
+as a single sidecar process before the workers fork. The sidecar owns the
+LanguageTool pool and the paragraph cache and warms them up immediately;
+workers send check requests to it over a local Unix socket through
+SidecarGrammarChecker.
+
+The socket path and auth key are handed to the workers through the
+GRAMMAR_SIDECAR_SOCKET and GRAMMAR_SIDECAR_AUTHKEY environment variables.
+
+Usage (normally started by gunicorn.conf.py):
+    python grammar_sidecar.py
+"""
+
+import os
+import sys
+import time
+import secrets
+import tempfile
+import threading
+import subprocess
+import logging
+from multiprocessing.connection import Client, Listener
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from grammar_checker import GrammarChecker, GrammarIssue, create_grammar_checker
+from grammar_pool import GrammarPoolTimeout
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+SOCKET_ENV = 'GRAMMAR_SIDECAR_SOCKET'
+AUTHKEY_ENV = 'GRAMMAR_SIDECAR_AUTHKEY'
+
+
+class GrammarSidecarUnavailable(Exception):
+    """Raised when the sidecar process cannot be reached"""
+    pass
+
+
+class SidecarGrammarChecker(GrammarChecker):
+    """
+    GrammarChecker that delegates checks to the sidecar process
+    """
+
+    def __init__(self, socket_path: str, authkey: bytes, timeout: float = 30.0):
+        """
+        Initialize the client
+
+        Args:
+            socket_path: Unix socket of the sidecar
+            authkey: Shared secret for the connection handshake
+            timeout: Seconds to wait for a reply
+        """
+        self.socket_path = socket_path
+        self.authkey = authkey
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        # One connection per thread and process; connections are not shareable
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or getattr(self._local, 'pid', None) != os.getpid():
+            connection = Client(self.socket_path, family='AF_UNIX', authkey=self.authkey)
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def _drop_connection(self):
+        connection = getattr(self._local, 'connection', None)
+        self._local.connection = None
+        if connection is not None:
+            try:
+                connection.close()
+            except OSError:
+                pass
+
+    def _request(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        # A stale connection (e.g. the sidecar was restarted by its supervisor) gets one retry
+        for attempt in range(2):
+            try:
+                connection = self._connection()
+                connection.send(payload)
+                if not connection.poll(self.timeout):
+                    self._drop_connection()
+                    raise GrammarPoolTimeout(f"Grammar sidecar did not answer within {self.timeout}s")
+                return connection.recv()
+            except (OSError, EOFError) as e:
+                self._drop_connection()
+                if attempt == 1:
+                    raise GrammarSidecarUnavailable(f"Grammar sidecar unavailable: {e}")
+
+    def check_text(self, text: str) -> List[GrammarIssue]:
+        """
+        Check text for grammar, spelling, and style issues in the sidecar
+
+        Args:
+            text: Text to check
+
+        Returns:
+            List of GrammarIssue objects
+        """
+        if not text or not text.strip():
+            return []
+
+        reply = self._request({'op': 'check', 'text': text})
+        if not reply.get('ok'):
+            if reply.get('busy'):
+                raise GrammarPoolTimeout(reply.get('error'))
+            raise RuntimeError(reply.get('error', 'Grammar sidecar error'))
+        return [GrammarIssue(**issue) for issue in reply['issues']]
+
+    def iter_check_text(self, text: str) -> Iterator[Tuple[int, int, List[GrammarIssue]]]:
+        """
+        Check text in the sidecar, yielding results as each segment is done
+
+        Args:
+            text: Text to check
+
+        Yields:
+            Tuples of (segment offset, segment length, GrammarIssue objects)
+        """
+        if not text or not text.strip():
+            return
+
+        connection = self._connection()
+        finished = False
+        try:
+            try:
+                connection.send({'op': 'check_stream', 'text': text})
+            except (OSError, EOFError):
+                # Stale connection; retry once on a fresh one
+                self._drop_connection()
+                connection = self._connection()
+                connection.send({'op': 'check_stream', 'text': text})
+
+            while True:
+                if not connection.poll(self.timeout):
+                    raise GrammarPoolTimeout(f"Grammar sidecar did not answer within {self.timeout}s")
+                reply = connection.recv()
+                if not reply.get('ok'):
+                    finished = True
+                    if reply.get('busy'):
+                        raise GrammarPoolTimeout(reply.get('error'))
+                    raise RuntimeError(reply.get('error', 'Grammar sidecar error'))
+                if reply.get('done'):
+                    finished = True
+                    return
+                yield reply['offset'], reply['length'], [GrammarIssue(**issue) for issue in reply['issues']]
+        except (OSError, EOFError) as e:
+            raise GrammarSidecarUnavailable(f"Grammar sidecar unavailable: {e}")
+        finally:
+            if not finished:
+                # Unread replies would be mistaken for answers to the next request
+                self._drop_connection()
+
+    def get_health(self) -> Dict[str, Any]:
+        """Get the sidecar's pool and cache state"""
+        reply = self._request({'op': 'health'})
+        return {'sidecar': self.socket_path, **reply.get('health', {})}
+
+    def close(self):
+        """Close this thread's connection to the sidecar"""
+        self._drop_connection()
+
+
+def get_sidecar_checker() -> Optional[SidecarGrammarChecker]:
+    """
+    Create a sidecar client when a sidecar was started for this server
+
+    Returns:
+        SidecarGrammarChecker, or None when checks should run in-process
+    """
+    socket_path = os.getenv(SOCKET_ENV)
+    authkey = os.getenv(AUTHKEY_ENV)
+    if not socket_path or not authkey:
+        return None
+    return SidecarGrammarChecker(
+        socket_path,
+        bytes.fromhex(authkey),
+        timeout=float(os.getenv('GRAMMAR_CHECK_TIMEOUT', 30))
+    )
+
+
+# ===== Sidecar process =====
+
+class _SidecarServer:
+    """Serves check requests from the workers with one shared GrammarChecker"""
+
+    def __init__(self, socket_path: str, authkey: bytes):
+        self.socket_path = socket_path
+        self.authkey = authkey
+        self.checker = None
+        self.ready = threading.Event()
+        self.started_at = time.time()
+        self.warm_seconds = None
+        self.warm_error = None
+
+    def warm_up(self):
+        try:
+            checker = create_grammar_checker()
+            # Start every backend now so no request pays for a JVM boot
+            checker.warm()
+            self.checker = checker
+            self.warm_seconds = round(time.time() - self.started_at, 2)
+            logger.info(f"Grammar sidecar warm after {self.warm_seconds}s")
+        except Exception as e:
+            self.warm_error = str(e)
+            logger.error(f"Grammar sidecar warm-up failed: {e}")
+        finally:
+            self.ready.set()
+
+    def health(self) -> Dict[str, Any]:
+        health = {
+            'warm': self.checker is not None,
+            'warm_seconds': self.warm_seconds,
+            'warm_error': self.warm_error,
+            'pid': os.getpid()
+        }
+        if self.checker is not None:
+            health.update(self.checker.get_health())
+        return health
+
+    def _wait_ready(self) -> Optional[Dict[str, Any]]:
+        # Requests that arrive during warm-up wait for it instead of starting a second JVM
+        if not self.ready.wait(float(os.getenv('GRAMMAR_CHECKOUT_TIMEOUT', 10))):
+            return {'ok': False, 'busy': True, 'error': 'Grammar checker is still warming up'}
+        if self.checker is None:
+            return {'ok': False, 'error': f"Grammar checker failed to start: {self.warm_error}"}
+        return None
+
+    def handle(self, request: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        if request.get('op') == 'health':
+            yield {'ok': True, 'health': self.health()}
+            return
+
+        if request.get('op') not in ('check', 'check_stream'):
+            yield {'ok': False, 'error': f"Unknown operation: {request.get('op')}"}
+            return
+
+        not_ready = self._wait_ready()
+        if not_ready:
+            yield not_ready
+            return
+
+        try:
+            if request['op'] == 'check':
+                issues = self.checker.check_text(request.get('text', ''))
+                yield {'ok': True, 'issues': [issue.to_dict() for issue in issues]}
+            else:
+                for offset, length, issues in self.checker.iter_check_text(request.get('text', '')):
+                    yield {'ok': True, 'offset': offset, 'length': length,
+                           'issues': [issue.to_dict() for issue in issues]}
+                yield {'ok': True, 'done': True}
+        except GrammarPoolTimeout as e:
+            yield {'ok': False, 'busy': True, 'error': str(e)}
+        except Exception as e:
+            yield {'ok': False, 'error': str(e)}
+
+    def serve_connection(self, connection):
+        try:
+            while True:
+                request = connection.recv()
+                for reply in self.handle(request):
+                    connection.send(reply)
+        except (EOFError, OSError):
+            pass
+        finally:
+            connection.close()
+
+    def serve_forever(self):
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        listener = Listener(self.socket_path, family='AF_UNIX', authkey=self.authkey)
+        os.chmod(self.socket_path, 0o600)
+
+        threading.Thread(target=self.warm_up, name='grammar-warm-up', daemon=True).start()
+
+        while True:
+            try:
+                connection = listener.accept()
+            except Exception as e:
+                # Failed handshakes (wrong auth key) must not stop the sidecar
+                logger.warning(f"Grammar sidecar rejected a connection: {e}")
+                continue
+            threading.Thread(target=self.serve_connection, args=(connection,), daemon=True).start()
+
+
+def _exit_with_parent(parent_pid: int):
+    # The sidecar must not outlive the gunicorn master, even if it is killed
+    while True:
+        time.sleep(2)
+        if os.getppid() != parent_pid:
+            logger.info("Grammar sidecar parent exited, shutting down")
+            os._exit(0)
+
+
+# ===== gunicorn integration =====
+
+_sidecar_process = None
+_sidecar_stopping = threading.Event()
+_sidecar_lock = threading.Lock()
+
+
+def _spawn_sidecar(socket_path: str, authkey: str) -> subprocess.Popen:
+    environment = dict(os.environ, **{SOCKET_ENV: socket_path, AUTHKEY_ENV: authkey})
+    return subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__)],
+        env=environment,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+
+
+def _supervise(socket_path: str, authkey: str, interval: float):
+    # Workers keep the socket path and auth key they forked with, so a restarted
+    # sidecar listens on the same ones and their next request reconnects to it
+    global _sidecar_process
+    while not _sidecar_stopping.wait(interval):
+        with _sidecar_lock:
+            process = _sidecar_process
+            if _sidecar_stopping.is_set() or process is None or process.poll() is None:
+                continue
+            logger.error(f"Grammar sidecar exited with code {process.returncode}, restarting it")
+            _sidecar_process = _spawn_sidecar(socket_path, authkey)
+
+
+def start_sidecar(wait_seconds: float = 30.0, check_interval: float = 5.0) -> Optional[subprocess.Popen]:
+    """
+    Start the sidecar and export its address to the processes forked later
+
+    Waits until the sidecar is warm (or wait_seconds passed) so the first
+    request of every worker finds a running LanguageTool. A supervisor
+    thread in the calling process restarts the sidecar if it dies later.
+
+    Args:
+        wait_seconds: Maximum seconds to wait for the warm-up
+        check_interval: Seconds between checks that the sidecar is still running
+
+    Returns:
+        The sidecar process
+    """
+    global _sidecar_process
+
+    socket_path = os.path.join(tempfile.gettempdir(), f"lawfort-grammar-{os.getpid()}.sock")
+    authkey = secrets.token_hex(16)
+
+    _sidecar_stopping.clear()
+    _sidecar_process = _spawn_sidecar(socket_path, authkey)
+
+    os.environ[SOCKET_ENV] = socket_path
+    os.environ[AUTHKEY_ENV] = authkey
+
+    client = get_sidecar_checker()
+    deadline = time.time() + wait_seconds
+    while time.time() < deadline and _sidecar_process.poll() is None:
+        try:
+            if client.get_health().get('warm'):
+                logger.info("Grammar sidecar is warm")
+                break
+        except (GrammarSidecarUnavailable, GrammarPoolTimeout):
+            pass
+        time.sleep(0.5)
+    else:
+        logger.warning("Grammar sidecar is not warm yet; workers will wait for it on their first check")
+    client.close()
+
+    if _sidecar_process.poll() is not None:
+        # Let the workers fall back to in-process checking
+        logger.error(f"Grammar sidecar exited with code {_sidecar_process.returncode}")
+        os.environ.pop(SOCKET_ENV, None)
+        os.environ.pop(AUTHKEY_ENV, None)
+        _sidecar_process = None
+    else:
+        threading.Thread(target=_supervise, args=(socket_path, authkey, check_interval),
+                         name='grammar-sidecar-supervisor', daemon=True).start()
+
+    return _sidecar_process
+
+
+def stop_sidecar():
+    """Terminate the sidecar started by start_sidecar"""
+    global _sidecar_process
+    with _sidecar_lock:
+        _sidecar_stopping.set()
+        if _sidecar_process is None:
+            return
+        _sidecar_process.terminate()
+        try:
+            _sidecar_process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            _sidecar_process.kill()
+        _sidecar_process = None
+
+    socket_path = os.environ.pop(SOCKET_ENV, None)
+    os.environ.pop(AUTHKEY_ENV, None)
+    if socket_path and os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    socket_path = os.getenv(SOCKET_ENV)
+    authkey = os.getenv(AUTHKEY_ENV)
+    if not socket_path or not authkey:
+        print(f"{SOCKET_ENV} and {AUTHKEY_ENV} must be set")
+        sys.exit(1)
+
+    threading.Thread(target=_exit_with_parent, args=(os.getppid(),), daemon=True).start()
+    _SidecarServer(socket_path, bytes.fromhex(authkey)).serve_forever()
@@ -34,4 +34,37 @@ tmp_upload_dir = None
 
 # SSL (if needed in future)
 # keyfile = None
-# certfile = None
\ No newline at end of file
+# certfile = None
+
+# Server hooks
+def worker_exit(server, worker):
+    """Flush buffered view counts and finish queued thumbnails before the worker goes away"""
+    try:
+        from view_counter import view_counter
+        view_counter.shutdown()
+    except Exception as e:
+        server.log.error(f"Failed to flush view counts on worker exit: {e}")
+    try:
+        from thumbnail_jobs import thumbnail_pipeline
+        thumbnail_pipeline.shutdown()
+    except Exception as e:
+        server.log.error(f"Failed to finish thumbnail renders on worker exit: {e}")
+
+def on_starting(server):
+    """Start the grammar checker sidecar so workers share one warm LanguageTool"""
+    if os.getenv('GRAMMAR_SIDECAR', 'true').lower() != 'true':
+        return
+    try:
+        from grammar_sidecar import start_sidecar
+        start_sidecar(wait_seconds=float(os.getenv('GRAMMAR_SIDECAR_WARM_TIMEOUT', 30)),
+                      check_interval=float(os.getenv('GRAMMAR_SIDECAR_CHECK_INTERVAL', 5)))
+    except Exception as e:
+        server.log.error(f"Failed to start grammar sidecar, workers will check grammar in-process: {e}")
+
+def on_exit(server):
+    """Stop the grammar checker sidecar"""
+    try:
+        from grammar_sidecar import stop_sidecar
+        stop_sidecar()
+    except Exception as e:
+        server.log.error(f"Failed to stop grammar sidecar: {e}")
@@ -347,7 +347,8 @@ CREATE TABLE Content_Metrics (
     Avg_Time_Spent INT DEFAULT 0, -- Average time spent in seconds
     Bounce_Rate DECIMAL(5,2) DEFAULT 0.00,
     Last_Updated DATETIME DEFAULT CURRENT_TIMESTAMP,
-    FOREIGN KEY (Content_ID) REFERENCES Content(Content_ID) ON DELETE CASCADE
+    FOREIGN KEY (Content_ID) REFERENCES Content(Content_ID) ON DELETE CASCADE,
+    UNIQUE KEY unique_content_metrics (Content_ID)
 );
 
 CREATE TABLE OAuth_Providers (
@@ -0,0 +1,245 @@
+"""
+PDF Text Extraction and Page Index for Notes and Research Papers
+
+PDF note uploads used to extract every page with PyPDF2 inside the request,
+return the first 500 characters and drop the rest, and research paper PDFs
+were never read at all, so neither was findable by its contents.
+
+Extraction now runs in a child process per document, at most `max_workers`
+at a time, killed after `timeout` seconds and stopping after `max_pages`
+pages. The page texts are cached per PDF content hash next to the stored
+upload (see upload_store.py), so a PDF is parsed once however often it is
+uploaded. Once a note or research paper is saved, its pages are written to
+Content_Pdf_Pages (pdf_text_migration.sql) in the background, where the
+FULLTEXT index serves the notes and research paper search.
+"""
+
+import os
+import threading
+import logging
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from upload_store import upload_store, file_sha256
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class PdfTextError(Exception):
+    """Raised when text could not be extracted from a PDF"""
+    pass
+
+
+def _extract_pages(pdf_path: str, max_pages: int, connection):
+    """Child process: send (pages, page_count) or an error message through the pipe"""
+    try:
+        import PyPDF2
+
+        with open(pdf_path, 'rb') as pdf_file:
+            pdf_reader = PyPDF2.PdfReader(pdf_file)
+            page_count = len(pdf_reader.pages)
+            pages = []
+            for page in pdf_reader.pages[:max_pages]:
+                try:
+                    pages.append(page.extract_text() or '')
+                except Exception:
+                    # One unreadable page should not lose the rest of the document
+                    pages.append('')
+        connection.send(('ok', pages, page_count))
+    except Exception as e:
+        connection.send(('error', str(e), 0))
+    finally:
+        connection.close()
+
+
+class PdfTextExtractor:
+    """
+    Bounded, time-limited PDF text extraction with a per-hash page cache
+    """
+
+    def __init__(self, max_workers: int = 2, timeout: float = 30.0, max_pages: int = 200):
+        """
+        Initialize the extractor
+
+        Args:
+            max_workers: Extraction processes running at the same time (per web worker)
+            timeout: Seconds before an extraction process is killed
+            max_pages: Pages extracted per document
+        """
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.connection_pool = None
+        self._reset_process_state()
+
+    def _reset_process_state(self):
+        self._slots = threading.BoundedSemaphore(self.max_workers)
+        self._executor = None
+        self._lock = threading.Lock()
+        self._extracted = 0
+        self._cache_hits = 0
+        self._timeouts = 0
+        self._failures = 0
+        self._indexed = 0
+        self._pid = os.getpid()
+
+    def _check_process(self):
+        # Threads, semaphores and executors do not survive fork; start fresh in each worker
+        if self._pid != os.getpid():
+            self._reset_process_state()
+
+    def init_pool(self, connection_pool):
+        """
+        Set the connection pool used to store page texts
+
+        Args:
+            connection_pool: MySQL connection pool instance
+        """
+        self.connection_pool = connection_pool
+
+    def extract(self, pdf_path: str, sha256: Optional[str] = None) -> List[str]:
+        """
+        Get the text of each page of a PDF
+
+        Args:
+            pdf_path: Path of the PDF
+            sha256: Content hash of the PDF if already known
+
+        Returns:
+            Page texts, at most max_pages of them
+
+        Raises:
+            PdfTextError: If the PDF could not be read within the timeout
+        """
+        self._check_process()
+        sha256 = sha256 or file_sha256(pdf_path)
+
+        pages = upload_store.get_pages(sha256)
+        if pages is not None:
+            with self._lock:
+                self._cache_hits += 1
+            return pages
+
+        with self._slots:
+            pages, page_count = self._run_extraction(pdf_path)
+
+        if page_count > len(pages):
+            logger.info(f"Extracted {len(pages)} of {page_count} pages from {os.path.basename(pdf_path)}")
+        upload_store.set_pages(sha256, pages)
+        with self._lock:
+            self._extracted += 1
+        return pages
+
+    def _run_extraction(self, pdf_path: str):
+        # fork so the child does not re-import the app module
+        context = multiprocessing.get_context('fork')
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(target=_extract_pages, args=(pdf_path, self.max_pages, sender), daemon=True)
+        process.start()
+        sender.close()
+
+        try:
+            # Read before joining: a large result would block the child on a full pipe
+            if not receiver.poll(self.timeout):
+                with self._lock:
+                    self._timeouts += 1
+                raise PdfTextError(f"Text extraction timed out after {self.timeout}s")
+            try:
+                status, result, page_count = receiver.recv()
+            except EOFError:
+                status, result, page_count = 'error', 'Extraction process exited unexpectedly', 0
+        finally:
+            receiver.close()
+            if process.is_alive():
+                process.terminate()
+            process.join()
+
+        if status != 'ok':
+            with self._lock:
+                self._failures += 1
+            raise PdfTextError(result)
+        return result, page_count
+
+    def submit(self, content_id: int, pdf_path: str):
+        """
+        Extract and store the page texts of a saved note or research paper in the background
+
+        Args:
+            content_id: Content ID the PDF belongs to
+            pdf_path: Path of the PDF
+        """
+        self._check_process()
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='pdf-text')
+            executor = self._executor
+        executor.submit(self._index, content_id, pdf_path)
+
+    def _index(self, content_id: int, pdf_path: str):
+        try:
+            pages = self.extract(pdf_path)
+        except Exception as e:
+            logger.warning(f"Failed to extract text of content {content_id} ({os.path.basename(pdf_path)}): {str(e)}")
+            pages = []
+
+        if self.connection_pool is None:
+            logger.warning(f"PDF text extractor has no connection pool, not indexing content {content_id}")
+            return
+
+        try:
+            connection = self.connection_pool.get_connection()
+            try:
+                self.store_pages(connection, content_id, pages)
+                connection.commit()
+            finally:
+                connection.close()
+            with self._lock:
+                self._indexed += 1
+        except Exception as e:
+            logger.error(f"Failed to store page texts of content {content_id}: {str(e)}")
+
+    def store_pages(self, connection, content_id: int, pages: List[str]):
+        """
+        Replace the stored page texts of a content item (in the caller's transaction)
+
+        Args:
+            connection: Database connection
+            content_id: Content ID the pages belong to
+            pages: Page texts; empty pages are not stored
+        """
+        cursor = connection.cursor()
+        try:
+            cursor.execute("DELETE FROM Content_Pdf_Pages WHERE Content_ID = %s", (content_id,))
+            rows = [(content_id, number, text) for number, text in enumerate(pages, start=1) if text.strip()]
+            if rows:
+                cursor.executemany("""
+                    INSERT INTO Content_Pdf_Pages (Content_ID, Page_Number, Text)
+                    VALUES (%s, %s, %s)
+                """, rows)
+        finally:
+            cursor.close()
+
+    def get_stats(self) -> Dict:
+        """Get extraction counters of this worker"""
+        self._check_process()
+        with self._lock:
+            return {
+                'max_workers': self.max_workers,
+                'timeout': self.timeout,
+                'max_pages': self.max_pages,
+                'extracted': self._extracted,
+                'cache_hits': self._cache_hits,
+                'timeouts': self._timeouts,
+                'failures': self._failures,
+                'indexed': self._indexed
+            }
+
+
+# Global PDF text extractor instance
+pdf_text_extractor = PdfTextExtractor(
+    max_workers=int(os.getenv('PDF_TEXT_WORKERS', 2)),
+    timeout=float(os.getenv('PDF_TEXT_TIMEOUT', 30)),
+    max_pages=int(os.getenv('PDF_TEXT_MAX_PAGES', 200))
+)
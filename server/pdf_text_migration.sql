@@ -0,0 +1,14 @@
+-- PDF Text Migration Script
+-- Stores the extracted text of each page of a note's or research paper's PDF,
+-- so PDFs are searchable without re-parsing them
+
+CREATE TABLE IF NOT EXISTS Content_Pdf_Pages (
+    Content_ID INT NOT NULL,
+    Page_Number INT NOT NULL,
+    Text MEDIUMTEXT NOT NULL,
+    PRIMARY KEY (Content_ID, Page_Number),
+    FOREIGN KEY (Content_ID) REFERENCES Content(Content_ID) ON DELETE CASCADE
+);
+
+-- Word search over page texts (MATCH ... AGAINST in the notes and research paper listings)
+CREATE FULLTEXT INDEX ft_content_pdf_pages_text ON Content_Pdf_Pages(Text);
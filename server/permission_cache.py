@@ -0,0 +1,140 @@
+"""
+Permission Cache Module for LawFort Application
+
+This module loads the Permissions table once and expands it through the
+permission hierarchy into an in-memory frozenset per Role_ID. Permission
+checks then become a set-membership test with no database access.
+
+The table is reloaded when the cache is invalidated (e.g. by admin role
+changes) or when the configured refresh interval has elapsed.
+"""
+
+import time
+import threading
+import logging
+from typing import Dict, FrozenSet
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Broader permissions and the narrower permissions they include
+PERMISSION_HIERARCHY = {
+    # Admin permissions (role_id = 1) include all
+    'content_create_all': ['content_create_own', 'content_create'],
+    'content_read_all': ['content_read_public', 'content_read'],
+    'content_update_all': ['content_update_own', 'content_update'],
+    'content_delete_all': ['content_delete_own', 'content_delete'],
+    'metrics_view_all': ['metrics_view_own', 'metrics_view'],
+
+    # Editor permissions (role_id = 2) for their own content
+    'content_create_own': ['content_create'],
+    'content_update_own': ['content_update'],
+    'content_delete_own': ['content_delete'],
+    'content_publish_own': ['content_publish'],
+    'metrics_view_own': ['metrics_view'],
+}
+
+
+def expand_permissions(granted) -> FrozenSet[str]:
+    """
+    Expand a set of granted permissions with everything they include
+
+    Args:
+        granted: Permission names assigned to a role
+
+    Returns:
+        frozenset of the granted permissions plus all included permissions
+    """
+    closure = set(granted)
+    pending = list(closure)
+    while pending:
+        permission = pending.pop()
+        for included in PERMISSION_HIERARCHY.get(permission, []):
+            if included not in closure:
+                closure.add(included)
+                pending.append(included)
+    return frozenset(closure)
+
+
+class PermissionCache:
+    """
+    Role_ID -> frozenset of effective permissions, loaded from the Permissions table
+    """
+
+    def __init__(self, connection_pool, refresh_seconds: float = 300.0):
+        """
+        Initialize the permission cache
+
+        Args:
+            connection_pool: MySQL connection pool instance
+            refresh_seconds: Maximum age of the loaded table before it is reloaded
+        """
+        self.connection_pool = connection_pool
+        self.refresh_seconds = refresh_seconds
+        self.version = 0
+        self._role_permissions: Dict[int, FrozenSet[str]] = {}
+        self._loaded_at = None
+        self._loaded_version = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Load the Permissions table and rebuild the per-role closures"""
+        with self._lock:
+            version = self.version
+
+        connection = self.connection_pool.get_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT Role_ID, Permission_Name FROM Permissions")
+            rows = cursor.fetchall()
+            cursor.close()
+        finally:
+            connection.close()
+
+        granted: Dict[int, set] = {}
+        for role_id, permission_name in rows:
+            granted.setdefault(role_id, set()).add(permission_name)
+
+        role_permissions = {role_id: expand_permissions(perms) for role_id, perms in granted.items()}
+
+        with self._lock:
+            self._role_permissions = role_permissions
+            self._loaded_at = time.monotonic()
+            self._loaded_version = version
+
+        logger.info(f"Loaded permission closures for {len(role_permissions)} role(s) (version {version})")
+
+    def invalidate(self):
+        """Bump the version so the table is reloaded on the next lookup"""
+        with self._lock:
+            self.version += 1
+
+    def _is_stale(self) -> bool:
+        with self._lock:
+            if self._loaded_at is None or self._loaded_version != self.version:
+                return True
+            return time.monotonic() - self._loaded_at > self.refresh_seconds
+
+    def get_role_permissions(self, role_id: int) -> FrozenSet[str]:
+        """
+        Get the effective permissions of a role, reloading the table if stale
+
+        Args:
+            role_id: Role_ID to look up
+
+        Returns:
+            frozenset of permission names (empty for unknown roles)
+        """
+        if self._is_stale():
+            try:
+                self.load()
+            except Exception as e:
+                # Keep serving the last loaded closures if the reload fails
+                logger.error(f"Failed to reload permissions: {str(e)}")
+
+        return self._role_permissions.get(role_id, frozenset())
+
+    def has_permission(self, role_id: int, permission_name: str) -> bool:
+        """Check whether a role has a permission, directly or through the hierarchy"""
+        return permission_name in self.get_role_permissions(role_id)
+
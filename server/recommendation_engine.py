@@ -0,0 +1,377 @@
+"""
+Recommendation Engine Module for LawFort Application
+
+Server-side replacement for the browser TF-IDF recommender
+(client/src/services/cosineSimilarityService.ts). Active content is indexed
+as a sparse TF-IDF matrix over title, summary, tags and category; a user's
+profile (practice area keywords, specialization, bio) is vectorized the same
+way and scored against every document with one sparse matrix-vector product.
+
+The raw term counts are persisted under uploads/recommendations so workers
+start without rescanning the Content table. Content create/update/delete
+routes update single rows; the TF-IDF weights are recomputed (vectorized)
+the next time the index is queried.
+"""
+
+import os
+import re
+import json
+import threading
+import logging
+from collections import Counter
+from typing import Dict, List, Optional
+
+import numpy as np
+from scipy import sparse
+
+try:
+    import fcntl
+except ImportError:  # Windows development machines
+    fcntl = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Same stop words as the client-side TextProcessor
+STOP_WORDS = frozenset([
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with',
+    'by', 'from', 'up', 'about', 'into', 'through', 'during', 'before', 'after',
+    'above', 'below', 'between', 'among', 'is', 'are', 'was', 'were', 'be', 'been',
+    'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
+    'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those'
+])
+
+_NON_WORD = re.compile(r'[^\w\s]')
+
+# Weights matching the client-side scoring
+TEXT_WEIGHT = 0.6
+PRACTICE_AREA_WEIGHT = 0.3
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, strip punctuation and drop short words and stop words"""
+    if not text:
+        return []
+    return [word for word in _NON_WORD.sub(' ', text.lower()).split()
+            if len(word) > 2 and word not in STOP_WORDS]
+
+
+def content_document(title: str, summary: Optional[str], tags: Optional[str], category: Optional[str]) -> str:
+    """Text that represents a content item in the index"""
+    return ' '.join(part for part in (title, summary, category, tags) if part)
+
+
+class RecommendationIndex:
+    """
+    Sparse TF-IDF index over active content with cosine top-k queries
+    """
+
+    def __init__(self, index_dir: str):
+        """
+        Initialize the recommendation index
+
+        Args:
+            index_dir: Directory where the index files are persisted
+        """
+        self.index_dir = index_dir
+        self.index_path = os.path.join(index_dir, 'tfidf_counts.npz')
+        self.meta_path = os.path.join(index_dir, 'tfidf_meta.json')
+        self.lock_path = os.path.join(index_dir, 'tfidf.lock')
+
+        self._lock = threading.RLock()
+        self._loaded_mtime = None
+        self._reset()
+
+    def _reset(self):
+        self.vocabulary: Dict[str, int] = {}
+        self.content_ids: List[int] = []
+        self.row_of: Dict[int, int] = {}
+        self.metadata: Dict[int, dict] = {}
+        self.counts = sparse.csr_matrix((0, 0), dtype=np.float32)
+        self._tfidf = None
+        self._idf_vector = None
+        self._categories = None
+        self._content_types = None
+
+    # ----- persistence -----
+
+    def _file_lock(self):
+        os.makedirs(self.index_dir, exist_ok=True)
+        handle = open(self.lock_path, 'a')
+        if fcntl:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        return handle
+
+    def _file_unlock(self, handle):
+        if fcntl:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+        handle.close()
+
+    def _disk_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.meta_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _load_from_disk(self) -> bool:
+        mtime = self._disk_mtime()
+        if mtime is None:
+            return False
+
+        with open(self.meta_path, 'r', encoding='utf-8') as file:
+            meta = json.load(file)
+        counts = sparse.load_npz(self.index_path).tocsr().astype(np.float32)
+
+        self.vocabulary = {term: i for i, term in enumerate(meta['terms'])}
+        self.content_ids = [int(content_id) for content_id in meta['content_ids']]
+        self.row_of = {content_id: row for row, content_id in enumerate(self.content_ids)}
+        self.metadata = {int(content_id): info for content_id, info in meta['metadata'].items()}
+        self.counts = counts
+        self._tfidf = None
+        self._loaded_mtime = mtime
+        return True
+
+    def _save_to_disk(self):
+        os.makedirs(self.index_dir, exist_ok=True)
+        terms = [None] * len(self.vocabulary)
+        for term, column in self.vocabulary.items():
+            terms[column] = term
+
+        # Write to temp files and rename so readers never see a partial index
+        tmp_index = self.index_path + '.tmp.npz'
+        tmp_meta = self.meta_path + '.tmp'
+        sparse.save_npz(tmp_index, self.counts, compressed=True)
+        with open(tmp_meta, 'w', encoding='utf-8') as file:
+            json.dump({
+                'terms': terms,
+                'content_ids': self.content_ids,
+                'metadata': {str(content_id): info for content_id, info in self.metadata.items()}
+            }, file)
+        os.replace(tmp_index, self.index_path)
+        os.replace(tmp_meta, self.meta_path)
+        self._loaded_mtime = self._disk_mtime()
+
+    def _refresh_from_disk(self, locked: bool = False):
+        """
+        Pick up changes persisted by other workers
+
+        Args:
+            locked: The caller already holds the index file lock
+        """
+        mtime = self._disk_mtime()
+        if mtime is None or mtime == self._loaded_mtime:
+            return
+
+        # Read the meta file and the counts under the writers' lock, so both come from the same save
+        handle = None if locked else self._file_lock()
+        try:
+            self._load_from_disk()
+        finally:
+            if handle is not None:
+                self._file_unlock(handle)
+
+    # ----- building and updating -----
+
+    def _count_row(self, document: str):
+        term_counts = Counter(tokenize(document))
+        columns = []
+        values = []
+        for term, count in term_counts.items():
+            column = self.vocabulary.get(term)
+            if column is None:
+                column = len(self.vocabulary)
+                self.vocabulary[term] = column
+            columns.append(column)
+            values.append(count)
+        return columns, values
+
+    def rebuild(self, rows: List[dict]):
+        """
+        Rebuild the whole index
+
+        Args:
+            rows: Dicts with content_id, content_type, title, summary, tags, category
+        """
+        with self._lock:
+            handle = self._file_lock()
+            try:
+                self._reset()
+                indptr = [0]
+                indices = []
+                data = []
+                for row in rows:
+                    columns, values = self._count_row(content_document(
+                        row['title'], row.get('summary'), row.get('tags'), row.get('category')))
+                    indices.extend(columns)
+                    data.extend(values)
+                    indptr.append(len(indices))
+
+                    content_id = int(row['content_id'])
+                    self.row_of[content_id] = len(self.content_ids)
+                    self.content_ids.append(content_id)
+                    self.metadata[content_id] = {
+                        'content_type': row.get('content_type'),
+                        'category': row.get('category')
+                    }
+
+                self.counts = sparse.csr_matrix(
+                    (np.array(data, dtype=np.float32), np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int64)),
+                    shape=(len(self.content_ids), len(self.vocabulary))
+                )
+                self._save_to_disk()
+            finally:
+                self._file_unlock(handle)
+
+        logger.info(f"Built recommendation index: {len(self.content_ids)} documents, {len(self.vocabulary)} terms")
+
+    def upsert(self, content_id: int, content_type: str, title: str, summary: Optional[str],
+               tags: Optional[str], category: Optional[str]):
+        """Add or replace a single content item"""
+        with self._lock:
+            handle = self._file_lock()
+            try:
+                self._refresh_from_disk(locked=True)
+                columns, values = self._count_row(content_document(title, summary, tags, category))
+                new_row = sparse.csr_matrix(
+                    (np.array(values, dtype=np.float32), (np.zeros(len(columns), dtype=np.int32), np.array(columns, dtype=np.int32))),
+                    shape=(1, len(self.vocabulary))
+                )
+
+                counts = self.counts
+                if counts.shape[1] < len(self.vocabulary):
+                    counts = sparse.csr_matrix((counts.data, counts.indices, counts.indptr),
+                                               shape=(counts.shape[0], len(self.vocabulary)))
+
+                row = self.row_of.get(content_id)
+                if row is None:
+                    counts = sparse.vstack([counts, new_row], format='csr')
+                    self.row_of[content_id] = len(self.content_ids)
+                    self.content_ids.append(content_id)
+                else:
+                    counts = sparse.vstack([counts[:row], new_row, counts[row + 1:]], format='csr')
+
+                self.counts = counts
+                self.metadata[content_id] = {'content_type': content_type, 'category': category}
+                self._tfidf = None
+                self._save_to_disk()
+            finally:
+                self._file_unlock(handle)
+
+    def remove(self, content_id: int):
+        """Remove a content item (deleted or no longer active)"""
+        with self._lock:
+            handle = self._file_lock()
+            try:
+                self._refresh_from_disk(locked=True)
+                row = self.row_of.get(content_id)
+                if row is None:
+                    return
+
+                self.counts = sparse.vstack([self.counts[:row], self.counts[row + 1:]], format='csr')
+                del self.content_ids[row]
+                self.row_of = {cid: i for i, cid in enumerate(self.content_ids)}
+                self.metadata.pop(content_id, None)
+                self._tfidf = None
+                self._save_to_disk()
+            finally:
+                self._file_unlock(handle)
+
+    # ----- querying -----
+
+    def is_built(self) -> bool:
+        """True once an index was built or loaded, even if it holds no content"""
+        with self._lock:
+            if self._loaded_mtime is None:
+                self._refresh_from_disk()
+            return self._loaded_mtime is not None
+
+    def _idf(self) -> np.ndarray:
+        document_count = self.counts.shape[0]
+        document_frequency = np.bincount(self.counts.indices, minlength=self.counts.shape[1])
+        return np.log((document_count + 1) / (document_frequency + 1)).astype(np.float32) + 1.0
+
+    def _tfidf_matrix(self):
+        """Row-normalized TF-IDF matrix, recomputed only after the counts changed"""
+        if self._tfidf is None:
+            self._categories = np.array([self.metadata[cid].get('category') or '' for cid in self.content_ids], dtype=object)
+            self._content_types = np.array([self.metadata[cid].get('content_type') or '' for cid in self.content_ids], dtype=object)
+            self._idf_vector = self._idf()
+            tfidf = self.counts.multiply(self._idf_vector.reshape(1, -1)).tocsr()
+            norms = np.sqrt(np.asarray(tfidf.multiply(tfidf).sum(axis=1)).ravel())
+            norms[norms == 0] = 1.0
+            self._tfidf = sparse.diags(1.0 / norms).dot(tfidf).tocsr()
+        return self._tfidf
+
+    def recommend(self, profile_text: str, practice_area: Optional[str] = None, limit: int = 10,
+                  content_type: Optional[str] = None, exclude_ids=None) -> List[dict]:
+        """
+        Top-k content for a user profile
+
+        Args:
+            profile_text: Practice area keywords, specialization and bio of the user
+            practice_area: The user's practice area (boosts matching categories)
+            limit: Number of results
+            content_type: Only return this Content_Type
+            exclude_ids: Content IDs to leave out (e.g. the user's own content)
+
+        Returns:
+            List of dicts with content_id, score, text_similarity and practice_area_match
+        """
+        with self._lock:
+            self._refresh_from_disk()
+            if not self.content_ids:
+                return []
+
+            matrix = self._tfidf_matrix()
+
+            term_counts = Counter(term for term in tokenize(profile_text) if term in self.vocabulary)
+            text_scores = np.zeros(len(self.content_ids), dtype=np.float32)
+            if term_counts:
+                columns = np.array([self.vocabulary[term] for term in term_counts], dtype=np.int32)
+                weights = np.array(list(term_counts.values()), dtype=np.float32) * self._idf_vector[columns]
+                weights /= np.linalg.norm(weights)
+                query = sparse.csr_matrix((weights, (columns, np.zeros(len(columns), dtype=np.int32))),
+                                          shape=(matrix.shape[1], 1))
+                text_scores = np.asarray(matrix.dot(query).todense()).ravel()
+
+            if practice_area:
+                area_match = (self._categories == practice_area).astype(np.float32)
+            else:
+                area_match = np.zeros(len(self.content_ids), dtype=np.float32)
+            scores = text_scores * TEXT_WEIGHT + area_match * PRACTICE_AREA_WEIGHT
+
+            mask = np.ones(len(self.content_ids), dtype=bool)
+            if content_type:
+                mask &= self._content_types == content_type
+            if exclude_ids:
+                mask &= ~np.isin(np.array(self.content_ids), list(exclude_ids))
+            scores = np.where(mask, scores, -np.inf)
+
+            candidates = int(mask.sum())
+            k = min(limit, candidates)
+            if k <= 0:
+                return []
+
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+
+            return [{
+                'content_id': self.content_ids[i],
+                'score': round(float(scores[i]), 4),
+                'text_similarity': round(float(text_scores[i]), 4),
+                'practice_area_match': bool(area_match[i])
+            } for i in top]
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                'documents': len(self.content_ids),
+                'terms': len(self.vocabulary),
+                'nonzeros': int(self.counts.nnz)
+            }
+
+
+# Global recommendation index instance
+recommendation_index = RecommendationIndex(
+    os.getenv('RECOMMENDATION_INDEX_DIR', os.path.join(os.getcwd(), 'uploads', 'recommendations'))
+)
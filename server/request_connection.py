@@ -0,0 +1,104 @@
+"""
+Request-Scoped Database Connection for LawFort Application
+
+Every helper that asks for a database connection while a Flask request is
+being handled (session lookup, permission checks, the route handler itself,
+credit system calls) shares one pooled connection stored on flask.g. The
+connection is returned to the pool in teardown_appcontext.
+
+Helpers keep their existing get/close pattern: close() on the shared
+connection only releases a reference. When the outermost user closes it,
+any transaction left open is rolled back, which matches what returning a
+connection to the pool used to do.
+"""
+
+import logging
+from flask import g, has_app_context
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class RequestConnection:
+    """
+    Reference-counted wrapper around the pooled connection shared by one request
+    """
+
+    def __init__(self, connection):
+        """
+        Initialize the wrapper
+
+        Args:
+            connection: Pooled MySQL connection checked out for the request
+        """
+        self._connection = connection
+        self._references = 0
+
+    def acquire(self) -> 'RequestConnection':
+        self._references += 1
+        return self
+
+    def cursor(self, *args, **kwargs):
+        """
+        Create a cursor on the shared connection
+
+        Cursors are buffered by default so a helper that reads a single row
+        never leaves unread results behind for the next user of the connection.
+        """
+        kwargs.setdefault('buffered', True)
+        return self._connection.cursor(*args, **kwargs)
+
+    def close(self):
+        """Release one reference; roll back leftovers when the last user is done"""
+        if self._references > 0:
+            self._references -= 1
+        if self._references == 0 and self._connection.in_transaction:
+            self._connection.rollback()
+
+    def release(self):
+        """Roll back anything uncommitted and return the connection to the pool"""
+        try:
+            if self._connection.in_transaction:
+                self._connection.rollback()
+        finally:
+            self._connection.close()
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+
+def get_request_connection(connection_pool):
+    """
+    Get the connection shared by the current request
+
+    Outside an application context (startup code, background threads) a
+    plain pooled connection is returned instead.
+
+    Args:
+        connection_pool: MySQL connection pool instance
+
+    Returns:
+        RequestConnection inside an app context, pooled connection otherwise
+    """
+    if not has_app_context():
+        return connection_pool.get_connection()
+
+    request_connection = g.get('db_connection')
+    if request_connection is None:
+        request_connection = RequestConnection(connection_pool.get_connection())
+        g.db_connection = request_connection
+
+    return request_connection.acquire()
+
+
+def init_request_connection(app):
+    """Register the teardown handler that returns the request connection to the pool"""
+
+    @app.teardown_appcontext
+    def release_request_connection(exception=None):
+        request_connection = g.pop('db_connection', None)
+        if request_connection is not None:
+            try:
+                request_connection.release()
+            except Exception as e:
+                logger.error(f"Error releasing request database connection: {str(e)}")
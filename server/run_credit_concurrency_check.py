@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Credit Ledger Concurrency Check
+
+Credit awards used to read Credit_Balance, add the amount in Python and write
+the result back, so two likes on the same editor's content at the same time
+could lose one of the updates. The balance is now changed with a single
+atomic upsert (see CreditSystem._add_credit_transaction).
+
+This check runs N parallel awards for one user, each in its own connection
+and transaction like the like route does, and verifies that the balance grew
+by exactly N awards and matches the ledger. The awards are then reverted, so
+the user's balance and transactions end up as before. Run it against a
+staging database.
+
+Usage:
+    python run_credit_concurrency_check.py --user-id 42               # 50 parallel awards
+    python run_credit_concurrency_check.py --user-id 42 --workers 100
+"""
+
+import os
+import sys
+import threading
+import mysql.connector
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+
+from credit_system import CreditSystem
+
+# Load environment variables
+load_dotenv()
+
+
+def get_connection():
+    """Connect using the same environment variables as the main app"""
+    return mysql.connector.connect(
+        host=os.getenv('DB_HOST', 'localhost'),
+        port=int(os.getenv('DB_PORT', 3306)),
+        user=os.getenv('DB_USER', 'root'),
+        password=os.getenv('DB_PASSWORD', ''),
+        database=os.getenv('DB_NAME', 'lawfort')
+    )
+
+
+def get_balance(connection, user_id: int):
+    """Stored balance and ledger sum of a user"""
+    cursor = connection.cursor(dictionary=True)
+    cursor.execute("""
+        SELECT
+            (SELECT COALESCE(SUM(Credit_Balance), 0) FROM User_Credits WHERE User_ID = %s) as balance,
+            (SELECT COALESCE(SUM(Amount), 0) FROM Credit_Transactions WHERE User_ID = %s) as ledger
+    """, (user_id, user_id))
+    row = cursor.fetchone()
+    connection.commit()
+    cursor.close()
+    return float(row['balance']), float(row['ledger'])
+
+
+def run_parallel_awards(user_id: int, workers: int):
+    """
+    Award CREDIT_PER_LIKE to a user from `workers` threads at once
+
+    Returns:
+        Transaction IDs of the successful awards
+    """
+    # No pool: every award checks out its own connection, like concurrent requests
+    credit_system = CreditSystem(None, get_connection=get_connection)
+    start = threading.Barrier(workers)
+
+    def award(_):
+        start.wait()
+        result = credit_system._add_credit_transaction(
+            user_id=user_id,
+            amount=CreditSystem.CREDIT_PER_LIKE,
+            transaction_type='MANUAL_ADJUSTMENT',
+            description='Credit ledger concurrency check'
+        )
+        if not result['success']:
+            print(f"  Award failed: {result['message']}")
+        return result.get('transaction_id')
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return [transaction_id for transaction_id in executor.map(award, range(workers)) if transaction_id]
+
+
+def revert_awards(connection, user_id: int, transaction_ids):
+    """Remove the check's transactions and their amount from the balance and running totals"""
+    if not transaction_ids:
+        return
+    cursor = connection.cursor()
+    placeholders = ', '.join(['%s'] * len(transaction_ids))
+    cursor.execute(f"DELETE FROM Credit_Transactions WHERE Transaction_ID IN ({placeholders})", transaction_ids)
+    amount = CreditSystem.CREDIT_PER_LIKE * len(transaction_ids)
+    cursor.execute("""
+        UPDATE User_Credits
+        SET Credit_Balance = Credit_Balance - %s,
+            Total_Earned = Total_Earned - %s,
+            Transaction_Count = Transaction_Count - %s
+        WHERE User_ID = %s
+    """, (amount, amount, len(transaction_ids), user_id))
+    connection.commit()
+    cursor.close()
+
+
+if __name__ == "__main__":
+    print("Credit Ledger Concurrency Check")
+    print("=" * 40)
+
+    if '--user-id' not in sys.argv:
+        print("❌ --user-id is required")
+        sys.exit(2)
+    user_id = int(sys.argv[sys.argv.index('--user-id') + 1])
+    workers = int(sys.argv[sys.argv.index('--workers') + 1]) if '--workers' in sys.argv else 50
+
+    connection = get_connection()
+    transaction_ids = []
+    try:
+        balance_before, ledger_before = get_balance(connection, user_id)
+        transaction_ids = run_parallel_awards(user_id, workers)
+        balance_after, ledger_after = get_balance(connection, user_id)
+
+        expected = balance_before + CreditSystem.CREDIT_PER_LIKE * len(transaction_ids)
+        print(f"  {len(transaction_ids)}/{workers} awards committed")
+        print(f"  Balance: {balance_before} -> {balance_after} (expected {expected})")
+        print(f"  Ledger:  {ledger_before} -> {ledger_after}")
+
+        ok = len(transaction_ids) == workers and balance_after == expected \
+            and balance_after - balance_before == ledger_after - ledger_before
+        if ok:
+            print("✅ No lost updates")
+        else:
+            print("❌ Lost or failed updates")
+    except mysql.connector.Error as e:
+        print(f"❌ Database error: {e}")
+        ok = False
+    finally:
+        revert_awards(connection, user_id, transaction_ids)
+        connection.close()
+
+    sys.exit(0 if ok else 1)
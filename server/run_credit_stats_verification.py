@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Credit Statistics Verification Job
+
+/api/credits/statistics reads running totals (Total_Earned, Total_Spent,
+Likes_Received, Likes_Removed, Transaction_Count) kept on User_Credits by the
+ledger write path instead of aggregating Credit_Transactions on every request.
+Likes are counted from the transaction amount (CREDIT_PER_LIKE each), since a
+batched settlement row covers several likes.
+This job recomputes them from the ledger, reports any drift and fixes the
+totals. A balance that differs from the ledger sum is only reported, never
+changed: that needs a MANUAL_ADJUSTMENT transaction after investigation.
+Run it periodically (e.g. from cron) or after manual data fixes.
+
+Usage:
+    python run_credit_stats_verification.py            # report and fix drift
+    python run_credit_stats_verification.py --dry-run  # only report drift
+    python run_credit_stats_verification.py --migrate  # apply the credit ledger migrations first
+"""
+
+import os
+import sys
+import mysql.connector
+from dotenv import load_dotenv
+
+from credit_system import CreditSystem
+
+# Load environment variables
+load_dotenv()
+
+MIGRATIONS = ['credit_stats_migration.sql', 'credit_transactions_keyset_migration.sql']
+
+STAT_COLUMNS = ['Total_Earned', 'Total_Spent', 'Likes_Received', 'Likes_Removed', 'Transaction_Count']
+
+
+def get_connection():
+    """Connect using the same environment variables as the main app"""
+    return mysql.connector.connect(
+        host=os.getenv('DB_HOST', 'localhost'),
+        port=int(os.getenv('DB_PORT', 3306)),
+        user=os.getenv('DB_USER', 'root'),
+        password=os.getenv('DB_PASSWORD', ''),
+        database=os.getenv('DB_NAME', 'lawfort')
+    )
+
+
+def run_migration(connection, migration_file: str):
+    """Apply a migration file, skipping objects that already exist"""
+    cursor = connection.cursor()
+    with open(migration_file, 'r', encoding='utf-8') as file:
+        sql_content = file.read()
+
+    # Drop comment lines, then split into statements
+    sql_content = '\n'.join(line for line in sql_content.splitlines() if not line.strip().startswith('--'))
+    statements = [stmt.strip() for stmt in sql_content.split(';') if stmt.strip()]
+
+    for i, statement in enumerate(statements):
+        try:
+            cursor.execute(statement)
+            print(f"Executed statement {i+1}/{len(statements)}")
+        except mysql.connector.Error as e:
+            if any(marker in str(e).lower() for marker in ("duplicate key name", "duplicate column name", "already exists")):
+                print(f"Statement {i+1} skipped (already exists): {e}")
+            else:
+                raise
+
+    connection.commit()
+    cursor.close()
+
+
+def verify_credit_stats(connection, dry_run: bool = False):
+    """
+    Compare the User_Credits running totals and balances with the ledger
+
+    Args:
+        connection: MySQL connection
+        dry_run: Only report drift without updating the totals
+
+    Returns:
+        (rows with drifted totals, rows with a drifted balance)
+    """
+    cursor = connection.cursor(dictionary=True)
+
+    # Ledger rows and totals commit together, so one consistent snapshot of both shows real drift only
+    cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+    cursor.execute("START TRANSACTION WITH CONSISTENT SNAPSHOT")
+    cursor.execute("""
+        SELECT uc.User_ID as user_id, uc.Credit_Balance as balance,
+               uc.Total_Earned, uc.Total_Spent, uc.Likes_Received, uc.Likes_Removed, uc.Transaction_Count,
+               COALESCE(ct.ledger_balance, 0) as ledger_balance,
+               COALESCE(ct.total_earned, 0) as total_earned,
+               COALESCE(ct.total_spent, 0) as total_spent,
+               COALESCE(ct.likes_received, 0) as likes_received,
+               COALESCE(ct.likes_removed, 0) as likes_removed,
+               COALESCE(ct.transaction_count, 0) as transaction_count
+        FROM User_Credits uc
+        LEFT JOIN (
+            SELECT User_ID,
+                   SUM(Amount) as ledger_balance,
+                   SUM(CASE WHEN Amount > 0 THEN Amount ELSE 0 END) as total_earned,
+                   SUM(CASE WHEN Amount < 0 THEN ABS(Amount) ELSE 0 END) as total_spent,
+                   SUM(CASE WHEN Transaction_Type = 'LIKE_RECEIVED' THEN ROUND(ABS(Amount) / %s) ELSE 0 END) as likes_received,
+                   SUM(CASE WHEN Transaction_Type = 'LIKE_REMOVED' THEN ROUND(ABS(Amount) / %s) ELSE 0 END) as likes_removed,
+                   COUNT(*) as transaction_count
+            FROM Credit_Transactions
+            GROUP BY User_ID
+        ) ct ON uc.User_ID = ct.User_ID
+    """, (CreditSystem.CREDIT_PER_LIKE, CreditSystem.CREDIT_PER_LIKE))
+    rows = cursor.fetchall()
+
+    drifted = []
+    balance_drifted = []
+    for row in rows:
+        changes = [f"{column} {row[column]} -> {row[column.lower()]}"
+                   for column in STAT_COLUMNS if row[column] != row[column.lower()]]
+        if changes:
+            drifted.append(row)
+            print(f"  User {row['user_id']}: {', '.join(changes)}")
+        if row['balance'] != row['ledger_balance']:
+            balance_drifted.append(row)
+            print(f"  User {row['user_id']}: balance {row['balance']}, ledger sum {row['ledger_balance']}")
+
+    if drifted and not dry_run:
+        # Apply the difference rather than the snapshot value, so writes since the snapshot are kept
+        assignments = ', '.join(f"{column} = {column} + %s" for column in STAT_COLUMNS)
+        cursor.executemany(f"""
+            UPDATE User_Credits
+            SET {assignments}
+            WHERE User_ID = %s
+        """, [[row[column.lower()] - row[column] for column in STAT_COLUMNS] + [row['user_id']] for row in drifted])
+
+    connection.commit()
+    cursor.close()
+    return drifted, balance_drifted
+
+
+if __name__ == "__main__":
+    print("Credit Statistics Verification")
+    print("=" * 40)
+
+    dry_run = '--dry-run' in sys.argv
+    connection = get_connection()
+    try:
+        if '--migrate' in sys.argv:
+            for migration_file in MIGRATIONS:
+                print(f"Applying {migration_file}")
+                run_migration(connection, migration_file)
+
+        drifted, balance_drifted = verify_credit_stats(connection, dry_run=dry_run)
+        if not drifted:
+            print("✅ Credit statistics match the ledger")
+        elif dry_run:
+            print(f"⚠️  {len(drifted)} user(s) have drifted credit statistics (dry run, nothing changed)")
+        else:
+            print(f"✅ Fixed credit statistics for {len(drifted)} user(s)")
+
+        if balance_drifted:
+            print(f"❌ {len(balance_drifted)} balance(s) differ from the ledger sum (not changed)")
+            sys.exit(1)
+    except mysql.connector.Error as e:
+        print(f"❌ Database error: {e}")
+        connection.rollback()
+        sys.exit(1)
+    finally:
+        connection.close()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Content Metrics Reconciliation Job
+
+Blog listings read comment counts from Content_Metrics.Comments_Count instead
+of counting Content_Comments per row. The comment write path keeps the counter
+up to date; this job re-derives it from the comments table, reports any drift
+and fixes it. Run it periodically (e.g. from cron) or after manual data fixes.
+
+Usage:
+    python run_metrics_reconciliation.py            # report and fix drift
+    python run_metrics_reconciliation.py --dry-run  # only report drift
+    python run_metrics_reconciliation.py --migrate  # apply content_metrics_migration.sql first
+"""
+
+import os
+import sys
+import mysql.connector
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+
+def get_connection():
+    """Connect using the same environment variables as the main app"""
+    return mysql.connector.connect(
+        host=os.getenv('DB_HOST', 'localhost'),
+        port=int(os.getenv('DB_PORT', 3306)),
+        user=os.getenv('DB_USER', 'root'),
+        password=os.getenv('DB_PASSWORD', ''),
+        database=os.getenv('DB_NAME', 'lawfort')
+    )
+
+
+def run_migration(connection):
+    """Apply content_metrics_migration.sql, skipping objects that already exist"""
+    cursor = connection.cursor()
+    with open('content_metrics_migration.sql', 'r', encoding='utf-8') as file:
+        sql_content = file.read()
+
+    # Drop comment lines, then split into statements
+    sql_content = '\n'.join(line for line in sql_content.splitlines() if not line.strip().startswith('--'))
+    statements = [stmt.strip() for stmt in sql_content.split(';') if stmt.strip()]
+
+    for i, statement in enumerate(statements):
+        try:
+            cursor.execute(statement)
+            print(f"Executed statement {i+1}/{len(statements)}")
+        except mysql.connector.Error as e:
+            if "duplicate key name" in str(e).lower() or "already exists" in str(e).lower():
+                print(f"Statement {i+1} skipped (already exists): {e}")
+            else:
+                raise
+
+    connection.commit()
+    cursor.close()
+
+
+def reconcile_comment_counts(connection, dry_run: bool = False):
+    """
+    Compare Content_Metrics.Comments_Count with the number of active comments
+
+    Args:
+        connection: MySQL connection
+        dry_run: Only report drift without updating the counters
+
+    Returns:
+        List of drifted rows (content_id, stored, actual)
+    """
+    cursor = connection.cursor(dictionary=True)
+
+    # Content without a metrics row would show 0 comments in listings
+    if not dry_run:
+        cursor.execute("""
+            INSERT INTO Content_Metrics (Content_ID)
+            SELECT c.Content_ID
+            FROM Content c
+            LEFT JOIN Content_Metrics cm ON c.Content_ID = cm.Content_ID
+            WHERE cm.Content_ID IS NULL
+        """)
+        if cursor.rowcount:
+            print(f"Created {cursor.rowcount} missing Content_Metrics row(s)")
+
+    cursor.execute("""
+        SELECT cm.Content_ID as content_id,
+               cm.Comments_Count as stored,
+               COALESCE(cc.active_comments, 0) as actual
+        FROM Content_Metrics cm
+        LEFT JOIN (
+            SELECT Content_ID, COUNT(*) as active_comments
+            FROM Content_Comments
+            WHERE Status = 'Active'
+            GROUP BY Content_ID
+        ) cc ON cm.Content_ID = cc.Content_ID
+        WHERE cm.Comments_Count <> COALESCE(cc.active_comments, 0)
+    """)
+    drifted = cursor.fetchall()
+
+    for row in drifted:
+        print(f"  Content {row['content_id']}: stored {row['stored']}, actual {row['actual']}")
+
+    if drifted and not dry_run:
+        cursor.executemany("""
+            UPDATE Content_Metrics
+            SET Comments_Count = %s
+            WHERE Content_ID = %s
+        """, [(row['actual'], row['content_id']) for row in drifted])
+
+    connection.commit()
+    cursor.close()
+    return drifted
+
+
+if __name__ == "__main__":
+    print("Content Metrics Reconciliation")
+    print("=" * 40)
+
+    dry_run = '--dry-run' in sys.argv
+    connection = get_connection()
+    try:
+        if '--migrate' in sys.argv:
+            run_migration(connection)
+
+        drifted = reconcile_comment_counts(connection, dry_run=dry_run)
+        if not drifted:
+            print("✅ Comment counts are consistent")
+        elif dry_run:
+            print(f"⚠️  {len(drifted)} content item(s) have drifted comment counts (dry run, nothing changed)")
+        else:
+            print(f"✅ Fixed comment counts for {len(drifted)} content item(s)")
+    except mysql.connector.Error as e:
+        print(f"❌ Database error: {e}")
+        connection.rollback()
+        sys.exit(1)
+    finally:
+        connection.close()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+PDF Text Index Backfill Job
+
+New PDF notes and research papers get their page texts indexed in
+Content_Pdf_Pages when they are saved (see pdf_text.py). This job indexes
+the PDFs of content saved before that, or whose background indexing was lost
+(e.g. the worker restarted), so their contents are searchable.
+
+Usage:
+    python run_pdf_text_index.py            # index PDFs without stored pages
+    python run_pdf_text_index.py --all      # re-index every PDF
+    python run_pdf_text_index.py --migrate  # apply pdf_text_migration.sql first
+"""
+
+import os
+import sys
+import mysql.connector
+from dotenv import load_dotenv
+
+from pdf_text import pdf_text_extractor, PdfTextError
+
+# Load environment variables
+load_dotenv()
+
+UPLOAD_FOLDERS = {
+    'Note': os.path.join(os.getcwd(), 'uploads', 'notes'),
+    'Research_Paper': os.path.join(os.getcwd(), 'uploads', 'research_papers'),
+}
+
+
+def get_connection():
+    """Connect using the same environment variables as the main app"""
+    return mysql.connector.connect(
+        host=os.getenv('DB_HOST', 'localhost'),
+        port=int(os.getenv('DB_PORT', 3306)),
+        user=os.getenv('DB_USER', 'root'),
+        password=os.getenv('DB_PASSWORD', ''),
+        database=os.getenv('DB_NAME', 'lawfort')
+    )
+
+
+def run_migration(connection):
+    """Apply pdf_text_migration.sql, skipping objects that already exist"""
+    cursor = connection.cursor()
+    with open('pdf_text_migration.sql', 'r', encoding='utf-8') as file:
+        sql_content = file.read()
+
+    # Drop comment lines, then split into statements
+    sql_content = '\n'.join(line for line in sql_content.splitlines() if not line.strip().startswith('--'))
+    statements = [stmt.strip() for stmt in sql_content.split(';') if stmt.strip()]
+
+    for i, statement in enumerate(statements):
+        try:
+            cursor.execute(statement)
+            print(f"Executed statement {i+1}/{len(statements)}")
+        except mysql.connector.Error as e:
+            if "duplicate key name" in str(e).lower() or "already exists" in str(e).lower():
+                print(f"Statement {i+1} skipped (already exists): {e}")
+            else:
+                raise
+
+    connection.commit()
+    cursor.close()
+
+
+def find_pdf_content(connection, reindex: bool = False):
+    """PDF notes and research papers, by default only those without stored pages"""
+    cursor = connection.cursor(dictionary=True)
+    cursor.execute(f"""
+        SELECT c.Content_ID as content_id, c.Content_Type as content_type,
+               COALESCE(n.PDF_File_Path, c.Featured_Image) as pdf_url
+        FROM Content c
+        LEFT JOIN Notes n ON c.Content_ID = n.Content_ID
+        WHERE ((c.Content_Type = 'Note' AND n.Content_Type = 'pdf' AND n.PDF_File_Path <> '')
+               OR (c.Content_Type = 'Research_Paper' AND c.Featured_Image <> ''))
+        {'' if reindex else 'AND NOT EXISTS (SELECT 1 FROM Content_Pdf_Pages p WHERE p.Content_ID = c.Content_ID)'}
+        ORDER BY c.Content_ID
+    """)
+    rows = cursor.fetchall()
+    cursor.close()
+    return rows
+
+
+def index_pdf_content(connection, rows):
+    """Extract and store the pages of each PDF; returns (indexed, failed)"""
+    indexed = 0
+    failed = 0
+    for row in rows:
+        pdf_path = os.path.join(UPLOAD_FOLDERS[row['content_type']], row['pdf_url'].split('/')[-1])
+        try:
+            pages = pdf_text_extractor.extract(pdf_path)
+        except (PdfTextError, OSError) as e:
+            print(f"  Content {row['content_id']}: {e}")
+            failed += 1
+            continue
+
+        pdf_text_extractor.store_pages(connection, row['content_id'], pages)
+        connection.commit()
+        indexed += 1
+        print(f"  Content {row['content_id']}: {len(pages)} page(s)")
+    return indexed, failed
+
+
+if __name__ == "__main__":
+    print("PDF Text Index Backfill")
+    print("=" * 40)
+
+    connection = get_connection()
+    try:
+        if '--migrate' in sys.argv:
+            run_migration(connection)
+
+        rows = find_pdf_content(connection, reindex='--all' in sys.argv)
+        indexed, failed = index_pdf_content(connection, rows)
+        if failed:
+            print(f"⚠️  Indexed {indexed} PDF(s), {failed} could not be read")
+        else:
+            print(f"✅ Indexed {indexed} PDF(s)")
+    except mysql.connector.Error as e:
+        print(f"❌ Database error: {e}")
+        connection.rollback()
+        sys.exit(1)
+    finally:
+        connection.close()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Uploaded PDF Deduplication Job
+
+Uploads are stored once per SHA-256 content hash (see upload_store.py).
+This job moves PDFs uploaded before that into the object store and replaces
+each copy with a link to its object, so repeated uploads of the same file
+stop taking disk space. File names and URLs stay the same.
+
+Usage:
+    python run_upload_dedup.py            # deduplicate existing uploads
+    python run_upload_dedup.py --dry-run  # only report duplicates
+"""
+
+import os
+import sys
+from collections import defaultdict
+
+from upload_store import upload_store, file_sha256
+
+UPLOAD_FOLDERS = [
+    os.path.join(os.getcwd(), 'uploads', 'research_papers'),
+    os.path.join(os.getcwd(), 'uploads', 'notes'),
+    os.path.join(os.getcwd(), 'uploads', 'resumes'),
+]
+
+
+def find_uploads():
+    """Group existing uploaded PDFs by content hash"""
+    groups = defaultdict(list)
+    for folder in UPLOAD_FOLDERS:
+        if not os.path.isdir(folder):
+            continue
+        for name in sorted(os.listdir(folder)):
+            path = os.path.join(folder, name)
+            if name.lower().endswith('.pdf') and os.path.isfile(path):
+                groups[file_sha256(path)].append(path)
+    return groups
+
+
+def dedup_uploads(groups, dry_run: bool = False):
+    """Link every upload to its object; returns (uploads linked, bytes freed)"""
+    linked = 0
+    freed = 0
+    for sha256, paths in groups.items():
+        size = os.path.getsize(paths[0])
+        if len(paths) > 1:
+            print(f"  {sha256[:12]}: {len(paths)} copies of {os.path.basename(paths[0])} ({size} bytes)")
+
+        for path in paths:
+            if dry_run:
+                continue
+            object_path = upload_store.object_path(sha256)
+            if os.path.exists(object_path) and os.path.samefile(path, object_path):
+                continue
+            with open(path, 'rb') as file:
+                stored = upload_store.save(file, os.path.dirname(path), os.path.basename(path))
+            linked += 1
+            if stored.deduplicated:
+                freed += size
+    return linked, freed
+
+
+if __name__ == "__main__":
+    print("Uploaded PDF Deduplication")
+    print("=" * 40)
+
+    dry_run = '--dry-run' in sys.argv
+    groups = find_uploads()
+    duplicates = sum(len(paths) - 1 for paths in groups.values())
+
+    linked, freed = dedup_uploads(groups, dry_run=dry_run)
+    if dry_run:
+        print(f"⚠️  {duplicates} duplicate upload(s) across {len(groups)} distinct PDF(s) (dry run, nothing changed)")
+    elif not linked:
+        print(f"✅ {len(groups)} distinct PDF(s) already stored by content hash")
+    else:
+        print(f"✅ Linked {linked} upload(s) to {len(groups)} stored PDF(s), freed {freed} bytes")
@@ -0,0 +1,565 @@
+"""
+Search Index Module for LawFort Application
+
+The notes, blog, research paper, job and internship listings search with
+leading-wildcard LIKE '%...%' filters, which scan the whole table. This
+module keeps an inverted index over the searchable content instead:
+
+- text is tokenized per field (title, summary, content, tags, category,
+  company, location, authors) and each field's term frequency is weighted
+  by FIELD_BOOSTS before BM25 scoring
+- the last query word also matches as a prefix (search-as-you-type)
+- postings are stored impact-ordered (precomputed BM25 term weight, best
+  documents first) and at most MAX_POSTINGS_PER_TERM are read per term,
+  so the work per query depends on the number of query terms, not on the
+  number of documents
+
+The index is a base segment of numpy arrays under uploads/search, opened
+with mmap so every gunicorn worker shares one copy through the page cache,
+plus an append-only delta log. Content create/update/delete routes append to
+the delta log; every worker replays new log entries before a query. Once the
+log has compact_threshold entries the base segment is rebuilt from the
+database in the background and the log starts over.
+"""
+
+import os
+import re
+import json
+import math
+import shutil
+import threading
+import logging
+from collections import Counter, defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from recommendation_engine import STOP_WORDS
+
+try:
+    import fcntl
+except ImportError:  # Windows development machines
+    fcntl = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPES = ['Blog_Post', 'Note', 'Research_Paper', 'Job', 'Internship']
+
+# Term frequency multiplier per field
+FIELD_BOOSTS = {
+    'title': 3.0,
+    'tags': 2.0,
+    'category': 2.0,
+    'company': 2.0,
+    'authors': 1.5,
+    'summary': 1.5,
+    'location': 1.0,
+    'content': 1.0,
+}
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+MAX_TERM_LENGTH = 32
+MIN_PREFIX_LENGTH = 2
+MAX_PREFIX_TERMS = 30
+# Completions of the last query word count less than the word itself
+PREFIX_WEIGHT = 0.7
+MAX_POSTINGS_PER_TERM = 2000
+
+_HTML_TAG = re.compile(r'<[^>]+>')
+_WORD = re.compile(r'\w+')
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase words without markup, stop words and single characters"""
+    if not text:
+        return []
+    return [word for word in _WORD.findall(_HTML_TAG.sub(' ', text).lower())
+            if 1 < len(word) <= MAX_TERM_LENGTH and word not in STOP_WORDS]
+
+
+def weighted_terms(fields: Dict[str, Optional[str]]) -> Tuple[Dict[str, float], float]:
+    """
+    Boosted term frequencies of a document
+
+    Args:
+        fields: Field name -> text
+
+    Returns:
+        (term -> boosted frequency, boosted document length)
+    """
+    frequencies: Dict[str, float] = defaultdict(float)
+    length = 0.0
+    for field, text in fields.items():
+        boost = FIELD_BOOSTS.get(field, 1.0)
+        for term, count in Counter(tokenize(text)).items():
+            frequencies[term] += boost * count
+            length += boost * count
+    return frequencies, length
+
+
+def term_impact(frequency: float, length: float, average_length: float) -> float:
+    """BM25 term frequency component of a (term, document) pair"""
+    norm = K1 * (1 - B + B * length / average_length) if average_length else K1
+    return frequency * (K1 + 1) / (frequency + norm)
+
+
+class _Segment:
+    """Immutable, memory-mapped base segment"""
+
+    ARRAYS = ('terms', 'offsets', 'postings_doc', 'postings_impact', 'doc_ids', 'doc_types')
+
+    def __init__(self, path: Optional[str] = None):
+        if path is None:
+            self.terms = np.array([], dtype='<U1')
+            self.offsets = np.zeros(1, dtype=np.int64)
+            self.postings_doc = np.array([], dtype=np.int32)
+            self.postings_impact = np.array([], dtype=np.float32)
+            self.doc_ids = np.array([], dtype=np.int32)
+            self.doc_types = np.array([], dtype=np.int8)
+            self.average_length = 0.0
+            return
+
+        for name in self.ARRAYS:
+            setattr(self, name, np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r'))
+        with open(os.path.join(path, 'meta.json'), 'r', encoding='utf-8') as file:
+            self.average_length = json.load(file)['average_length']
+
+    @property
+    def document_count(self) -> int:
+        return len(self.doc_ids)
+
+    def term_range(self, term: str) -> Optional[Tuple[int, int]]:
+        position = int(np.searchsorted(self.terms, term))
+        if position < len(self.terms) and self.terms[position] == term:
+            return int(self.offsets[position]), int(self.offsets[position + 1])
+        return None
+
+    def prefix_terms(self, prefix: str) -> List[str]:
+        """Most frequent indexed terms starting with prefix"""
+        low = int(np.searchsorted(self.terms, prefix, side='left'))
+        high = int(np.searchsorted(self.terms, prefix + '\uffff', side='left'))
+        if high <= low:
+            return []
+        frequencies = np.diff(self.offsets[low:high + 1])
+        if high - low > MAX_PREFIX_TERMS:
+            top = np.argpartition(-frequencies, MAX_PREFIX_TERMS - 1)[:MAX_PREFIX_TERMS]
+        else:
+            top = np.arange(high - low)
+        return [str(self.terms[low + i]) for i in top]
+
+    @staticmethod
+    def write(path: str, documents: Iterable[Tuple[int, str, Dict[str, float], float]]):
+        """
+        Build a segment
+
+        Args:
+            path: Directory to write the arrays to
+            documents: (content_id, content_type, term frequencies, length) per document
+        """
+        doc_ids = []
+        doc_types = []
+        lengths = []
+        frequencies_of = []
+        for content_id, content_type, frequencies, length in documents:
+            doc_ids.append(content_id)
+            doc_types.append(CONTENT_TYPES.index(content_type))
+            lengths.append(length)
+            frequencies_of.append(frequencies)
+
+        average_length = float(np.mean(lengths)) if lengths else 0.0
+        postings: Dict[str, List[Tuple[float, int]]] = defaultdict(list)
+        for doc, frequencies in enumerate(frequencies_of):
+            for term, frequency in frequencies.items():
+                postings[term].append((term_impact(frequency, lengths[doc], average_length), doc))
+
+        terms = sorted(postings)
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        postings_doc = []
+        postings_impact = []
+        for i, term in enumerate(terms):
+            # Best documents first, so a query can stop after MAX_POSTINGS_PER_TERM
+            ordered = sorted(postings[term], reverse=True)
+            postings_impact.extend(impact for impact, _ in ordered)
+            postings_doc.extend(doc for _, doc in ordered)
+            offsets[i + 1] = len(postings_doc)
+
+        os.makedirs(path, exist_ok=True)
+        arrays = {
+            'terms': np.array(terms, dtype=f'<U{max([len(term) for term in terms] + [1])}'),
+            'offsets': offsets,
+            'postings_doc': np.array(postings_doc, dtype=np.int32),
+            'postings_impact': np.array(postings_impact, dtype=np.float32),
+            'doc_ids': np.array(doc_ids, dtype=np.int32),
+            'doc_types': np.array(doc_types, dtype=np.int8),
+        }
+        for name, array in arrays.items():
+            np.save(os.path.join(path, f"{name}.npy"), array)
+        with open(os.path.join(path, 'meta.json'), 'w', encoding='utf-8') as file:
+            json.dump({'average_length': average_length, 'documents': len(doc_ids), 'terms': len(terms)}, file)
+
+
+class SearchIndex:
+    """
+    BM25 inverted index: memory-mapped base segment plus a replayed delta log
+    """
+
+    def __init__(self, index_dir: str, compact_threshold: int = 500):
+        """
+        Initialize the search index
+
+        Args:
+            index_dir: Directory where the index files are persisted
+            compact_threshold: Delta log entries that trigger a rebuild of the base segment
+        """
+        self.index_dir = index_dir
+        self.compact_threshold = compact_threshold
+        self.current_path = os.path.join(index_dir, 'CURRENT')
+        self.lock_path = os.path.join(index_dir, 'search.lock')
+        self.compact_lock_path = os.path.join(index_dir, 'compact.lock')
+
+        self._lock = threading.RLock()
+        self._compacting = False
+        self._generation = None
+        self._current_mtime = None
+        self._segment = _Segment()
+        self._reset_delta()
+
+    def _reset_delta(self):
+        # content_id -> (type code, term -> impact) for upserts, None for removals
+        self._delta: Dict[int, Optional[Tuple[int, Dict[str, float]]]] = {}
+        self._delta_offset = 0
+        self._delta_entries = 0
+        self._overridden = np.array([], dtype=np.int32)
+
+    # ----- persistence -----
+
+    def _file_lock(self, path: str, blocking: bool = True):
+        os.makedirs(self.index_dir, exist_ok=True)
+        handle = open(path, 'a')
+        if fcntl:
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                handle.close()
+                return None
+        return handle
+
+    def _file_unlock(self, handle):
+        if fcntl:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+        handle.close()
+
+    def _segment_path(self, generation: int) -> str:
+        return os.path.join(self.index_dir, f"base-{generation}")
+
+    def _delta_path(self, generation: int) -> str:
+        return os.path.join(self.index_dir, f"delta-{generation}.jsonl")
+
+    def _read_generation(self) -> Optional[int]:
+        try:
+            with open(self.current_path, 'r', encoding='utf-8') as file:
+                return int(file.read().strip())
+        except (OSError, ValueError):
+            return None
+
+    def _refresh(self):
+        """Load a new base segment and replay delta entries written by any worker"""
+        try:
+            mtime = os.stat(self.current_path).st_mtime_ns
+        except OSError:
+            return
+
+        if mtime != self._current_mtime:
+            generation = self._read_generation()
+            if generation is not None and generation != self._generation:
+                self._segment = _Segment(self._segment_path(generation))
+                self._generation = generation
+                self._reset_delta()
+            self._current_mtime = mtime
+
+        if self._generation is None:
+            return
+        delta_path = self._delta_path(self._generation)
+        try:
+            size = os.path.getsize(delta_path)
+        except OSError:
+            return
+        if size <= self._delta_offset:
+            return
+
+        with open(delta_path, 'rb') as file:
+            file.seek(self._delta_offset)
+            data = file.read(size - self._delta_offset)
+        # Only replay complete lines; a write in progress is picked up next time
+        complete = data.rfind(b'\n') + 1
+        for line in data[:complete].splitlines():
+            if line.strip():
+                self._apply(json.loads(line))
+        self._delta_offset += complete
+        self._overridden = np.array(sorted(self._delta), dtype=np.int32)
+
+    def _apply(self, entry: dict):
+        content_id = int(entry['content_id'])
+        self._delta_entries += 1
+        if entry['op'] == 'remove':
+            self._delta[content_id] = None
+            return
+
+        frequencies, length = weighted_terms(entry['fields'])
+        average_length = self._segment.average_length or length or 1.0
+        impacts = {term: term_impact(frequency, length, average_length) for term, frequency in frequencies.items()}
+        self._delta[content_id] = (CONTENT_TYPES.index(entry['content_type']), impacts)
+
+    def _append(self, entry: dict) -> bool:
+        with self._lock:
+            handle = self._file_lock(self.lock_path)
+            try:
+                self._refresh()
+                if self._generation is None:
+                    # Nothing built yet; ensure_search_index() builds from the database
+                    return False
+                with open(self._delta_path(self._generation), 'a', encoding='utf-8') as file:
+                    file.write(json.dumps(entry) + '\n')
+                self._refresh()
+                return self._delta_entries >= self.compact_threshold
+            finally:
+                self._file_unlock(handle)
+
+    # ----- updating -----
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            self._refresh()
+            return self._generation is None
+
+    def upsert(self, content_id: int, content_type: str, fields: Dict[str, Optional[str]]) -> bool:
+        """
+        Add or replace a content item
+
+        Args:
+            content_id: Content ID
+            content_type: One of CONTENT_TYPES
+            fields: Field name (see FIELD_BOOSTS) -> text
+
+        Returns:
+            True when the delta log is due for compaction
+        """
+        return self._append({'op': 'upsert', 'content_id': content_id, 'content_type': content_type,
+                             'fields': {field: text for field, text in fields.items() if text}})
+
+    def remove(self, content_id: int) -> bool:
+        """
+        Remove a content item (deleted or no longer visible)
+
+        Returns:
+            True when the delta log is due for compaction
+        """
+        return self._append({'op': 'remove', 'content_id': content_id})
+
+    def rebuild(self, load_rows: Callable[[], Iterable[dict]]) -> bool:
+        """
+        Build a new base segment and start a new delta log
+
+        Entries appended to the log while the rows are loaded are carried
+        over to the new log, so no update is lost.
+
+        Args:
+            load_rows: Returns dicts with content_id, content_type and the FIELD_BOOSTS fields
+
+        Returns:
+            False if another rebuild is already running
+        """
+        compact_handle = self._file_lock(self.compact_lock_path, blocking=False)
+        if compact_handle is None:
+            return False
+
+        try:
+            with self._lock:
+                handle = self._file_lock(self.lock_path)
+                try:
+                    self._refresh()
+                    generation = self._generation
+                    delta_offset = self._delta_offset
+                finally:
+                    self._file_unlock(handle)
+
+            # The expensive part runs without holding the index lock
+            new_generation = (generation or 0) + 1
+            documents = []
+            for row in load_rows():
+                frequencies, length = weighted_terms({field: row.get(field) for field in FIELD_BOOSTS})
+                documents.append((int(row['content_id']), row['content_type'], frequencies, length))
+            new_path = self._segment_path(new_generation)
+            shutil.rmtree(new_path, ignore_errors=True)
+            _Segment.write(new_path, documents)
+
+            with self._lock:
+                handle = self._file_lock(self.lock_path)
+                try:
+                    carried = b''
+                    if generation is not None:
+                        with open(self._delta_path(generation), 'rb') as file:
+                            file.seek(delta_offset)
+                            carried = file.read()
+                        carried = carried[:carried.rfind(b'\n') + 1]
+                    with open(self._delta_path(new_generation), 'wb') as file:
+                        file.write(carried)
+
+                    temp_path = self.current_path + '.tmp'
+                    with open(temp_path, 'w', encoding='utf-8') as file:
+                        file.write(str(new_generation))
+                    os.replace(temp_path, self.current_path)
+                    self._refresh()
+                finally:
+                    self._file_unlock(handle)
+
+            if generation is not None:
+                # Workers that still map the old arrays keep them until they refresh (POSIX unlink semantics)
+                shutil.rmtree(self._segment_path(generation), ignore_errors=True)
+                try:
+                    os.remove(self._delta_path(generation))
+                except OSError:
+                    pass
+
+            logger.info(f"Built search index generation {new_generation}: {len(documents)} documents")
+            return True
+        finally:
+            self._file_unlock(compact_handle)
+
+    def compact_in_background(self, load_rows: Callable[[], Iterable[dict]]):
+        """Rebuild the base segment from a background thread (at most one per worker)"""
+        with self._lock:
+            if self._compacting:
+                return
+            self._compacting = True
+
+        def run():
+            try:
+                self.rebuild(load_rows)
+            except Exception as e:
+                logger.error(f"Search index compaction failed: {str(e)}")
+            finally:
+                with self._lock:
+                    self._compacting = False
+
+        threading.Thread(target=run, name='search-index-compact', daemon=True).start()
+
+    # ----- querying -----
+
+    def _query_terms(self, query: str) -> Dict[str, float]:
+        """Query terms with their weights; the last word also matches as a prefix"""
+        words = tokenize(query)
+        weights = {word: 1.0 for word in words}
+
+        raw_words = _WORD.findall(query.lower())
+        if raw_words and not query[-1:].isspace():
+            prefix = raw_words[-1]
+            if len(prefix) >= MIN_PREFIX_LENGTH:
+                completions = set(self._segment.prefix_terms(prefix))
+                completions.update(term for _, entry in self._delta.items() if entry
+                                   for term in entry[1] if term.startswith(prefix))
+                for term in list(completions)[:MAX_PREFIX_TERMS * 2]:
+                    weights.setdefault(term, PREFIX_WEIGHT)
+        return weights
+
+    def _idf(self, term: str, document_count: int) -> float:
+        bounds = self._segment.term_range(term)
+        frequency = bounds[1] - bounds[0] if bounds else 0
+        return math.log(1 + (document_count - frequency + 0.5) / (frequency + 0.5))
+
+    def search(self, query: str, content_type: Optional[str] = None, limit: int = 20,
+               offset: int = 0) -> List[dict]:
+        """
+        Ranked content matching a query
+
+        Args:
+            query: Search text
+            content_type: Only return this Content_Type
+            limit: Number of results
+            offset: Number of best results to skip
+
+        Returns:
+            List of dicts with content_id, content_type and score, best first
+        """
+        with self._lock:
+            self._refresh()
+            segment = self._segment
+            weights = self._query_terms(query)
+            if not weights:
+                return []
+
+            # Updated content is already counted by the segment; only content added since adds to N
+            added = np.array([content_id for content_id, entry in self._delta.items() if entry], dtype=np.int32)
+            document_count = segment.document_count + int((~np.isin(added, segment.doc_ids)).sum())
+            type_code = CONTENT_TYPES.index(content_type) if content_type in CONTENT_TYPES else None
+
+            # Base segment: impact-ordered postings, at most MAX_POSTINGS_PER_TERM per term
+            doc_parts = []
+            score_parts = []
+            for term, weight in weights.items():
+                bounds = segment.term_range(term)
+                if not bounds:
+                    continue
+                start, end = bounds[0], min(bounds[1], bounds[0] + MAX_POSTINGS_PER_TERM)
+                doc_parts.append(np.asarray(segment.postings_doc[start:end]))
+                score_parts.append(np.asarray(segment.postings_impact[start:end], dtype=np.float64)
+                                   * weight * self._idf(term, document_count))
+
+            results: Dict[int, Tuple[int, float]] = {}
+            if doc_parts:
+                docs, inverse = np.unique(np.concatenate(doc_parts), return_inverse=True)
+                scores = np.bincount(inverse, weights=np.concatenate(score_parts))
+                content_ids = np.asarray(segment.doc_ids[docs])
+                types = np.asarray(segment.doc_types[docs])
+
+                # Content changed since the segment was built is scored from the delta instead
+                mask = ~np.isin(content_ids, self._overridden)
+                if type_code is not None:
+                    mask &= types == type_code
+
+                keep = min(int(mask.sum()), offset + limit)
+                if keep > 0:
+                    candidates = np.flatnonzero(mask)
+                    top = candidates[np.argpartition(-scores[candidates], keep - 1)[:keep]]
+                    for i in top:
+                        results[int(content_ids[i])] = (int(types[i]), float(scores[i]))
+
+            # Delta: bounded by compact_threshold entries
+            for content_id, entry in self._delta.items():
+                if entry is None or (type_code is not None and entry[0] != type_code):
+                    continue
+                impacts = entry[1]
+                score = sum(weight * impacts[term] * self._idf(term, document_count)
+                            for term, weight in weights.items() if term in impacts)
+                if score > 0:
+                    results[content_id] = (entry[0], score)
+
+        ranked = sorted(results.items(), key=lambda item: -item[1][1])[offset:offset + limit]
+        return [{
+            'content_id': content_id,
+            'content_type': CONTENT_TYPES[type_index],
+            'score': round(score, 4)
+        } for content_id, (type_index, score) in ranked]
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            self._refresh()
+            return {
+                'generation': self._generation,
+                'documents': self._segment.document_count,
+                'terms': len(self._segment.terms),
+                'postings': len(self._segment.postings_doc),
+                'delta_entries': self._delta_entries,
+                'compact_threshold': self.compact_threshold
+            }
+
+
+# Global search index instance
+search_index = SearchIndex(
+    os.getenv('SEARCH_INDEX_DIR', os.path.join(os.getcwd(), 'uploads', 'search')),
+    compact_threshold=int(os.getenv('SEARCH_INDEX_COMPACT_THRESHOLD', 500))
+)
@@ -8,9 +8,11 @@ by analyzing comment sentiment and adjusting blog post recommendation scores acc
 import os
 import json
 import time
+import hashlib
 import logging
 from typing import Dict, List, Tuple, Optional
 from groq import Groq
+from sentiment_lexicon import lexicon_analyzer
 import mysql.connector
 from datetime import datetime, timedelta
 
@@ -24,20 +26,42 @@ class SentimentAnalyzer:
     and provide sentiment-based weighting for recommendations.
     """
     
-    def __init__(self, api_key: str = None):
-        """Initialize the sentiment analyzer with Groq API key."""
+    BACKENDS = ('llm', 'lexicon', 'hybrid')
+
+    def __init__(self, api_key: str = None, client=None, batch_size: int = 20, backend: str = None):
+        """
+        Initialize the sentiment analyzer with Groq API key.
+
+        Args:
+            api_key (str): Groq API key
+            client: Chat completions client to use instead of Groq (e.g. a local stub
+                exposing client.chat.completions.create)
+            batch_size (int): Maximum number of comments per batch prompt
+            backend (str): 'llm' classifies every comment with Groq, 'lexicon' uses the
+                offline lexicon scorer only, 'hybrid' uses the lexicon scorer first and
+                escalates low-confidence comments to Groq. Defaults to SENTIMENT_BACKEND.
+        """
         self.api_key = api_key or "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"
+        self.batch_size = max(1, batch_size)
+        self.backend = (backend or os.getenv('SENTIMENT_BACKEND', 'llm')).lower()
+        if self.backend not in self.BACKENDS:
+            logger.warning(f"Unknown sentiment backend '{self.backend}', using 'llm'")
+            self.backend = 'llm'
+        self.lexicon = lexicon_analyzer
+        self.max_batch_comment_chars = 1000
 
-        # Set the API key as environment variable for Groq client
-        import os
-        os.environ['GROQ_API_KEY'] = self.api_key
+        if client is not None:
+            self.client = client
+        else:
+            # Set the API key as environment variable for Groq client
+            os.environ['GROQ_API_KEY'] = self.api_key
 
-        try:
-            self.client = Groq()
-        except Exception as e:
-            logger.error(f"Failed to initialize Groq client: {e}")
-            # Try with explicit API key
-            self.client = Groq(api_key=self.api_key)
+            try:
+                self.client = Groq()
+            except Exception as e:
+                logger.error(f"Failed to initialize Groq client: {e}")
+                # Try with explicit API key
+                self.client = Groq(api_key=self.api_key)
 
         # Use a more stable model
         self.model = "llama3-8b-8192"
@@ -60,6 +84,16 @@ class SentimentAnalyzer:
             time.sleep(sleep_time)
         
         self.last_request_time = time.time()
+
+    def _lexicon_first_pass(self, comment_text: str) -> Optional[Dict[str, float]]:
+        """Score with the lexicon unless the backend is 'llm'; None means ask the LLM."""
+        if self.backend == 'llm':
+            return None
+
+        sentiment_scores, confidence = self.lexicon.score(comment_text)
+        if self.backend == 'lexicon' or self.lexicon.is_confident(confidence):
+            return sentiment_scores
+        return None
     
     def analyze_comment_sentiment(self, comment_text: str) -> Dict[str, float]:
         """
@@ -71,11 +105,32 @@ class SentimentAnalyzer:
         Returns:
             Dict[str, float]: Sentiment scores with keys 'positive', 'negative', 'neutral'
         """
+        sentiment_scores = self.classify_comment(comment_text)
+        if sentiment_scores is None:
+            # Return neutral sentiment on error
+            return {'positive': 0.0, 'negative': 0.0, 'neutral': 1.0}
+        return sentiment_scores
+
+    def classify_comment(self, comment_text: str) -> Optional[Dict[str, float]]:
+        """
+        Classify a single comment, without falling back to neutral on failure.
+
+        Args:
+            comment_text (str): The comment text to analyze
+
+        Returns:
+            Optional[Dict[str, float]]: Sentiment scores, or None if the API call or
+            its response failed
+        """
         if not comment_text or len(comment_text.strip()) < 3:
             return {'positive': 0.0, 'negative': 0.0, 'neutral': 1.0}
+
+        lexicon_scores = self._lexicon_first_pass(comment_text)
+        if lexicon_scores is not None:
+            return lexicon_scores
         
         # Check cache first
-        cache_key = hash(comment_text.strip().lower())
+        cache_key = hashlib.sha256(comment_text.strip().lower().encode('utf-8')).hexdigest()
         if cache_key in self.sentiment_cache:
             cached_result, timestamp = self.sentiment_cache[cache_key]
             if datetime.now() - timestamp < timedelta(hours=self.cache_expiry_hours):
@@ -117,19 +172,10 @@ class SentimentAnalyzer:
                 
                 if start_idx != -1 and end_idx != -1:
                     json_str = response_text[start_idx:end_idx]
-                    sentiment_scores = json.loads(json_str)
-                    
-                    # Validate and normalize scores
-                    required_keys = ['positive', 'negative', 'neutral']
-                    if all(key in sentiment_scores for key in required_keys):
-                        # Normalize scores to sum to 1.0
-                        total = sum(sentiment_scores[key] for key in required_keys)
-                        if total > 0:
-                            for key in required_keys:
-                                sentiment_scores[key] = sentiment_scores[key] / total
-                        else:
-                            sentiment_scores = {'positive': 0.0, 'negative': 0.0, 'neutral': 1.0}
-                        
+
+                    # Validate and normalize scores to sum to 1.0
+                    sentiment_scores = self._normalize_scores(json.loads(json_str))
+                    if sentiment_scores is not None:
                         # Cache the result
                         self.sentiment_cache[cache_key] = (sentiment_scores, datetime.now())
                         return sentiment_scores
@@ -137,92 +183,183 @@ class SentimentAnalyzer:
             except json.JSONDecodeError:
                 logger.warning(f"Failed to parse JSON from Groq response: {response_text}")
             
-            # Fallback: neutral sentiment
-            return {'positive': 0.0, 'negative': 0.0, 'neutral': 1.0}
+            return None
             
         except Exception as e:
             logger.error(f"Error analyzing sentiment with Groq API: {str(e)}")
-            # Return neutral sentiment on error
-            return {'positive': 0.0, 'negative': 0.0, 'neutral': 1.0}
+            return None
     
-    def analyze_blog_post_sentiment(self, content_id: int, db_connection) -> Dict[str, float]:
+    def _normalize_scores(self, scores) -> Optional[Dict[str, float]]:
+        """Validate a {'positive', 'negative', 'neutral'} object and scale it to sum to 1.0."""
+        required_keys = ['positive', 'negative', 'neutral']
+        if not isinstance(scores, dict) or not all(key in scores for key in required_keys):
+            return None
+
+        try:
+            values = {key: float(scores[key]) for key in required_keys}
+        except (TypeError, ValueError):
+            return None
+
+        if any(value < 0 for value in values.values()):
+            return None
+
+        total = sum(values.values())
+        if total <= 0:
+            return {'positive': 0.0, 'negative': 0.0, 'neutral': 1.0}
+        return {key: value / total for key, value in values.items()}
+
+    def analyze_comments_batch(self, texts: List[str]) -> List[Dict[str, float]]:
         """
-        Analyze overall sentiment for a blog post based on its comments.
-        
+        Analyze sentiment of many comments with as few API calls as possible.
+
         Args:
-            content_id (int): The content ID of the blog post
-            db_connection: Database connection object
-            
+            texts (List[str]): Comment texts to analyze
+
         Returns:
-            Dict[str, float]: Aggregated sentiment scores and metrics
+            List[Dict[str, float]]: Sentiment scores in the same order as texts;
+            neutral for comments that could not be classified
         """
-        try:
-            cursor = db_connection.cursor(dictionary=True)
-            
-            # Get all active comments for the blog post
-            cursor.execute("""
-                SELECT Comment_Content, Created_At
-                FROM Content_Comments
-                WHERE Content_ID = %s AND Status = 'Active'
-                ORDER BY Created_At DESC
-            """, (content_id,))
-            
-            comments = cursor.fetchall()
-            cursor.close()
-            
-            if not comments:
-                return {
-                    'overall_sentiment': 'neutral',
-                    'sentiment_score': 0.0,
-                    'positive_ratio': 0.0,
-                    'negative_ratio': 0.0,
-                    'neutral_ratio': 1.0,
-                    'comment_count': 0,
-                    'confidence': 0.0
-                }
-            
-            # Analyze sentiment for each comment
-            sentiment_results = []
-            for comment in comments:
-                sentiment = self.analyze_comment_sentiment(comment['Comment_Content'])
-                sentiment_results.append(sentiment)
-            
-            # Aggregate sentiment scores using simple statistical methods
-            total_comments = len(sentiment_results)
-            
-            # Calculate average sentiment scores
-            avg_positive = sum(s['positive'] for s in sentiment_results) / total_comments
-            avg_negative = sum(s['negative'] for s in sentiment_results) / total_comments
-            avg_neutral = sum(s['neutral'] for s in sentiment_results) / total_comments
-            
-            # Determine overall sentiment
-            if avg_positive > avg_negative and avg_positive > avg_neutral:
-                overall_sentiment = 'positive'
-                sentiment_score = avg_positive - avg_negative  # Range: -1 to 1
-            elif avg_negative > avg_positive and avg_negative > avg_neutral:
-                overall_sentiment = 'negative'
-                sentiment_score = avg_positive - avg_negative  # Range: -1 to 1
+        neutral = {'positive': 0.0, 'negative': 0.0, 'neutral': 1.0}
+        return [scores if scores is not None else dict(neutral)
+                for scores in self.classify_comments_batch(texts)]
+
+    def classify_comments_batch(self, texts: List[str]) -> List[Optional[Dict[str, float]]]:
+        """
+        Classify many comments, packing up to batch_size of them into one prompt.
+
+        The model answers with one indexed JSON result per comment. Results are
+        validated individually; comments whose index is missing or invalid are
+        retried with a single-comment call.
+
+        Args:
+            texts (List[str]): Comment texts to analyze
+
+        Returns:
+            List[Optional[Dict[str, float]]]: Sentiment scores in the same order as
+            texts, None where classification failed
+        """
+        results: List[Optional[Dict[str, float]]] = [None] * len(texts)
+        pending = []
+
+        for position, text in enumerate(texts):
+            if not text or len(text.strip()) < 3:
+                results[position] = {'positive': 0.0, 'negative': 0.0, 'neutral': 1.0}
+                continue
+
+            lexicon_scores = self._lexicon_first_pass(text)
+            if lexicon_scores is not None:
+                results[position] = lexicon_scores
+                continue
+
+            cache_key = hashlib.sha256(text.strip().lower().encode('utf-8')).hexdigest()
+            cached = self.sentiment_cache.get(cache_key)
+            if cached and datetime.now() - cached[1] < timedelta(hours=self.cache_expiry_hours):
+                results[position] = cached[0]
             else:
-                overall_sentiment = 'neutral'
-                sentiment_score = 0.0
-            
-            # Calculate confidence based on comment count and sentiment clarity
-            confidence = min(1.0, total_comments / 10.0)  # More comments = higher confidence
-            sentiment_clarity = abs(sentiment_score)  # How clear the sentiment is
-            confidence *= sentiment_clarity
-            
-            return {
-                'overall_sentiment': overall_sentiment,
-                'sentiment_score': sentiment_score,
-                'positive_ratio': avg_positive,
-                'negative_ratio': avg_negative,
-                'neutral_ratio': avg_neutral,
-                'comment_count': total_comments,
-                'confidence': confidence
-            }
-            
+                pending.append((position, text, cache_key))
+
+        for start in range(0, len(pending), self.batch_size):
+            chunk = pending[start:start + self.batch_size]
+            batch_scores = self._request_batch([text for _, text, _ in chunk])
+
+            for index, (position, text, cache_key) in enumerate(chunk):
+                scores = batch_scores.get(index)
+                if scores is None:
+                    scores = self.classify_comment(text)
+                else:
+                    self.sentiment_cache[cache_key] = (scores, datetime.now())
+                results[position] = scores
+
+        return results
+
+    def _request_batch(self, texts: List[str]) -> Dict[int, Dict[str, float]]:
+        """Send one prompt for several comments; returns the valid results by index."""
+        if len(texts) == 1:
+            # Not worth the batch prompt; classify_comment caches the result
+            return {}
+
+        comment_lines = '\n'.join(
+            f'{index}: {json.dumps(text[:self.max_batch_comment_chars])}'
+            for index, text in enumerate(texts)
+        )
+        prompt = f"""
+            Analyze the sentiment of each of the following numbered comments and provide scores for positive, negative, and neutral sentiment.
+            Return only a JSON object of the form {{"results": [{{"index": 0, "positive": 0.0, "negative": 0.0, "neutral": 1.0}}]}}
+            with exactly one entry per comment. Each entry's "index" is the comment number and its scores are between 0.0 and 1.0 and sum to 1.0.
+
+            Comments:
+            {comment_lines}
+
+            JSON Response:
+            """
+
+        try:
+            self._rate_limit()
+
+            completion = self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                temperature=0.1,  # Low temperature for consistent results
+                max_tokens=50 + 40 * len(texts),
+                top_p=0.9,
+                stream=False,
+            )
+
+            response_text = completion.choices[0].message.content.strip()
         except Exception as e:
-            logger.error(f"Error analyzing blog post sentiment: {str(e)}")
+            logger.error(f"Error analyzing sentiment batch with Groq API: {str(e)}")
+            return {}
+
+        start_idx = response_text.find('{')
+        end_idx = response_text.rfind('}') + 1
+        try:
+            payload = json.loads(response_text[start_idx:end_idx]) if start_idx != -1 else {}
+        except json.JSONDecodeError:
+            logger.warning(f"Failed to parse JSON from Groq batch response: {response_text}")
+            return {}
+
+        entries = payload.get('results') if isinstance(payload, dict) else None
+        if not isinstance(entries, list):
+            logger.warning(f"Groq batch response has no results list: {response_text}")
+            return {}
+
+        batch_scores = {}
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            index = entry.get('index')
+            # bool is an int subclass; reject it along with out-of-range or repeated indices
+            if not isinstance(index, int) or isinstance(index, bool) or not 0 <= index < len(texts) or index in batch_scores:
+                continue
+            scores = self._normalize_scores(entry)
+            if scores is not None:
+                batch_scores[index] = scores
+
+        missing = len(texts) - len(batch_scores)
+        if missing:
+            logger.warning(f"Groq batch response is missing {missing} of {len(texts)} result(s), falling back to single calls")
+        return batch_scores
+
+    def aggregate_sentiment(self, positive_sum: float, negative_sum: float,
+                            neutral_sum: float, comment_count: int) -> Dict[str, float]:
+        """
+        Build content-level sentiment from the summed scores of its comments.
+
+        Args:
+            positive_sum (float): Sum of positive scores
+            negative_sum (float): Sum of negative scores
+            neutral_sum (float): Sum of neutral scores
+            comment_count (int): Number of summed comments
+
+        Returns:
+            Dict[str, float]: Aggregated sentiment scores and metrics
+        """
+        if comment_count <= 0:
             return {
                 'overall_sentiment': 'neutral',
                 'sentiment_score': 0.0,
@@ -232,7 +369,182 @@ class SentimentAnalyzer:
                 'comment_count': 0,
                 'confidence': 0.0
             }
-    
+
+        # Calculate average sentiment scores
+        avg_positive = float(positive_sum) / comment_count
+        avg_negative = float(negative_sum) / comment_count
+        avg_neutral = float(neutral_sum) / comment_count
+
+        # Determine overall sentiment
+        if avg_positive > avg_negative and avg_positive > avg_neutral:
+            overall_sentiment = 'positive'
+            sentiment_score = avg_positive - avg_negative  # Range: -1 to 1
+        elif avg_negative > avg_positive and avg_negative > avg_neutral:
+            overall_sentiment = 'negative'
+            sentiment_score = avg_positive - avg_negative  # Range: -1 to 1
+        else:
+            overall_sentiment = 'neutral'
+            sentiment_score = 0.0
+
+        # Calculate confidence based on comment count and sentiment clarity
+        confidence = min(1.0, comment_count / 10.0)  # More comments = higher confidence
+        sentiment_clarity = abs(sentiment_score)  # How clear the sentiment is
+        confidence *= sentiment_clarity
+
+        return {
+            'overall_sentiment': overall_sentiment,
+            'sentiment_score': sentiment_score,
+            'positive_ratio': avg_positive,
+            'negative_ratio': avg_negative,
+            'neutral_ratio': avg_neutral,
+            'comment_count': comment_count,
+            'confidence': confidence
+        }
+
+    def analyze_blog_post_sentiment(self, content_id: int, db_connection) -> Dict[str, float]:
+        """
+        Get overall sentiment for a blog post from the running sums in Content_Metrics.
+
+        No comments are classified here; see sync_comment_sentiment.
+
+        Args:
+            content_id (int): The content ID of the blog post
+            db_connection: Database connection object
+
+        Returns:
+            Dict[str, float]: Aggregated sentiment scores and metrics
+        """
+        try:
+            cursor = db_connection.cursor(dictionary=True)
+            cursor.execute("""
+                SELECT Sentiment_Positive_Sum, Sentiment_Negative_Sum,
+                       Sentiment_Neutral_Sum, Sentiment_Comment_Count
+                FROM Content_Metrics
+                WHERE Content_ID = %s
+            """, (content_id,))
+            sums = cursor.fetchone()
+            cursor.close()
+
+            if not sums:
+                return self.aggregate_sentiment(0.0, 0.0, 0.0, 0)
+
+            return self.aggregate_sentiment(
+                sums['Sentiment_Positive_Sum'],
+                sums['Sentiment_Negative_Sum'],
+                sums['Sentiment_Neutral_Sum'],
+                sums['Sentiment_Comment_Count'] or 0
+            )
+
+        except Exception as e:
+            logger.error(f"Error analyzing blog post sentiment: {str(e)}")
+            return self.aggregate_sentiment(0.0, 0.0, 0.0, 0)
+
+    def sync_comment_sentiment(self, content_id: int, db_connection) -> Dict[str, float]:
+        """
+        Bring the stored sentiment of a content item up to date with its comments.
+
+        Only active comments without a Comment_Sentiment row are classified; comments
+        that are no longer active are subtracted from the running sums. The comments
+        are read and classified before the write transaction starts; the caller
+        commits the writes.
+
+        Args:
+            content_id (int): The content ID whose comments changed
+            db_connection: Database connection object
+
+        Returns:
+            Dict[str, float]: Aggregated sentiment scores and metrics
+        """
+        cursor = db_connection.cursor(dictionary=True)
+        try:
+            # Comments that were added since the last run
+            cursor.execute("""
+                SELECT cc.Comment_ID, cc.Comment_Content
+                FROM Content_Comments cc
+                LEFT JOIN Comment_Sentiment cs ON cc.Comment_ID = cs.Comment_ID
+                WHERE cc.Content_ID = %s AND cc.Status = 'Active' AND cs.Comment_ID IS NULL
+            """, (content_id,))
+            new_comments = cursor.fetchall()
+
+            # Classify outside any transaction: the Groq round-trips must not hold a
+            # snapshot or row locks that comment moderation would wait on
+            db_connection.commit()
+            classified = self.classify_comments_batch([comment['Comment_Content'] for comment in new_comments])
+
+            # Comments that were removed since the last run. No FOR UPDATE: the DELETE
+            # rowcount below already keeps a concurrent run from subtracting a comment twice
+            cursor.execute("""
+                SELECT cs.Comment_ID, cs.Positive, cs.Negative, cs.Neutral
+                FROM Comment_Sentiment cs
+                JOIN Content_Comments cc ON cs.Comment_ID = cc.Comment_ID
+                WHERE cs.Content_ID = %s AND cc.Status <> 'Active'
+            """, (content_id,))
+            removed = cursor.fetchall()
+
+            delta_positive = delta_negative = delta_neutral = 0.0
+            delta_count = 0
+
+            for comment, sentiment in zip(new_comments, classified):
+                if sentiment is None:
+                    # Leave the comment unclassified rather than storing a guess;
+                    # the job is retried
+                    raise RuntimeError(f"Could not classify comment {comment['Comment_ID']}")
+                cursor.execute("""
+                    INSERT IGNORE INTO Comment_Sentiment (Comment_ID, Content_ID, Positive, Negative, Neutral)
+                    VALUES (%s, %s, %s, %s, %s)
+                """, (comment['Comment_ID'], content_id,
+                      sentiment['positive'], sentiment['negative'], sentiment['neutral']))
+                if cursor.rowcount:
+                    delta_positive += round(sentiment['positive'], 4)
+                    delta_negative += round(sentiment['negative'], 4)
+                    delta_neutral += round(sentiment['neutral'], 4)
+                    delta_count += 1
+
+            for row in removed:
+                cursor.execute("DELETE FROM Comment_Sentiment WHERE Comment_ID = %s", (row['Comment_ID'],))
+                if cursor.rowcount:
+                    delta_positive -= float(row['Positive'])
+                    delta_negative -= float(row['Negative'])
+                    delta_neutral -= float(row['Neutral'])
+                    delta_count -= 1
+
+            cursor.execute("""
+                UPDATE Content_Metrics
+                SET Sentiment_Positive_Sum = GREATEST(Sentiment_Positive_Sum + %s, 0),
+                    Sentiment_Negative_Sum = GREATEST(Sentiment_Negative_Sum + %s, 0),
+                    Sentiment_Neutral_Sum = GREATEST(Sentiment_Neutral_Sum + %s, 0),
+                    Sentiment_Comment_Count = GREATEST(Sentiment_Comment_Count + %s, 0)
+                WHERE Content_ID = %s
+            """, (delta_positive, delta_negative, delta_neutral, delta_count, content_id))
+
+            sentiment_data = self.analyze_blog_post_sentiment(content_id, db_connection)
+
+            cursor.execute("""
+                UPDATE Content_Metrics
+                SET
+                    Sentiment_Score = %s,
+                    Positive_Ratio = %s,
+                    Negative_Ratio = %s,
+                    Neutral_Ratio = %s,
+                    Sentiment_Confidence = %s,
+                    Overall_Sentiment = %s,
+                    Sentiment_Last_Updated = NOW()
+                WHERE Content_ID = %s
+            """, (
+                sentiment_data['sentiment_score'],
+                sentiment_data['positive_ratio'],
+                sentiment_data['negative_ratio'],
+                sentiment_data['neutral_ratio'],
+                sentiment_data['confidence'],
+                sentiment_data['overall_sentiment'],
+                content_id
+            ))
+
+            logger.info(f"Sentiment for content {content_id}: {len(new_comments)} comment(s) classified, {len(removed)} removed")
+            return sentiment_data
+        finally:
+            cursor.close()
+
     def calculate_sentiment_weight(self, sentiment_data: Dict[str, float]) -> float:
         """
         Calculate sentiment weight for recommendation scoring.
@@ -327,6 +639,24 @@ def analyze_content_sentiment(content_id: int) -> Dict[str, float]:
         connection.close()
 
 
+def refresh_content_sentiment(content_id: int, db_connection) -> Dict[str, float]:
+    """
+    Classify new comments of a content item and update its sentiment in Content_Metrics.
+
+    Args:
+        content_id (int): The content ID to analyze
+        db_connection: Database connection object (committed by this function)
+
+    Returns:
+        Dict[str, float]: Sentiment analysis results
+    """
+    sentiment_data = sentiment_analyzer.sync_comment_sentiment(content_id, db_connection)
+    db_connection.commit()
+
+    logger.info(f"Updated sentiment for content {content_id}: {sentiment_data.get('overall_sentiment', 'neutral')} (score: {sentiment_data.get('sentiment_score', 0.0)})")
+    return sentiment_data
+
+
 def get_sentiment_weight(content_id: int) -> float:
     """
     Get sentiment weight for a specific content ID.
@@ -0,0 +1,220 @@
+"""
+Sentiment Job Queue Module for LawFort Application
+
+Comment POSTs used to run sentiment analysis inline, re-scoring every comment
+of the content item through the Groq API (rate limited to one call per
+second) while a sync gunicorn worker waited. Requests now only enqueue a job
+in the Sentiment_Jobs table, inside the same transaction as the comment, and
+sentiment_worker.py processes the queue in a separate process.
+
+There is at most one job row per content item. Enqueueing while a job is
+pending is a no-op apart from bumping Requested_At, so a burst of comments is
+coalesced into a single refresh. Enqueueing while a job is running marks it
+for another run once the current one finishes.
+"""
+
+import os
+import uuid
+import logging
+from typing import Dict, List
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class SentimentJobQueue:
+    """
+    MySQL-backed queue of per-content sentiment refresh jobs
+    """
+
+    def __init__(self, coalesce_seconds: int = 10, max_attempts: int = 5,
+                 retry_delay_seconds: int = 60, stale_after_seconds: int = 900):
+        """
+        Initialize the job queue
+
+        Args:
+            coalesce_seconds: Delay before a new job becomes available, so
+                comments arriving in the meantime share one refresh
+            max_attempts: Failed attempts after which a job is dropped
+            retry_delay_seconds: Base delay before retrying a failed job
+            stale_after_seconds: Running jobs older than this are assumed to
+                belong to a crashed worker and are released
+        """
+        self.coalesce_seconds = coalesce_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay_seconds = retry_delay_seconds
+        self.stale_after_seconds = stale_after_seconds
+
+    def enqueue(self, connection, content_id: int):
+        """
+        Request a sentiment refresh for a content item
+
+        Runs in the caller's transaction; the caller commits.
+
+        Args:
+            connection: Database connection
+            content_id: Content ID whose comments changed
+        """
+        cursor = connection.cursor()
+        try:
+            # A pending job keeps its Available_At so a steady stream of
+            # comments cannot postpone the refresh indefinitely
+            cursor.execute("""
+                INSERT INTO Sentiment_Jobs (Content_ID, Status, Requested_At, Available_At)
+                VALUES (%s, 'pending', NOW(6), DATE_ADD(NOW(6), INTERVAL %s SECOND))
+                ON DUPLICATE KEY UPDATE Requested_At = NOW(6)
+            """, (content_id, self.coalesce_seconds))
+        finally:
+            cursor.close()
+
+    def claim(self, connection, limit: int = 10) -> List[Dict]:
+        """
+        Claim available jobs for processing
+
+        Args:
+            connection: Database connection
+            limit: Maximum number of jobs to claim
+
+        Returns:
+            List of claimed jobs (Job_ID, Content_ID, Attempts, Locked_By)
+        """
+        claim_token = uuid.uuid4().hex
+        cursor = connection.cursor(dictionary=True)
+        try:
+            # A single UPDATE claims the rows atomically, so several workers
+            # never pick up the same job
+            cursor.execute("""
+                UPDATE Sentiment_Jobs
+                SET Status = 'running', Locked_By = %s, Locked_At = NOW(6), Attempts = Attempts + 1
+                WHERE Status = 'pending' AND Available_At <= NOW(6)
+                ORDER BY Available_At
+                LIMIT %s
+            """, (claim_token, limit))
+            connection.commit()
+
+            if cursor.rowcount == 0:
+                return []
+
+            cursor.execute("""
+                SELECT Job_ID, Content_ID, Attempts, Locked_By
+                FROM Sentiment_Jobs
+                WHERE Locked_By = %s
+            """, (claim_token,))
+            jobs = cursor.fetchall()
+            connection.commit()
+            return jobs
+        finally:
+            cursor.close()
+
+    def complete(self, connection, job: Dict):
+        """
+        Finish a job
+
+        The row is deleted unless the content item was re-requested while the
+        job was running, in which case it goes back to pending.
+
+        Args:
+            connection: Database connection
+            job: Job returned by claim()
+        """
+        cursor = connection.cursor()
+        try:
+            cursor.execute("""
+                DELETE FROM Sentiment_Jobs
+                WHERE Job_ID = %s AND Locked_By = %s AND Requested_At <= Locked_At
+            """, (job['Job_ID'], job['Locked_By']))
+
+            if cursor.rowcount == 0:
+                cursor.execute("""
+                    UPDATE Sentiment_Jobs
+                    SET Status = 'pending', Locked_By = NULL, Locked_At = NULL, Attempts = 0,
+                        Last_Error = NULL, Available_At = DATE_ADD(NOW(6), INTERVAL %s SECOND)
+                    WHERE Job_ID = %s AND Locked_By = %s
+                """, (self.coalesce_seconds, job['Job_ID'], job['Locked_By']))
+
+            connection.commit()
+        finally:
+            cursor.close()
+
+    def fail(self, connection, job: Dict, error: str):
+        """
+        Record a failed attempt and schedule a retry with exponential backoff
+
+        Args:
+            connection: Database connection
+            job: Job returned by claim()
+            error: Error message
+        """
+        cursor = connection.cursor()
+        try:
+            if job['Attempts'] >= self.max_attempts:
+                logger.error(f"Dropping sentiment job for content {job['Content_ID']} after {job['Attempts']} attempts: {error}")
+                cursor.execute("""
+                    DELETE FROM Sentiment_Jobs
+                    WHERE Job_ID = %s AND Locked_By = %s
+                """, (job['Job_ID'], job['Locked_By']))
+            else:
+                delay = self.retry_delay_seconds * (2 ** (job['Attempts'] - 1))
+                cursor.execute("""
+                    UPDATE Sentiment_Jobs
+                    SET Status = 'pending', Locked_By = NULL, Locked_At = NULL, Last_Error = %s,
+                        Available_At = DATE_ADD(NOW(6), INTERVAL %s SECOND)
+                    WHERE Job_ID = %s AND Locked_By = %s
+                """, (error[:2000], delay, job['Job_ID'], job['Locked_By']))
+
+            connection.commit()
+        finally:
+            cursor.close()
+
+    def release_stale(self, connection) -> int:
+        """
+        Return jobs claimed by a worker that died mid-run to the queue
+
+        Args:
+            connection: Database connection
+
+        Returns:
+            Number of released jobs
+        """
+        cursor = connection.cursor()
+        try:
+            cursor.execute("""
+                UPDATE Sentiment_Jobs
+                SET Status = 'pending', Locked_By = NULL, Locked_At = NULL
+                WHERE Status = 'running' AND Locked_At < DATE_SUB(NOW(6), INTERVAL %s SECOND)
+            """, (self.stale_after_seconds,))
+            released = cursor.rowcount
+            connection.commit()
+            return released
+        finally:
+            cursor.close()
+
+    def get_stats(self, connection) -> Dict:
+        """
+        Get queue depth
+
+        Args:
+            connection: Database connection
+
+        Returns:
+            Dict with pending and running job counts and the oldest request age
+        """
+        cursor = connection.cursor(dictionary=True)
+        try:
+            cursor.execute("""
+                SELECT
+                    COUNT(CASE WHEN Status = 'pending' THEN 1 END) as pending,
+                    COUNT(CASE WHEN Status = 'running' THEN 1 END) as running,
+                    TIMESTAMPDIFF(SECOND, MIN(Requested_At), NOW(6)) as oldest_request_age_seconds
+                FROM Sentiment_Jobs
+            """)
+            return cursor.fetchone()
+        finally:
+            cursor.close()
+
+
+# Global sentiment job queue instance
+sentiment_job_queue = SentimentJobQueue(
+    coalesce_seconds=int(os.getenv('SENTIMENT_JOB_COALESCE_SECONDS', 10)),
+    max_attempts=int(os.getenv('SENTIMENT_JOB_MAX_ATTEMPTS', 5))
+)
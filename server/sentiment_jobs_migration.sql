@@ -0,0 +1,23 @@
+-- Sentiment Job Queue Migration Script
+-- Durable queue for comment sentiment analysis, processed by sentiment_worker.py
+-- instead of inside the comment POST request
+
+-- One row per content item with a pending (or running) sentiment refresh.
+-- The unique key on Content_ID dedupes jobs: a burst of comments on the same
+-- content item collapses into a single row.
+CREATE TABLE IF NOT EXISTS Sentiment_Jobs (
+    Job_ID INT AUTO_INCREMENT PRIMARY KEY,
+    Content_ID INT NOT NULL,
+    Status ENUM('pending', 'running') NOT NULL DEFAULT 'pending',
+    Attempts INT NOT NULL DEFAULT 0,
+    Requested_At DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) COMMENT 'Last time a refresh was requested',
+    Available_At DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) COMMENT 'Earliest time a worker may pick the job up',
+    Locked_At DATETIME(6) NULL COMMENT 'When a worker claimed the job',
+    Locked_By VARCHAR(64) NULL COMMENT 'Claim token of the worker processing the job',
+    Last_Error TEXT NULL,
+    UNIQUE KEY unique_sentiment_job_content (Content_ID),
+    FOREIGN KEY (Content_ID) REFERENCES Content(Content_ID) ON DELETE CASCADE
+);
+
+CREATE INDEX idx_sentiment_jobs_claim ON Sentiment_Jobs(Status, Available_At);
+CREATE INDEX idx_sentiment_jobs_locked_by ON Sentiment_Jobs(Locked_By);
@@ -0,0 +1,230 @@
+"""
+Lexicon Sentiment Module for LawFort Application
+
+Offline, rule-based comment sentiment in the style of VADER: words carry a
+valence between -4 and +4, modified by negations, intensifiers, "but"
+clauses, capitalisation and exclamation marks. The general word list is
+adjusted for legal writing, where words such as "crime", "guilty" or
+"penalty" describe the subject matter rather than the commenter's opinion,
+and where "well-reasoned" or "per incuriam" carry a clear judgement.
+
+LexiconSentimentAnalyzer exposes the same analyze_comment_sentiment
+interface as the Groq-backed SentimentAnalyzer, and a score() method that
+also returns a confidence so callers can escalate unclear comments.
+"""
+
+import os
+import re
+import math
+import logging
+from typing import Dict, List, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# General-purpose valences (-4 very negative .. +4 very positive)
+GENERAL_LEXICON = {
+    'good': 1.9, 'great': 3.1, 'excellent': 3.2, 'amazing': 2.8, 'awesome': 3.1, 'fantastic': 2.6,
+    'wonderful': 2.7, 'brilliant': 2.8, 'outstanding': 3.0, 'superb': 3.1, 'perfect': 2.7,
+    'nice': 1.8, 'fine': 0.8, 'ok': 0.9, 'okay': 0.9, 'decent': 1.3, 'solid': 1.4,
+    'helpful': 1.9, 'useful': 1.9, 'informative': 1.8, 'interesting': 1.7, 'clear': 1.2,
+    'valuable': 2.1, 'impressive': 2.3, 'thorough': 1.6, 'accurate': 1.6, 'detailed': 1.2,
+    'thanks': 1.9, 'thank': 1.5, 'thankful': 2.2, 'grateful': 2.2, 'appreciate': 2.0,
+    'appreciated': 2.0, 'love': 3.2, 'loved': 2.9, 'like': 1.5, 'liked': 1.8, 'enjoy': 2.2,
+    'enjoyed': 2.3, 'agree': 1.5, 'agreed': 1.5, 'recommend': 1.5, 'recommended': 1.5,
+    'best': 3.2, 'better': 1.9, 'well': 1.1, 'beautiful': 2.9, 'happy': 2.7, 'glad': 2.0,
+    'pleased': 1.9, 'inspiring': 2.4, 'fair': 1.3, 'right': 0.8,
+    'correct': 1.2, 'concise': 1.3, 'engaging': 1.8, 'enlightening': 2.2, 'kudos': 2.3,
+    'bad': -2.5, 'terrible': -2.9, 'awful': -2.9, 'horrible': -2.9, 'worst': -3.1,
+    'poor': -2.1, 'weak': -1.6, 'wrong': -2.1, 'incorrect': -1.9, 'useless': -2.4,
+    'boring': -1.3, 'confusing': -1.4, 'confused': -1.3, 'unclear': -1.4, 'disappointing': -2.2,
+    'disappointed': -2.1, 'hate': -2.7, 'hated': -3.2, 'dislike': -1.6, 'disagree': -1.6,
+    'misleading': -2.3, 'inaccurate': -2.0, 'false': -1.3, 'nonsense': -2.1, 'stupid': -2.4,
+    'waste': -1.8, 'wasted': -2.2, 'annoying': -1.7, 'sad': -2.1, 'unfortunately': -1.5,
+    'problem': -1.7, 'problems': -1.7, 'issue': -0.8, 'lacking': -1.4, 'lacks': -1.4,
+    'shallow': -1.4, 'superficial': -1.5, 'biased': -1.9, 'sloppy': -1.9, 'mediocre': -1.4,
+    'pathetic': -2.9, 'ridiculous': -2.2, 'absurd': -1.9, 'fail': -2.2, 'failed': -2.3,
+    'fails': -2.2, 'flawed': -1.9, 'unfair': -2.1, 'angry': -2.3, 'upset': -1.6,
+    'crime': -2.5, 'criminal': -2.4, 'guilty': -1.8, 'victim': -2.0, 'violation': -2.2,
+    'penalty': -1.4, 'punishment': -2.3, 'death': -2.9, 'murder': -3.7, 'fraud': -2.8,
+    'abuse': -3.2, 'dispute': -1.7, 'conflict': -1.3, 'liability': -0.9, 'illegal': -2.6,
+    'unlawful': -2.2, 'offence': -1.2, 'offense': -1.2, 'accused': -1.2, 'sentence': -0.5,
+    'sentenced': -1.4, 'prison': -2.2, 'jail': -2.2, 'harassment': -2.8, 'damages': -1.2,
+    'breach': -1.6, 'negligence': -2.0, 'injury': -2.1, 'kill': -3.7, 'killed': -3.5,
+}
+
+# Legal-domain adjustments: subject-matter words are neutral, opinion words on
+# legal writing get a valence. These override GENERAL_LEXICON.
+LEGAL_LEXICON = {
+    # Describing the case, not the commenter's opinion of the post
+    'crime': 0.0, 'criminal': 0.0, 'guilty': 0.0, 'victim': 0.0, 'violation': 0.0,
+    'penalty': 0.0, 'punishment': 0.0, 'death': 0.0, 'murder': 0.0, 'fraud': 0.0,
+    'abuse': 0.0, 'dispute': 0.0, 'conflict': 0.0, 'liability': 0.0, 'illegal': 0.0,
+    'unlawful': 0.0, 'offence': 0.0, 'offense': 0.0, 'accused': 0.0, 'sentence': 0.0,
+    'sentenced': 0.0, 'prison': 0.0, 'jail': 0.0, 'harassment': 0.0, 'damages': 0.0,
+    'breach': 0.0, 'negligence': 0.0, 'injury': 0.0, 'kill': 0.0, 'killed': 0.0,
+    'issue': 0.0, 'problem': -0.5, 'problems': -0.5,
+    # Judgements on legal analysis
+    'landmark': 2.2, 'insightful': 2.6, 'lucid': 2.2, 'comprehensive': 1.8, 'well-reasoned': 2.6,
+    'well-researched': 2.6, 'well-written': 2.5, 'well-argued': 2.4, 'persuasive': 1.9,
+    'cogent': 2.1, 'nuanced': 1.7, 'authoritative': 1.6, 'succinct': 1.5, 'erudite': 2.0,
+    'seminal': 2.1, 'analysis': 0.3, 'precise': 1.5, 'rigorous': 1.8, 'progressive': 1.2,
+    'erroneous': -2.2, 'outdated': -1.6, 'obsolete': -1.6, 'overruled': -1.2, 'per-incuriam': -2.0,
+    'mischaracterizes': -2.0, 'misinterprets': -2.0, 'misinterpreted': -1.9, 'misread': -1.7, 'misreads': -1.7,
+    'unsupported': -1.6, 'unconvincing': -1.8, 'one-sided': -1.8, 'incomplete': -1.3,
+    'inconsistent': -1.4, 'superseded': -1.2, 'vague': -1.3, 'convoluted': -1.6,
+}
+
+NEGATIONS = {
+    'not', 'no', 'never', 'none', 'nobody', 'nothing', 'neither', 'nor', 'without', 'hardly',
+    'barely', 'scarcely', 'cannot', "can't", "don't", "doesn't", "didn't", "isn't", "aren't",
+    "wasn't", "weren't", "won't", "wouldn't", "shouldn't", "couldn't", "hasn't", "haven't", "hadn't",
+}
+
+BOOSTERS = {
+    'very': 0.293, 'really': 0.293, 'extremely': 0.293, 'highly': 0.293, 'incredibly': 0.293,
+    'absolutely': 0.293, 'truly': 0.293, 'so': 0.293, 'totally': 0.293, 'particularly': 0.293,
+    'exceptionally': 0.293, 'most': 0.293, 'quite': 0.15, 'deeply': 0.293,
+    'slightly': -0.293, 'somewhat': -0.293, 'barely': -0.293, 'kinda': -0.293, 'marginally': -0.293,
+    'partly': -0.293, 'little': -0.293,
+}
+
+NEGATION_SCALAR = -0.74
+CAPS_INCREMENT = 0.733
+ALPHA = 15  # Normalization constant of the VADER compound score
+
+_TOKEN_PATTERN = re.compile(r"[A-Za-z]+(?:[-'][A-Za-z]+)*|!")
+
+
+class LexiconSentimentAnalyzer:
+    """
+    Rule-based sentiment analyzer that needs no network access
+    """
+
+    def __init__(self, lexicon: Dict[str, float] = None, confidence_threshold: float = 0.5):
+        """
+        Initialize the lexicon analyzer
+
+        Args:
+            lexicon: Word valences; defaults to the general list with legal adjustments
+            confidence_threshold: Confidence below which a result counts as unclear
+        """
+        if lexicon is None:
+            lexicon = {**GENERAL_LEXICON, **LEGAL_LEXICON}
+        self.lexicon = lexicon
+        self.confidence_threshold = confidence_threshold
+
+    def _tokenize(self, text: str) -> List[str]:
+        # "per incuriam" is a single legal term
+        text = re.sub(r'\bper\s+incuriam\b', 'per-incuriam', text, flags=re.IGNORECASE)
+        return _TOKEN_PATTERN.findall(text)
+
+    def _valences(self, tokens: List[str]) -> List[float]:
+        words = [token for token in tokens if token != '!']
+        has_mixed_case = any(word.isupper() and len(word) > 1 for word in words) and \
+            any(not word.isupper() for word in words)
+
+        valences = []
+        for i, word in enumerate(words):
+            lower = word.lower()
+            valence = self.lexicon.get(lower, 0.0)
+            if valence == 0.0 or lower in BOOSTERS:
+                valences.append(0.0)
+                continue
+
+            # Shouting a sentiment word in otherwise normal text emphasises it
+            if has_mixed_case and word.isupper():
+                valence += CAPS_INCREMENT if valence > 0 else -CAPS_INCREMENT
+
+            # Intensifiers and negations up to three words before
+            for distance in range(1, 4):
+                if i - distance < 0:
+                    break
+                previous = words[i - distance].lower()
+                damping = (1.0, 0.95, 0.9)[distance - 1]
+                if previous in BOOSTERS:
+                    boost = BOOSTERS[previous] * damping
+                    valence += boost if valence > 0 else -boost
+                if previous in NEGATIONS or previous.endswith("n't"):
+                    valence *= NEGATION_SCALAR
+
+            valences.append(valence)
+
+        # The clause after "but" carries the opinion
+        lowered = [word.lower() for word in words]
+        if 'but' in lowered:
+            but_index = lowered.index('but')
+            valences = [valence * (0.5 if i < but_index else 1.5 if i > but_index else 1.0)
+                        for i, valence in enumerate(valences)]
+
+        return valences
+
+    def score(self, comment_text: str) -> Tuple[Dict[str, float], float]:
+        """
+        Score a comment
+
+        Args:
+            comment_text: The comment text to analyze
+
+        Returns:
+            Tuple of sentiment scores ('positive', 'negative', 'neutral' summing
+            to 1.0) and a confidence between 0.0 and 1.0
+        """
+        if not comment_text or len(comment_text.strip()) < 3:
+            return {'positive': 0.0, 'negative': 0.0, 'neutral': 1.0}, 1.0
+
+        tokens = self._tokenize(comment_text)
+        valences = self._valences(tokens)
+        hits = [valence for valence in valences if valence != 0.0]
+
+        if not hits:
+            # No opinion words: neutral, but an unknown vocabulary is not strong evidence
+            confidence = 0.6 if len(valences) <= 6 else 0.3
+            return {'positive': 0.0, 'negative': 0.0, 'neutral': 1.0}, confidence
+
+        total = sum(valences)
+        exclamations = min(tokens.count('!'), 4) * 0.292
+        if total > 0:
+            total += exclamations
+        elif total < 0:
+            total -= exclamations
+        compound = total / math.sqrt(total * total + ALPHA)
+
+        positive_sum = sum(valence + 1 for valence in valences if valence > 0)
+        negative_sum = sum(abs(valence - 1) for valence in valences if valence < 0)
+        neutral_count = sum(1 for valence in valences if valence == 0.0)
+        denominator = positive_sum + negative_sum + neutral_count
+        scores = {
+            'positive': positive_sum / denominator,
+            'negative': negative_sum / denominator,
+            'neutral': neutral_count / denominator,
+        }
+
+        # Mixed opinions or a weak compound score are unclear
+        mixed = any(valence > 0 for valence in hits) and any(valence < 0 for valence in hits)
+        confidence = abs(compound) * (0.6 if mixed else 1.0)
+
+        return scores, confidence
+
+    def analyze_comment_sentiment(self, comment_text: str) -> Dict[str, float]:
+        """
+        Analyze sentiment of a single comment.
+
+        Args:
+            comment_text (str): The comment text to analyze
+
+        Returns:
+            Dict[str, float]: Sentiment scores with keys 'positive', 'negative', 'neutral'
+        """
+        scores, _ = self.score(comment_text)
+        return scores
+
+    def is_confident(self, confidence: float) -> bool:
+        """Whether a score() confidence is high enough to skip the LLM"""
+        return confidence >= self.confidence_threshold
+
+
+# Global lexicon analyzer instance
+lexicon_analyzer = LexiconSentimentAnalyzer(
+    confidence_threshold=float(os.getenv('SENTIMENT_LEXICON_CONFIDENCE', 0.5))
+)
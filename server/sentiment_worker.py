@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Sentiment Worker
+
+Processes the Sentiment_Jobs queue filled by the comment endpoints. Each job
+classifies the new comments of one content item, stores their sentiment in
+Comment_Sentiment and updates the running sums in Content_Metrics. Run it next to the web server:
+
+Usage:
+    python sentiment_worker.py            # process jobs until stopped
+    python sentiment_worker.py --once     # drain available jobs and exit
+    python sentiment_worker.py --migrate  # apply the sentiment migrations first
+"""
+
+import os
+import sys
+import time
+import signal
+import logging
+import mysql.connector
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+from sentiment_analysis import get_db_connection, refresh_content_sentiment
+from sentiment_jobs import sentiment_job_queue
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = float(os.getenv('SENTIMENT_WORKER_POLL_INTERVAL', 2))
+BATCH_SIZE = int(os.getenv('SENTIMENT_WORKER_BATCH_SIZE', 10))
+
+_stopping = False
+
+
+def _request_stop(signum, frame):
+    global _stopping
+    logger.info("Sentiment worker stopping after the current job")
+    _stopping = True
+
+
+MIGRATIONS = ['sentiment_jobs_migration.sql', 'comment_sentiment_migration.sql']
+
+
+def run_migration(connection, migration_file: str):
+    """Apply a migration file, skipping objects that already exist"""
+    cursor = connection.cursor()
+    with open(migration_file, 'r', encoding='utf-8') as file:
+        sql_content = file.read()
+
+    # Drop comment lines, then split into statements
+    sql_content = '\n'.join(line for line in sql_content.splitlines() if not line.strip().startswith('--'))
+    statements = [stmt.strip() for stmt in sql_content.split(';') if stmt.strip()]
+
+    for i, statement in enumerate(statements):
+        try:
+            cursor.execute(statement)
+            print(f"Executed statement {i+1}/{len(statements)}")
+        except mysql.connector.Error as e:
+            if any(marker in str(e).lower() for marker in ("duplicate key name", "duplicate column name", "already exists")):
+                print(f"Statement {i+1} skipped (already exists): {e}")
+            else:
+                raise
+
+    connection.commit()
+    cursor.close()
+
+
+def process_available_jobs(connection) -> int:
+    """
+    Claim and process one batch of available jobs
+
+    Args:
+        connection: Database connection
+
+    Returns:
+        Number of jobs processed
+    """
+    jobs = sentiment_job_queue.claim(connection, limit=BATCH_SIZE)
+
+    for job in jobs:
+        try:
+            refresh_content_sentiment(job['Content_ID'], connection)
+            sentiment_job_queue.complete(connection, job)
+        except Exception as e:
+            logger.error(f"Sentiment job for content {job['Content_ID']} failed: {str(e)}")
+            connection.rollback()
+            sentiment_job_queue.fail(connection, job, str(e))
+
+    return len(jobs)
+
+
+def run_worker(once: bool = False):
+    """
+    Process jobs until stopped
+
+    Args:
+        once: Exit as soon as no job is available
+    """
+    connection = None
+
+    while not _stopping:
+        try:
+            if connection is None or not connection.is_connected():
+                connection = get_db_connection()
+                if connection is None:
+                    time.sleep(POLL_INTERVAL)
+                    continue
+
+            released = sentiment_job_queue.release_stale(connection)
+            if released:
+                logger.warning(f"Released {released} stale sentiment job(s)")
+
+            processed = process_available_jobs(connection)
+        except mysql.connector.Error as e:
+            logger.error(f"Database error in sentiment worker: {str(e)}")
+            try:
+                connection.close()
+            except Exception:
+                pass
+            connection = None
+            processed = 0
+
+        if processed == 0:
+            if once:
+                break
+            time.sleep(POLL_INTERVAL)
+
+    if connection is not None:
+        connection.close()
+
+
+if __name__ == "__main__":
+    signal.signal(signal.SIGTERM, _request_stop)
+    signal.signal(signal.SIGINT, _request_stop)
+
+    if '--migrate' in sys.argv:
+        migration_connection = get_db_connection()
+        if migration_connection is None:
+            print("❌ Could not connect to the database")
+            sys.exit(1)
+        try:
+            for migration_file in MIGRATIONS:
+                print(f"Applying {migration_file}")
+                run_migration(migration_connection, migration_file)
+        finally:
+            migration_connection.close()
+
+    logger.info("Sentiment worker started")
+    run_worker(once='--once' in sys.argv)
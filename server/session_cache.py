@@ -0,0 +1,143 @@
+"""
+Session Cache Module for LawFort Application
+
+This module keeps a bounded, in-process LRU cache that maps session tokens
+to the authenticated user's ID, role and super-admin flag. It lets
+require_permission resolve warm sessions without touching the database.
+
+Entries expire after a short TTL so that changes made by other gunicorn
+workers (which keep their own cache) are picked up quickly. Routes that
+end a session or change a user's role/status invalidate entries explicitly.
+"""
+
+import os
+import time
+import threading
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedSession:
+    """Authenticated identity resolved from a session token"""
+    user_id: int
+    role_id: int
+    is_super_admin: bool
+    expires_at: float
+
+
+class SessionCache:
+    """
+    Thread-safe LRU cache of session token -> CachedSession with a TTL
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 60.0):
+        """
+        Initialize the session cache
+
+        Args:
+            max_size: Maximum number of tokens kept before evicting the least recently used
+            ttl_seconds: Seconds an entry stays valid after it was loaded from the database
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, session_token: str) -> Optional[CachedSession]:
+        """
+        Look up a session token
+
+        Args:
+            session_token: Session token sent by the client
+
+        Returns:
+            CachedSession if the token is cached and not expired, otherwise None
+        """
+        with self._lock:
+            entry = self._entries.get(session_token)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            if entry.expires_at <= time.monotonic():
+                del self._entries[session_token]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(session_token)
+            self.hits += 1
+            return entry
+
+    def set(self, session_token: str, user_id: int, role_id: int, is_super_admin: bool) -> CachedSession:
+        """
+        Cache the identity behind a session token
+
+        Args:
+            session_token: Session token sent by the client
+            user_id: ID of the session owner
+            role_id: Role_ID of the session owner
+            is_super_admin: Whether the session owner is a super admin
+
+        Returns:
+            The cached entry
+        """
+        entry = CachedSession(
+            user_id=user_id,
+            role_id=role_id,
+            is_super_admin=bool(is_super_admin),
+            expires_at=time.monotonic() + self.ttl_seconds
+        )
+
+        with self._lock:
+            self._entries[session_token] = entry
+            self._entries.move_to_end(session_token)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+        return entry
+
+    def invalidate(self, session_token: str):
+        """Drop a single session token (e.g. on logout)"""
+        with self._lock:
+            self._entries.pop(session_token, None)
+
+    def invalidate_user(self, user_id: int):
+        """Drop every cached session belonging to a user (e.g. on role or status change)"""
+        with self._lock:
+            stale_tokens = [token for token, entry in self._entries.items() if entry.user_id == user_id]
+            for token in stale_tokens:
+                del self._entries[token]
+
+        if stale_tokens:
+            logger.info(f"Invalidated {len(stale_tokens)} cached session(s) for user {user_id}")
+
+    def clear(self):
+        """Drop all cached sessions"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> dict:
+        """Get cache size and hit/miss counters"""
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+
+# Global session cache instance
+session_cache = SessionCache(
+    max_size=int(os.getenv('SESSION_CACHE_SIZE', 10000)),
+    ttl_seconds=float(os.getenv('SESSION_CACHE_TTL', 60))
+)
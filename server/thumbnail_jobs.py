@@ -0,0 +1,278 @@
+"""
+Background Thumbnail Generation for Research Papers
+
+Rendering the first page of a PDF (pdf2image/poppler, smart crop, LANCZOS
+resize, sharpening) takes seconds. Research paper routes used to do it inline
+while holding the request's database transaction and a sync worker.
+
+Routes now commit first and hand the PDF to this pipeline. The content item
+gets a placeholder thumbnail URL right away; the page is rendered in a small
+process pool and Content.Thumbnail_URL is updated when the render finishes.
+The update only applies while the placeholder is still stored, so a
+thumbnail set by the author in the meantime is never overwritten.
+
+The process pool is created lazily in each gunicorn worker, after the fork
+from the preloading master.
+"""
+
+import os
+import time
+import threading
+import logging
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional
+
+from utils.pdf_thumbnail import generate_research_paper_thumbnail
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_DIR = os.path.join(os.getcwd(), 'uploads', 'thumbnails', 'research_papers')
+THUMBNAIL_BASE_URL = "http://localhost:5000/uploads/thumbnails/research_papers"
+PLACEHOLDER_FILENAME = 'pending.jpg'
+
+
+def render_research_paper_thumbnail(pdf_path: str, content_id: int, user_id: int):
+    """Render a thumbnail in a pool process; returns (success, thumbnail_url, error)"""
+    return generate_research_paper_thumbnail(pdf_path, content_id, user_id)
+
+
+class ThumbnailPipeline:
+    """
+    Process pool that renders research paper thumbnails off the request path
+    """
+
+    def __init__(self, max_workers: int = 2, max_tracked: int = 1000):
+        """
+        Initialize the pipeline
+
+        Args:
+            max_workers: Render processes per web worker
+            max_tracked: Finished jobs whose status is kept for status queries
+        """
+        self.max_workers = max(1, max_workers)
+        self.max_tracked = max_tracked
+        self.connection_pool = None
+        self._reset_process_state()
+
+    def _reset_process_state(self):
+        self._executor = None
+        self._jobs: "OrderedDict[int, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_job_id = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._pid = os.getpid()
+
+    def init_pool(self, connection_pool):
+        """
+        Set the connection pool used to store finished thumbnails
+
+        Args:
+            connection_pool: MySQL connection pool instance
+        """
+        self.connection_pool = connection_pool
+
+    @property
+    def placeholder_url(self) -> str:
+        return f"{THUMBNAIL_BASE_URL}/{PLACEHOLDER_FILENAME}"
+
+    def is_placeholder(self, thumbnail_url: Optional[str]) -> bool:
+        return thumbnail_url == self.placeholder_url
+
+    def _ensure_placeholder(self):
+        placeholder_path = os.path.join(THUMBNAIL_DIR, PLACEHOLDER_FILENAME)
+        if os.path.exists(placeholder_path):
+            return
+
+        from PIL import Image, ImageDraw
+
+        os.makedirs(THUMBNAIL_DIR, exist_ok=True)
+        image = Image.new('RGB', (400, 250), '#f3f4f6')
+        draw = ImageDraw.Draw(image)
+        draw.rectangle([0, 0, 399, 249], outline='#e5e7eb')
+        draw.text((150, 118), "Generating preview...", fill='#6b7280')
+
+        # Several workers may get here at once; publish the file atomically
+        temp_path = f"{placeholder_path}.{os.getpid()}.tmp"
+        image.save(temp_path, 'JPEG', quality=85)
+        os.replace(temp_path, placeholder_path)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Called with self._lock held
+        if self._executor is None:
+            # fork so pool processes do not re-import the app module
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('fork')
+            )
+        return self._executor
+
+    def submit(self, content_id: int, user_id: int, pdf_path: str,
+               fallback_url: Optional[str] = None) -> str:
+        """
+        Queue a thumbnail render for a research paper
+
+        The caller stores the returned placeholder URL in Content.Thumbnail_URL
+        (in its own transaction) before or while the render runs.
+
+        Args:
+            content_id: Content ID of the research paper
+            user_id: User ID of the author (part of the thumbnail file name)
+            pdf_path: Path of the uploaded PDF
+            fallback_url: Thumbnail URL to store if rendering fails
+
+        Returns:
+            Placeholder thumbnail URL
+        """
+        # Executors and locks do not survive fork; start fresh in each worker
+        if self._pid != os.getpid():
+            self._reset_process_state()
+
+        try:
+            self._ensure_placeholder()
+        except Exception as e:
+            logger.warning(f"Failed to create placeholder thumbnail: {str(e)}")
+
+        with self._lock:
+            self._next_job_id += 1
+            job = {
+                'job_id': self._next_job_id,
+                'content_id': content_id,
+                'status': 'queued',
+                'fallback_url': fallback_url,
+                'thumbnail_url': None,
+                'error': None,
+                'requested_at': time.time(),
+                'completed_at': None
+            }
+            self._jobs[content_id] = job
+            self._jobs.move_to_end(content_id)
+            self._prune()
+            self._submitted += 1
+
+            try:
+                future = self._get_executor().submit(render_research_paper_thumbnail, pdf_path, content_id, user_id)
+            except BrokenProcessPool:
+                # A render process died (e.g. out of memory); replace the pool
+                self._executor = None
+                future = self._get_executor().submit(render_research_paper_thumbnail, pdf_path, content_id, user_id)
+
+        future.add_done_callback(lambda f: self._finish(job, f))
+        return self.placeholder_url
+
+    def _prune(self):
+        # Called with self._lock held; drop the oldest finished jobs
+        while len(self._jobs) > self.max_tracked:
+            oldest_id, oldest = next(iter(self._jobs.items()))
+            if oldest['status'] == 'queued':
+                break
+            del self._jobs[oldest_id]
+
+    def _finish(self, job: Dict, future):
+        try:
+            success, thumbnail_url, error = future.result()
+        except BrokenProcessPool as e:
+            with self._lock:
+                self._executor = None
+            success, thumbnail_url, error = False, None, f"Render process died: {str(e)}"
+        except Exception as e:
+            success, thumbnail_url, error = False, None, str(e)
+
+        if not success:
+            logger.warning(f"Thumbnail generation failed for research paper {job['content_id']}: {error}")
+
+        with self._lock:
+            superseded = self._jobs.get(job['content_id']) is not job
+
+        stored_url = thumbnail_url if success else (job['fallback_url'] or '')
+        if not superseded:
+            try:
+                self._store(job['content_id'], stored_url)
+            except Exception as e:
+                success, error = False, f"Failed to store thumbnail URL: {str(e)}"
+                logger.error(f"Failed to store thumbnail for research paper {job['content_id']}: {str(e)}")
+
+        with self._lock:
+            job['status'] = 'ready' if success else 'failed'
+            job['thumbnail_url'] = thumbnail_url if success else None
+            job['error'] = error
+            job['completed_at'] = time.time()
+            if success:
+                self._completed += 1
+            else:
+                self._failed += 1
+
+    def _store(self, content_id: int, thumbnail_url: str):
+        if self.connection_pool is None:
+            raise RuntimeError("Thumbnail pipeline has no connection pool")
+
+        connection = self.connection_pool.get_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute("""
+                UPDATE Content SET Thumbnail_URL = %s
+                WHERE Content_ID = %s AND Thumbnail_URL = %s
+            """, (thumbnail_url, content_id, self.placeholder_url))
+            connection.commit()
+            cursor.close()
+        finally:
+            connection.close()
+
+    def get_status(self, content_id: int) -> Optional[Dict]:
+        """
+        Get the state of the latest thumbnail job of a research paper
+
+        Args:
+            content_id: Content ID of the research paper
+
+        Returns:
+            Job status dict, or None if this worker has not seen a job for it
+        """
+        if self._pid != os.getpid():
+            return None
+
+        with self._lock:
+            job = self._jobs.get(content_id)
+            if job is None:
+                return None
+            return {
+                'status': job['status'],
+                'thumbnail_url': job['thumbnail_url'],
+                'error': job['error'],
+                'requested_at': job['requested_at'],
+                'completed_at': job['completed_at']
+            }
+
+    def shutdown(self, wait: bool = True):
+        """Stop the pool, by default after queued renders finished"""
+        if self._pid != os.getpid():
+            return
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def get_stats(self) -> Dict:
+        """Get pipeline counters of this worker"""
+        if self._pid != os.getpid():
+            self._reset_process_state()
+        with self._lock:
+            return {
+                'max_workers': self.max_workers,
+                'queued': sum(1 for job in self._jobs.values() if job['status'] == 'queued'),
+                'submitted': self._submitted,
+                'completed': self._completed,
+                'failed': self._failed
+            }
+
+
+# Global thumbnail pipeline instance
+thumbnail_pipeline = ThumbnailPipeline(
+    max_workers=int(os.getenv('THUMBNAIL_WORKERS', 2))
+)
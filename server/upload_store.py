@@ -0,0 +1,298 @@
+"""
+Content-Addressed Storage for Uploaded PDFs
+
+The same PDF used to be stored once per upload under a new timestamped name,
+and every copy got its own thumbnail and text extraction. Uploads are now
+streamed into uploads/objects/<aa>/<sha256>.pdf while being hashed; the first
+upload of a file keeps the object, later uploads of the same bytes discard
+their temporary copy. The friendly, timestamped name the API has always
+returned is a hard link to the object (a symlink or, as a last resort, a
+copy where hard links are not supported), so existing URLs and file routes
+keep working.
+
+Derived data is cached next to the object under the same hash: extracted
+page texts here (filled by pdf_text.py), thumbnails by utils.pdf_thumbnail.
+
+Upload routes read the multipart body themselves (open_multipart_file)
+instead of going through request.files, so the file is hashed and written in
+fixed-size chunks as it arrives. Each route passes its own size limit and the
+expected magic bytes; an oversized or non-PDF upload is rejected as soon as
+that is known, and nothing is published under the object name until the
+whole file was received.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import logging
+from typing import BinaryIO, List, NamedTuple, Optional
+
+from werkzeug.http import parse_options_header
+from werkzeug.sansio.multipart import MultipartDecoder, File, Data, Epilogue, NEED_DATA
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+# Room for multipart boundaries and part headers on top of the file itself
+MULTIPART_OVERHEAD = 64 * 1024
+# PDF readers accept the header anywhere in the first 1024 bytes
+PDF_MAGIC = b'%PDF-'
+MAGIC_WINDOW = 1024
+
+
+class UploadError(Exception):
+    """Raised when an upload is rejected; carries the HTTP status to answer with"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class StoredUpload(NamedTuple):
+    """Result of storing an upload"""
+    sha256: str
+    size: int
+    path: str
+    deduplicated: bool
+
+
+class MultipartFileStream:
+    """
+    File-like reader over one file field of a multipart/form-data body
+
+    The body is decoded incrementally from the WSGI input stream, so at most
+    one chunk of it is held in memory at a time.
+    """
+
+    def __init__(self, input_stream: BinaryIO, boundary: bytes, field_name: str):
+        """
+        Initialize the reader
+
+        Args:
+            input_stream: Request body stream (request.stream)
+            boundary: Multipart boundary from the Content-Type header
+            field_name: Form field holding the file
+        """
+        self._input = input_stream
+        self._decoder = MultipartDecoder(boundary)
+        self._field_name = field_name
+        self._pending = b''
+        self._in_file = False
+        self._done = False
+        self.filename = None
+
+    def _next_event(self):
+        try:
+            while True:
+                event = self._decoder.next_event()
+                if event is not NEED_DATA:
+                    return event
+                chunk = self._input.read(CHUNK_SIZE)
+                self._decoder.receive_data(chunk or None)
+                if not chunk:
+                    # The decoder has seen the end of the body; anything but the epilogue means it was cut off
+                    event = self._decoder.next_event()
+                    if event is NEED_DATA:
+                        raise UploadError("Upload was interrupted")
+                    return event
+        except ValueError:
+            raise UploadError("Upload was interrupted or is not valid multipart/form-data")
+
+    def open(self) -> bool:
+        """
+        Skip ahead to the file field
+
+        Returns:
+            True if the field was found; its file name is in self.filename
+        """
+        while True:
+            event = self._next_event()
+            if isinstance(event, File) and event.name == self._field_name:
+                self.filename = event.filename
+                self._in_file = True
+                return True
+            if isinstance(event, Epilogue):
+                return False
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to size bytes of the file (everything if size < 0)"""
+        while not self._done and (size < 0 or len(self._pending) < size):
+            event = self._next_event()
+            if isinstance(event, Data):
+                self._pending += event.data
+                if not event.more_data:
+                    self._done = True
+            elif isinstance(event, Epilogue):
+                self._done = True
+
+        if size < 0:
+            data, self._pending = self._pending, b''
+        else:
+            data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+
+def open_multipart_file(request, field_name: str, max_size: int) -> Optional[MultipartFileStream]:
+    """
+    Start streaming a file field of a multipart request
+
+    Args:
+        request: Flask request; request.files must not have been touched
+        field_name: Form field holding the file
+        max_size: Largest accepted file size in bytes
+
+    Returns:
+        MultipartFileStream positioned at the file data, or None if the request has no such field
+    """
+    mimetype, options = parse_options_header(request.headers.get('Content-Type', ''))
+    if mimetype != 'multipart/form-data' or 'boundary' not in options:
+        return None
+
+    # Reject what is certainly too large before reading any of it
+    if request.content_length and request.content_length > max_size + MULTIPART_OVERHEAD:
+        raise UploadError(f"File size must be less than {_size_label(max_size)}", 413)
+
+    upload = MultipartFileStream(request.stream, options['boundary'].encode('latin-1'), field_name)
+    return upload if upload.open() else None
+
+
+def _size_label(size: int) -> str:
+    return f"{size // (1024 * 1024)}MB" if size >= 1024 * 1024 else f"{size // 1024}KB"
+
+
+def file_sha256(path: str) -> str:
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class UploadStore:
+    """
+    Stores uploaded files once per content hash
+    """
+
+    def __init__(self, root: str):
+        """
+        Initialize the store
+
+        Args:
+            root: Directory holding the hashed objects
+        """
+        self.root = root
+
+    def object_path(self, sha256: str, extension: str = '.pdf') -> str:
+        """Path of the object (or derived file) with the given hash"""
+        return os.path.join(self.root, sha256[:2], f"{sha256}{extension}")
+
+    def save(self, stream: BinaryIO, folder: str, filename: str, extension: str = '.pdf',
+             max_size: Optional[int] = None, magic: Optional[bytes] = None) -> StoredUpload:
+        """
+        Store an upload and expose it under a friendly name
+
+        Args:
+            stream: Readable file object positioned at the start of the upload
+            folder: Directory of the friendly name (e.g. uploads/research_papers)
+            filename: Friendly file name inside folder
+            extension: Extension of the stored object
+            max_size: Largest accepted size in bytes, enforced while reading
+            magic: Bytes that must occur in the first 1024 bytes (e.g. PDF_MAGIC)
+
+        Returns:
+            StoredUpload with the content hash, size and friendly path
+
+        Raises:
+            UploadError: If the upload is too large or does not match the magic bytes
+        """
+        os.makedirs(self.root, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        head = b''
+
+        # Hash while writing, so the upload is read once
+        fd, temp_path = tempfile.mkstemp(dir=self.root, suffix='.upload')
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                for chunk in iter(lambda: stream.read(CHUNK_SIZE), b''):
+                    size += len(chunk)
+                    if max_size is not None and size > max_size:
+                        raise UploadError(f"File size must be less than {_size_label(max_size)}", 413)
+
+                    if magic is not None and head is not None:
+                        head += chunk[:MAGIC_WINDOW - len(head)]
+                        if magic in head:
+                            head = None
+                        elif len(head) >= MAGIC_WINDOW:
+                            raise UploadError(f"File content is not a valid {extension.lstrip('.').upper()}")
+
+                    digest.update(chunk)
+                    temp_file.write(chunk)
+
+            if magic is not None and head is not None:
+                raise UploadError(f"File content is not a valid {extension.lstrip('.').upper()}")
+
+            sha256 = digest.hexdigest()
+            object_path = self.object_path(sha256, extension)
+            deduplicated = os.path.exists(object_path)
+            if not deduplicated:
+                # mkstemp creates the file owner-only; stored uploads are served by the web server
+                os.chmod(temp_path, 0o644)
+                os.makedirs(os.path.dirname(object_path), exist_ok=True)
+                os.replace(temp_path, object_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, filename)
+        self._link(object_path, path)
+
+        if deduplicated:
+            logger.info(f"Upload {filename} matches stored object {sha256[:12]}, no new copy kept")
+        return StoredUpload(sha256=sha256, size=size, path=path, deduplicated=deduplicated)
+
+    def _link(self, object_path: str, path: str):
+        if os.path.lexists(path):
+            os.remove(path)
+        try:
+            os.link(object_path, path)
+            return
+        except OSError as e:
+            logger.debug(f"Hard link failed for {path}: {e}")
+        try:
+            os.symlink(os.path.relpath(object_path, os.path.dirname(path)), path)
+            return
+        except OSError as e:
+            logger.debug(f"Symlink failed for {path}: {e}")
+        shutil.copyfile(object_path, path)
+
+    def get_pages(self, sha256: str) -> Optional[List[str]]:
+        """
+        Get the cached page texts of an object
+
+        Returns:
+            Text of each extracted page, or None if it was not extracted yet
+        """
+        try:
+            with open(self.object_path(sha256, '.pages.json'), 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def set_pages(self, sha256: str, pages: List[str]):
+        """Cache the page texts of an object"""
+        path = self.object_path(sha256, '.pages.json')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(pages, file)
+        os.replace(temp_path, path)
+
+
+# Global upload store instance
+upload_store = UploadStore(os.getenv('UPLOAD_OBJECTS_DIR', os.path.join(os.getcwd(), 'uploads', 'objects')))
@@ -7,8 +7,11 @@ for research papers in the LawFort application.
 
 import os
 import io
+import math
+import time
+import hashlib
 import logging
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 from PIL import Image
 import PyPDF2
 
@@ -22,7 +25,8 @@ class PDFThumbnailGenerator:
     A utility class for generating thumbnails from PDF files.
     """
     
-    def __init__(self, thumbnail_width: int = 400, thumbnail_height: int = 250, quality: int = 85):
+    def __init__(self, thumbnail_width: int = 400, thumbnail_height: int = 250, quality: int = 85,
+                 preview_width: int = 200, oversample: float = 1.5, max_render_width: int = 1600):
         """
         Initialize the PDF thumbnail generator.
         
@@ -30,18 +34,29 @@ class PDFThumbnailGenerator:
             thumbnail_width (int): Width of the generated thumbnail
             thumbnail_height (int): Height of the generated thumbnail
             quality (int): JPEG quality for the thumbnail (1-100)
+            preview_width (int): Width of the low-resolution page preview used to find the content area
+            oversample (float): Render the content area this many times wider than the thumbnail
+                so downscaling stays sharp
+            max_render_width (int): Upper bound of the rendered page width in pixels
         """
         self.thumbnail_width = thumbnail_width
         self.thumbnail_height = thumbnail_height
         self.quality = quality
+        self.preview_width = preview_width
+        self.oversample = oversample
+        self.max_render_width = max_render_width
+        self._poppler_path = None
         
-    def generate_thumbnail(self, pdf_path: str, output_path: str) -> Tuple[bool, Optional[str]]:
+    def generate_thumbnail(self, pdf_path: str, output_path: str,
+                           allow_fallback: bool = True) -> Tuple[bool, Optional[str]]:
         """
         Generate a thumbnail image from the first page of a PDF file.
         
         Args:
             pdf_path (str): Path to the source PDF file
             output_path (str): Path where the thumbnail should be saved
+            allow_fallback (bool): Write the PyPDF2 placeholder when pdf2image cannot render
+                the page; if False, report the pdf2image failure instead
             
         Returns:
             Tuple[bool, Optional[str]]: (success, error_message)
@@ -57,58 +72,30 @@ class PDFThumbnailGenerator:
             
             # Try to use pdf2image first (better quality)
             try:
-                from pdf2image import convert_from_path
-
-                # For Windows, we might need to specify poppler path
-                # Try to load local poppler config first, then fallback to common paths
-                poppler_paths = [None]  # Start with system PATH
-
-                # Try to load local poppler configuration
-                try:
-                    from poppler_config import POPPLER_PATH
-                    poppler_paths.insert(0, POPPLER_PATH)  # Try local config first
-                    logger.info(f"Using local poppler installation: {POPPLER_PATH}")
-                except ImportError:
-                    logger.info("No local poppler config found, trying system paths")
-
-                # Add common Windows paths as fallbacks
-                poppler_paths.extend([
-                    os.path.join(os.path.dirname(__file__), "..", "poppler-24.08.0", "Library", "bin"),  # Your specific installation in Backend folder
-                    os.path.join(os.path.dirname(os.path.dirname(__file__)), "poppler-24.08.0", "Library", "bin"),  # Alternative path
-                    os.path.join(os.path.dirname(os.path.dirname(__file__)), "poppler", "bin"),  # Generic local installation
-                    r"C:\Program Files\poppler\bin",
-                    r"C:\Program Files (x86)\poppler\bin",
-                    r"C:\poppler\bin"
-                ])
-
-                pages = None
-                for poppler_path in poppler_paths:
-                    try:
-                        logger.info(f"Trying poppler path: {poppler_path}")
-                        if poppler_path and os.path.exists(poppler_path):
-                            logger.info(f"Path exists, attempting conversion with: {poppler_path}")
-                            # Use higher DPI for better quality and enable transparency
-                            pages = convert_from_path(pdf_path, first_page=1, last_page=1, dpi=300, poppler_path=poppler_path, fmt='PNG')
-                        elif not poppler_path:
-                            logger.info("Trying system PATH")
-                            # Use higher DPI for better quality and enable transparency
-                            pages = convert_from_path(pdf_path, first_page=1, last_page=1, dpi=300, fmt='PNG')
-                        else:
-                            logger.warning(f"Path does not exist: {poppler_path}")
-                            continue
-
-                        logger.info(f"SUCCESS: Generated thumbnail using poppler path: {poppler_path}")
-                        break  # If successful, break out of the loop
-                    except Exception as e:
-                        logger.warning(f"Failed with poppler path {poppler_path}: {str(e)}")
-                        continue
-
-                if pages:
-                    # Get the first page
-                    page_image = pages[0]
-
-                    # Apply intelligent cropping and scaling
-                    thumbnail = self._create_smart_thumbnail(page_image)
+                # Find the content area on a small grayscale preview of the page
+                preview = self._convert_first_page(pdf_path, size=(self.preview_width, None), grayscale=True)
+
+                page_image = None
+                if preview is not None:
+                    left, top, right, bottom = self._detect_content_box(preview)
+
+                    # Render just wide enough for the cropped content to fill the thumbnail width,
+                    # instead of the whole page at 300 DPI
+                    render_width = math.ceil(self.thumbnail_width * self.oversample / (right - left))
+                    render_width = min(render_width, self.max_render_width)
+                    page_image = self._convert_first_page(pdf_path, size=(render_width, None))
+
+                if page_image is not None:
+                    cropped_image = page_image.crop((
+                        int(left * page_image.width),
+                        int(top * page_image.height),
+                        math.ceil(right * page_image.width),
+                        math.ceil(bottom * page_image.height)
+                    ))
+                    logger.info(f"Rendered page at {page_image.size}, content area {cropped_image.size}")
+
+                    # Scale, crop and sharpen; the content area is already cropped
+                    thumbnail = self._create_smart_thumbnail(cropped_image, auto_crop=False)
 
                     # Save as JPEG with high quality
                     thumbnail.save(output_path, 'JPEG', quality=95, optimize=True)
@@ -116,14 +103,20 @@ class PDFThumbnailGenerator:
                     logger.info(f"Thumbnail generated successfully using pdf2image: {output_path}")
                     return True, None
                 else:
+                    if not allow_fallback:
+                        return False, "pdf2image failed to convert PDF"
                     logger.warning("pdf2image failed to convert PDF, falling back to PyPDF2 method")
                     return self._generate_with_pypdf2(pdf_path, output_path)
 
             except ImportError:
+                if not allow_fallback:
+                    return False, "pdf2image not available"
                 # Fallback to PyPDF2 + PIL approach
                 logger.warning("pdf2image not available, falling back to PyPDF2 method")
                 return self._generate_with_pypdf2(pdf_path, output_path)
             except Exception as pdf2image_error:
+                if not allow_fallback:
+                    return False, f"pdf2image failed: {str(pdf2image_error)}"
                 # If pdf2image fails for any reason, fallback to PyPDF2
                 logger.warning(f"pdf2image failed: {str(pdf2image_error)}, falling back to PyPDF2 method")
                 return self._generate_with_pypdf2(pdf_path, output_path)
@@ -133,6 +126,106 @@ class PDFThumbnailGenerator:
             logger.error(error_msg)
             return False, error_msg
     
+    def _poppler_paths(self) -> List[Optional[str]]:
+        """
+        Candidate poppler installations, most specific first.
+
+        Returns:
+            List[Optional[str]]: Directories with the poppler binaries; None means the system PATH
+        """
+        # For Windows, we might need to specify poppler path
+        # Try to load local poppler config first, then fallback to common paths
+        poppler_paths = [None]  # Start with system PATH
+
+        # Try to load local poppler configuration
+        try:
+            from poppler_config import POPPLER_PATH
+            poppler_paths.insert(0, POPPLER_PATH)  # Try local config first
+            logger.info(f"Using local poppler installation: {POPPLER_PATH}")
+        except ImportError:
+            logger.info("No local poppler config found, trying system paths")
+
+        # Add common Windows paths as fallbacks
+        poppler_paths.extend([
+            os.path.join(os.path.dirname(__file__), "..", "poppler-24.08.0", "Library", "bin"),  # Your specific installation in Backend folder
+            os.path.join(os.path.dirname(os.path.dirname(__file__)), "poppler-24.08.0", "Library", "bin"),  # Alternative path
+            os.path.join(os.path.dirname(os.path.dirname(__file__)), "poppler", "bin"),  # Generic local installation
+            r"C:\Program Files\poppler\bin",
+            r"C:\Program Files (x86)\poppler\bin",
+            r"C:\poppler\bin"
+        ])
+        return poppler_paths
+
+    def _convert_first_page(self, pdf_path: str, **options) -> Optional[Image.Image]:
+        """
+        Render the first page of a PDF with pdf2image.
+
+        The poppler installation that worked is remembered, so the preview and the
+        final render do not probe the fallback paths twice.
+
+        Args:
+            pdf_path (str): Path to the source PDF file
+            **options: Extra convert_from_path options, e.g. size=(width, None) to have
+                poppler scale the page to a width (its -scale-to option)
+
+        Returns:
+            Optional[Image.Image]: Rendered page, or None if no poppler installation worked
+        """
+        from pdf2image import convert_from_path
+
+        poppler_paths = [self._poppler_path] if self._poppler_path is not None else self._poppler_paths()
+
+        for poppler_path in poppler_paths:
+            try:
+                if poppler_path and os.path.exists(poppler_path):
+                    pages = convert_from_path(pdf_path, first_page=1, last_page=1, poppler_path=poppler_path,
+                                              fmt='PNG', **options)
+                elif not poppler_path:
+                    pages = convert_from_path(pdf_path, first_page=1, last_page=1, fmt='PNG', **options)
+                else:
+                    continue
+
+                if pages:
+                    self._poppler_path = poppler_path or ''
+                    return pages[0]
+            except Exception as e:
+                logger.warning(f"Failed with poppler path {poppler_path}: {str(e)}")
+                continue
+
+        return None
+
+    def _detect_content_box(self, preview: Image.Image) -> Tuple[float, float, float, float]:
+        """
+        Find the content area (non-white pixels plus padding) on a page preview.
+
+        Args:
+            preview (Image.Image): Low-resolution render of the page
+
+        Returns:
+            Tuple[float, float, float, float]: (left, top, right, bottom) as fractions of the page size
+        """
+        gray = preview.convert('L')
+
+        # Consider pixels with value < 250 as content (not pure white)
+        bbox = gray.point(lambda pixel: 255 if pixel < 250 else 0).getbbox()
+
+        if not bbox:
+            # If no content detected, keep the page with minimal crop
+            return 0.05, 0.05, 0.95, 0.95
+
+        left, top, right, bottom = bbox
+
+        # Add minimal padding around content (2% of the page, at least one preview pixel)
+        padding_x = max(1, int(gray.width * 0.02))
+        padding_y = max(1, int(gray.height * 0.02))
+
+        left = max(0, left - padding_x)
+        top = max(0, top - padding_y)
+        right = min(gray.width, right + padding_x)
+        bottom = min(gray.height, bottom + padding_y)
+
+        return left / gray.width, top / gray.height, right / gray.width, bottom / gray.height
+
     def _generate_with_pypdf2(self, pdf_path: str, output_path: str) -> Tuple[bool, Optional[str]]:
         """
         Fallback method using PyPDF2 (creates a simple placeholder).
@@ -168,12 +261,14 @@ class PDFThumbnailGenerator:
             logger.error(error_msg)
             return False, error_msg
     
-    def _create_smart_thumbnail(self, image: Image.Image) -> Image.Image:
+    def _create_smart_thumbnail(self, image: Image.Image, auto_crop: bool = True) -> Image.Image:
         """
         Create a smart thumbnail with intelligent cropping and scaling.
 
         Args:
             image (Image.Image): Source PDF page image
+            auto_crop (bool): Detect and crop the content area first (skip when the
+                image is already cropped)
 
         Returns:
             Image.Image: Processed thumbnail image
@@ -184,7 +279,7 @@ class PDFThumbnailGenerator:
                 image = image.convert('RGB')
 
             # Step 1: Detect and crop content area (remove excessive white margins)
-            cropped_image = self._auto_crop_content(image)
+            cropped_image = self._auto_crop_content(image) if auto_crop else image
 
             # Step 2: Scale to fill thumbnail width while maintaining aspect ratio
             scaled_image = self._scale_to_fill_width(cropped_image)
@@ -653,9 +748,17 @@ def generate_research_paper_thumbnail(pdf_path: str, content_id: int, user_id: i
         Tuple[bool, Optional[str], Optional[str]]: (success, thumbnail_url, error_message)
     """
     try:
-        # Create thumbnail filename
-        timestamp = str(int(os.path.getmtime(pdf_path))) if os.path.exists(pdf_path) else "unknown"
-        thumbnail_filename = f"research_paper_{user_id}_{content_id}_{timestamp}.jpg"
+        if not os.path.exists(pdf_path):
+            return False, None, f"PDF file not found: {pdf_path}"
+
+        # Name the thumbnail by the PDF's content hash, so the same PDF uploaded
+        # again (or by another paper) reuses the thumbnail rendered for it
+        digest = hashlib.sha256()
+        with open(pdf_path, 'rb') as pdf_file:
+            for chunk in iter(lambda: pdf_file.read(64 * 1024), b''):
+                digest.update(chunk)
+        thumbnail_filename = f"research_paper_{digest.hexdigest()}.jpg"
+        thumbnail_url = f"http://localhost:5000/uploads/thumbnails/research_papers/{thumbnail_filename}"
         
         # Create thumbnail directory
         thumbnail_dir = os.path.join(os.getcwd(), 'uploads', 'thumbnails', 'research_papers')
@@ -663,17 +766,30 @@ def generate_research_paper_thumbnail(pdf_path: str, content_id: int, user_id: i
         
         # Full path for thumbnail
         thumbnail_path = os.path.join(thumbnail_dir, thumbnail_filename)
+        if os.path.exists(thumbnail_path):
+            logger.info(f"Reusing thumbnail {thumbnail_filename} for research paper {content_id}")
+            return True, thumbnail_url, None
         
-        # Generate thumbnail
+        # Generate thumbnail into a temporary file so a concurrent render of the same PDF
+        # never serves a partly written image
         generator = PDFThumbnailGenerator()
-        success, error = generator.generate_thumbnail(pdf_path, thumbnail_path)
+        temp_path = f"{thumbnail_path}.{os.getpid()}.tmp"
+        success, error = generator.generate_thumbnail(pdf_path, temp_path, allow_fallback=False)
         
         if success:
-            # Generate URL for the thumbnail
-            thumbnail_url = f"http://localhost:5000/uploads/thumbnails/research_papers/{thumbnail_filename}"
+            os.replace(temp_path, thumbnail_path)
             return True, thumbnail_url, None
-        else:
-            return False, None, error
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+        # Only real renders are published under the hash name; the PyPDF2 placeholder gets a
+        # per-paper name that is never reused, so the next upload of this PDF renders again
+        logger.warning(f"{error}, writing a placeholder thumbnail for research paper {content_id}")
+        fallback_filename = f"research_paper_{content_id}_{int(time.time())}_fallback.jpg"
+        success, error = generator._generate_with_pypdf2(pdf_path, os.path.join(thumbnail_dir, fallback_filename))
+        if success:
+            return True, f"http://localhost:5000/uploads/thumbnails/research_papers/{fallback_filename}", None
+        return False, None, error
             
     except Exception as e:
         error_msg = f"Error in generate_research_paper_thumbnail: {str(e)}"
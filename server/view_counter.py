@@ -0,0 +1,207 @@
+"""
+View Counter Module for LawFort Application
+
+Detail endpoints used to run `UPDATE Content_Metrics SET Views = Views + 1`
+and commit on every GET, turning the hottest reads into row-locking writes.
+This module accumulates view increments in memory and flushes them in one
+batched `INSERT ... ON DUPLICATE KEY UPDATE Views = Views + n` statement
+every few seconds, or sooner once enough increments are pending.
+
+Pending counts are flushed on worker shutdown (atexit and the gunicorn
+worker_exit hook). The flush thread is started lazily so it is created in
+each forked worker rather than in the preloading master process.
+"""
+
+import os
+import atexit
+import threading
+import logging
+import mysql.connector
+from typing import Dict, List, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class ViewCounter:
+    """
+    In-process accumulator of Content_Metrics view increments
+    """
+
+    def __init__(self, flush_interval: float = 5.0, flush_threshold: int = 500):
+        """
+        Initialize the view counter
+
+        Args:
+            flush_interval: Seconds between background flushes
+            flush_threshold: Pending increments that trigger an early flush
+        """
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self.connection_pool = None
+        self._reset_process_state()
+
+    def _reset_process_state(self):
+        self._pending: Dict[int, int] = {}
+        self._pending_total = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread = None
+        self._pid = os.getpid()
+
+    def init_pool(self, connection_pool):
+        """
+        Set the connection pool used for flushing
+
+        Args:
+            connection_pool: MySQL connection pool instance
+        """
+        self.connection_pool = connection_pool
+
+    def _ensure_started(self):
+        # Called with self._lock held
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='view-counter-flush', daemon=True)
+            self._thread.start()
+
+    def increment(self, content_id: int, count: int = 1):
+        """
+        Record views for a content item
+
+        Args:
+            content_id: Content ID that was viewed
+            count: Number of views to add
+        """
+        # Threads and locks do not survive fork; start fresh in each worker
+        if self._pid != os.getpid():
+            self._reset_process_state()
+
+        with self._lock:
+            self._ensure_started()
+            self._pending[content_id] = self._pending.get(content_id, 0) + count
+            self._pending_total += count
+            should_flush = self._pending_total >= self.flush_threshold
+
+        if should_flush:
+            self._wake.set()
+
+    def _run(self):
+        while not self._stopped:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Write all pending increments in a single statement
+
+        Returns:
+            Number of content items updated
+        """
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                batch = self._pending
+                self._pending = {}
+                self._pending_total = 0
+
+            if self.connection_pool is None:
+                logger.warning(f"View counter has no connection pool, dropping {len(batch)} pending item(s)")
+                return 0
+
+            # Sorted so concurrent flushes from several workers lock rows in the same order
+            items = sorted(batch.items())
+            try:
+                connection = self.connection_pool.get_connection()
+                try:
+                    try:
+                        self._write(connection, items)
+                        return len(items)
+                    except (mysql.connector.IntegrityError, mysql.connector.DataError) as e:
+                        # A row the table rejects (e.g. content deleted since it was viewed) would
+                        # fail the whole batch forever; write row by row and drop the rejected ones
+                        connection.rollback()
+                        logger.warning(f"View count batch rejected, retrying {len(items)} item(s) one by one: {str(e)}")
+                        return self._write_rows(connection, items)
+                finally:
+                    connection.close()
+            except Exception as e:
+                logger.error(f"Failed to flush view counts, re-queueing {len(batch)} item(s): {str(e)}")
+                self._requeue(items)
+                return 0
+
+    def _write(self, connection, items: List[Tuple[int, int]]):
+        """Add (content_id, views) increments in one statement and commit"""
+        placeholders = ', '.join(['(%s, %s)'] * len(items))
+        params = []
+        for content_id, views in items:
+            params.extend([content_id, views])
+
+        cursor = connection.cursor()
+        try:
+            cursor.execute(f"""
+                INSERT INTO Content_Metrics (Content_ID, Views)
+                VALUES {placeholders}
+                ON DUPLICATE KEY UPDATE Views = Views + VALUES(Views), Last_Updated = NOW()
+            """, params)
+            connection.commit()
+        finally:
+            cursor.close()
+
+    def _write_rows(self, connection, items: List[Tuple[int, int]]) -> int:
+        """
+        Write increments one row at a time
+
+        Rows rejected by the table are dropped; the rest of the batch is
+        re-queued if the connection fails part way.
+
+        Returns:
+            Number of content items updated
+        """
+        written = 0
+        for i, (content_id, views) in enumerate(items):
+            try:
+                self._write(connection, [(content_id, views)])
+                written += 1
+            except (mysql.connector.IntegrityError, mysql.connector.DataError) as e:
+                # The failed statement changed nothing, so the connection can go on with the next row
+                logger.error(f"Dropping {views} view(s) of content {content_id}: {str(e)}")
+            except Exception as e:
+                logger.error(f"Failed to flush view counts, re-queueing {len(items) - i} item(s): {str(e)}")
+                self._requeue(items[i:])
+                break
+        return written
+
+    def _requeue(self, items: List[Tuple[int, int]]):
+        with self._lock:
+            for content_id, views in items:
+                self._pending[content_id] = self._pending.get(content_id, 0) + views
+                self._pending_total += views
+
+    def shutdown(self):
+        """Stop the background thread and flush what is pending"""
+        self._stopped = True
+        self._wake.set()
+        self.flush()
+
+    def get_stats(self) -> dict:
+        """Get pending counters"""
+        with self._lock:
+            return {
+                'pending_items': len(self._pending),
+                'pending_views': self._pending_total,
+                'flush_interval': self.flush_interval,
+                'flush_threshold': self.flush_threshold
+            }
+
+
+# Global view counter instance
+view_counter = ViewCounter(
+    flush_interval=float(os.getenv('VIEW_COUNTER_FLUSH_INTERVAL', 5)),
+    flush_threshold=int(os.getenv('VIEW_COUNTER_FLUSH_THRESHOLD', 500))
+)
+
+atexit.register(view_counter.shutdown)